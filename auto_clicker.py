@@ -1,14 +1,34 @@
+import sys
 import time
-import threading
-import random
-from pynput import mouse as ms
+from core import ClickEngine, ClickScheduler, ClickTrace, TogglePolicy
+from core.cpu import format_usage
+from core.timing import NS
 
-# 左键自动点击模式开关
-left_clicking_active = False
-# 右键自动点击模式开关
-right_clicking_active = False
-# 线程锁，确保线程安全
-lock = threading.Lock()
+# python auto_clicker.py bench：运行计时精度基准后退出
+if len(sys.argv) > 1 and sys.argv[1] == "bench":
+    from core.bench import main
+    sys.exit(main(sys.argv[2:]))
+
+# python auto_clicker.py --asyncio：所有通道在主线程的事件循环中调度，不再创建调度和输出线程
+ASYNC_MODE = "--asyncio" in sys.argv[1:]
+# python auto_clicker.py --process：调度和输出点击在独立的子进程中运行，通过共享内存控制
+PROCESS_MODE = "--process" in sys.argv[1:]
+# python auto_clicker.py --trace：记录每次点击的计划时间、实际时间和输出耗时，退出时保存为CSV
+trace = ClickTrace() if "--trace" in sys.argv[1:] else None
+# python auto_clicker.py --hold-cps：闭环控制，使长期实际CPS保持在设定范围的中点
+HOLD_CPS = "--hold-cps" in sys.argv[1:]
+# python auto_clicker.py --timerfd：Linux上调度线程用timerfd按绝对截止时间等待，并把定时器松弛量降到1微秒
+TIMERFD = "--timerfd" in sys.argv[1:]
+# python auto_clicker.py --status：把各通道的状态发布到命名共享内存，用 python -m core.status 查看
+STATUS = "--status" in sys.argv[1:]
+# python auto_clicker.py --boost --cpus=0,1：点击线程请求实时调度（不可用时降低nice值），并绑定到指定的CPU
+BOOST = "--boost" in sys.argv[1:]
+CPUS = next((arg.split("=", 1)[1] for arg in sys.argv[1:] if arg.startswith("--cpus=")), None)
+priority = None
+if BOOST or CPUS:
+    from core.priority import ThreadPriority, format_results
+    priority = ThreadPriority(cpus=None if CPUS is None else [int(cpu) for cpu in CPUS.split(",")],
+                              realtime="fifo" if BOOST else None, nice=-10 if BOOST else None)
 
 # 左键点击参数
 LEFT_MAX_CPS = 12  # 最大CPS值
@@ -20,128 +40,103 @@ RIGHT_MAX_CPS = 26  # 右键最大CPS值
 RIGHT_MIN_CPS = RIGHT_MAX_CPS - 3  # 右键最小CPS值（抖动下限）
 RIGHT_JITTER_RANGE = 1.2  # 右键抖动范围 ±1.2
 
-# 创建鼠标控制器
-mouse_controller = ms.Controller()
-
-# 鼠标按键处理
-def on_mouse_click(x, y, button, pressed):
-    global left_clicking_active, right_clicking_active
-    
-    # 检测鼠标侧键5（通常对应按钮5）- 控制左键点击
-    if button == ms.Button.x1 and pressed:  # x1对应侧键5
-        with lock:
-            left_clicking_active = not left_clicking_active
-            print(f"左键自动点击模式: {'开启' if left_clicking_active else '关闭'}")
-            if left_clicking_active:
-                print(f"左键目标CPS范围: {LEFT_MIN_CPS}-{LEFT_MAX_CPS} (带±{LEFT_JITTER_RANGE}随机抖动)")
-
-    # 检测鼠标侧键4（通常对应按钮4）- 控制右键点击
-    if button == ms.Button.x2 and pressed:  # x2对应侧键4
-        with lock:
-            right_clicking_active = not right_clicking_active
-            print(f"右键自动点击模式: {'开启' if right_clicking_active else '关闭'}")
-            if right_clicking_active:
-                print(f"右键目标CPS范围: {RIGHT_MIN_CPS}-{RIGHT_MAX_CPS} (带±{RIGHT_JITTER_RANGE}随机抖动)")
-
-# 左键自动点击线程
-def left_auto_clicker():
-    global left_clicking_active
-    click_count = 0
-    start_count_time = time.time()
-    
-    while True:
-        with lock:
-            is_active = left_clicking_active
-        
-        if is_active:
-            # 添加随机抖动到点击速率
-            current_cps = random.uniform(LEFT_MIN_CPS, LEFT_MAX_CPS)
-            # 再添加更小的随机抖动在±JITTER_RANGE范围内
-            current_cps += random.uniform(-LEFT_JITTER_RANGE, LEFT_JITTER_RANGE)
-            # 确保CPS不会为负或过小
-            current_cps = max(1.0, current_cps)
-            
-            # 计算此次点击的延迟
-            current_delay = 1.0 / current_cps
-            
-            # 直接执行左键点击
-            mouse_controller.click(ms.Button.left)
-            click_count += 1
-            
-            # 每秒计算一次实际CPS
-            current_time = time.time()
-            elapsed = current_time - start_count_time
-            if elapsed >= 1.0:
-                actual_cps = click_count / elapsed
-                print(f"左键实际CPS: {actual_cps:.2f}, 当前目标CPS: {current_cps:.2f}")
-                start_count_time = current_time
-                click_count = 0
-            
-            # 应用随机化的延迟
-            time.sleep(current_delay)
-        else:
-            # 重置计数器
-            click_count = 0
-            start_count_time = time.time()
-            # 短暂休眠，减少CPU使用
-            time.sleep(0.1)
-
-# 右键自动点击线程 - 独立的逻辑
-def right_auto_clicker():
-    global right_clicking_active
-    click_count = 0
-    start_count_time = time.time()
-    
-    while True:
-        with lock:
-            is_active = right_clicking_active
-        
-        if is_active:
-            # 添加随机抖动到点击速率 - 使用右键专用参数
-            current_cps = random.uniform(RIGHT_MIN_CPS, RIGHT_MAX_CPS)
-            # 再添加更小的随机抖动在±RIGHT_JITTER_RANGE范围内
-            current_cps += random.uniform(-RIGHT_JITTER_RANGE, RIGHT_JITTER_RANGE)
-            # 确保CPS不会为负或过小
-            current_cps = max(1.0, current_cps)
-            
-            # 计算此次点击的延迟
-            current_delay = 1.0 / current_cps
-            
-            # 直接执行右键点击
-            mouse_controller.click(ms.Button.right)
-            click_count += 1
-            
-            # 每秒计算一次实际CPS
-            current_time = time.time()
-            elapsed = current_time - start_count_time
-            if elapsed >= 1.0:
-                actual_cps = click_count / elapsed
-                print(f"右键实际CPS: {actual_cps:.2f}, 当前目标CPS: {current_cps:.2f}")
-                start_count_time = current_time
-                click_count = 0
-            
-            # 应用随机化的延迟
-            time.sleep(current_delay)
+# 侧键5(x1)切换左键、侧键4(x2)切换右键，所有点击通道共用一个调度线程（asyncio模式下共用事件循环）
+policy = TogglePolicy()
+if ASYNC_MODE:
+    import asyncio
+    from core.async_scheduler import AsyncScheduler
+    engine = ClickEngine(policy, scheduler=AsyncScheduler(priority=priority), trace=trace)
+elif PROCESS_MODE:
+    from core.process_engine import ProcessEngine
+    # 点击记录由子进程在退出时保存；--timerfd和--boost/--cpus在子进程的调度和点击线程中生效
+    trace_path = time.strftime("trace-%Y%m%d-%H%M%S.csv") if trace is not None else None
+    trace = None
+    engine = ProcessEngine(policy, trace_path=trace_path, timerfd=TIMERFD, priority=priority)
+else:
+    waiter = None
+    if TIMERFD:
+        from core import linux_timing
+        if linux_timing.available():
+            waiter = linux_timing.TimerfdWaiter(timer_slack=1000)
         else:
-            # 重置计数器
-            click_count = 0
-            start_count_time = time.time()
-            # 短暂休眠，减少CPU使用
-            time.sleep(0.1)
-
-# 创建并启动左键自动点击线程
-left_click_thread = threading.Thread(target=left_auto_clicker)
-left_click_thread.daemon = True
-left_click_thread.start()
-
-# 创建并启动右键自动点击线程
-right_click_thread = threading.Thread(target=right_auto_clicker)
-right_click_thread.daemon = True
-right_click_thread.start()
-
-# 设置鼠标监听
-mouse_listener = ms.Listener(on_click=on_mouse_click)
-mouse_listener.start()
+            print("--timerfd仅支持Linux，使用默认的等待方式")
+    engine = ClickEngine(policy, scheduler=ClickScheduler(waiter=waiter, priority=priority), trace=trace)
+engine.configure("left", min_cps=LEFT_MIN_CPS, max_cps=LEFT_MAX_CPS, cps_jitter=LEFT_JITTER_RANGE,
+                 rate_control=HOLD_CPS)
+engine.configure("right", min_cps=RIGHT_MIN_CPS, max_cps=RIGHT_MAX_CPS, cps_jitter=RIGHT_JITTER_RANGE,
+                 rate_control=HOLD_CPS)
+
+status = None
+if STATUS:
+    from core.status import StatusPublisher
+    try:
+        status = StatusPublisher(engine)
+    except FileExistsError as e:
+        print(f"--status未生效: {e}")
+
+# 每个通道的实际CPS统计：[点击数, 统计开始时间（纳秒）]
+click_stats = {"left": [0, 0], "right": [0, 0]}
+LABELS = {"left": "左键", "right": "右键"}
+
+# 通道开关时打印状态并重置统计
+def on_state_change(name, active):
+    click_stats[name] = [0, engine.clock()]
+    config = engine.configs[name]
+    print(f"{LABELS[name]}自动点击模式: {'开启' if active else '关闭'}")
+    if active:
+        print(f"{LABELS[name]}目标CPS范围: {config.min_cps}-{config.max_cps} (带±{config.cps_jitter}随机抖动)")
+
+# 每秒打印一次实际CPS
+def report_cps(name, now):
+    stats = click_stats[name]
+    stats[0] += 1
+    elapsed = now - stats[1]
+    if elapsed >= NS:
+        actual_cps = stats[0] * NS / elapsed
+        print(f"{LABELS[name]}实际CPS: {actual_cps:.2f}, 当前目标CPS: {policy.current_cps[name]:.2f}")
+        click_stats[name] = [0, now]
+
+# 子进程模式下本进程不会收到点击回调，每秒按子进程写回的点击次数打印实际CPS
+process_clicks = {}  # 通道名 -> (点击次数, 读取时间)
+def report_process_cps():
+    now = engine.clock()
+    for name in engine.configs:
+        clicks = engine.clicks(name)
+        previous = process_clicks.get(name)
+        process_clicks[name] = (clicks, now)
+        if previous is not None and engine.is_active(name) and clicks > previous[0]:
+            print(f"{LABELS[name]}实际CPS: {(clicks - previous[0]) * NS / (now - previous[1]):.2f}")
+
+# 有通道在点击时每秒打印一次各线程的CPU占用和唤醒次数
+def report_cpu():
+    usage = engine.cpu.usage()
+    if any(engine.is_active(name) for name in engine.configs):
+        # 子进程模式下点击线程在子进程中，这里只有本进程的线程
+        label = "本进程线程CPU（不含子进程）" if PROCESS_MODE else "线程CPU"
+        print(f"{label}: {format_usage(usage)}")
+
+# 打印各点击线程的亲和性和优先级设置是否生效（子进程模式下由子进程打印）
+def report_priority():
+    if priority is not None and not PROCESS_MODE:
+        print(f"线程优先级: {format_results(priority.results)}")
+
+# asyncio模式：事件循环中运行所有通道，每秒打印一次CPU占用
+async def run_async():
+    loop = asyncio.get_running_loop()
+    def tick():
+        report_cpu()
+        loop.call_later(1, tick)
+    loop.call_later(1, tick)
+    loop.call_later(0.1, report_priority)
+    await engine.scheduler.run()
+
+engine.state_callbacks.append(on_state_change)
+engine.click_callbacks.append(report_cps)
+
+# 启动调度线程和鼠标监听
+engine.start()
+if status is not None:
+    status.start()
 
 print("自动点击脚本已启动 - 带随机抖动")
 print("左键配置:")
@@ -151,11 +146,35 @@ print(f"  目标CPS范围: {RIGHT_MIN_CPS}-{RIGHT_MAX_CPS} (带±{RIGHT_JITTER_R
 print("按鼠标侧键5(x1)切换左键自动点击模式")
 print("按鼠标侧键4(x2)切换右键自动点击模式")
 print("程序将持续运行，请使用任务管理器或关闭终端窗口退出")
+if status is not None:
+    print(f"状态发布到共享内存 {status.name}，可运行 python -m core.status 查看")
 
-# 主线程保持活动状态
+# 主线程保持活动状态（asyncio模式下在主线程运行事件循环）
 try:
-    while True:
-        time.sleep(1)
+    if ASYNC_MODE:
+        asyncio.run(run_async())
+    else:
+        main_cpu = engine.cpu.thread("主线程")
+        time.sleep(0.1)  # 等各点击线程启动并完成设置
+        report_priority()
+        while True:
+            main_cpu.sample()
+            time.sleep(1)
+            report_cpu()
+            if PROCESS_MODE:
+                report_process_cps()
 except KeyboardInterrupt:
     # 如果用户按下Ctrl+C，程序也会退出
-    pass 
\ No newline at end of file
+    pass
+
+if status is not None:
+    status.close()
+
+if PROCESS_MODE:
+    engine.close()
+    if trace_path is not None:
+        print(f"点击记录已保存到 {trace_path}")
+
+if trace is not None:
+    trace_path = time.strftime("trace-%Y%m%d-%H%M%S.csv")
+    print(f"已保存 {trace.dump(trace_path)} 次点击的计时记录到 {trace_path}") 
\ No newline at end of file
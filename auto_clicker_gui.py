@@ -1,46 +1,22 @@
 import sys
-import time
-import threading
-import random
-from pynput import mouse as ms
+from core import ClickEngine, ModePolicy
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QPushButton, QSlider, QCheckBox, QGroupBox, QSpinBox,
                              QDoubleSpinBox, QStyleFactory, QTabWidget)
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon, QFont, QColor, QPalette
 
-# 线程锁，确保线程安全
-lock = threading.Lock()
-
 class AutoClickerGUI(QMainWindow):
     # 自定义信号用于线程安全更新UI
     update_left_cps_signal = pyqtSignal(float, float)
     update_right_cps_signal = pyqtSignal(float, float)
+    check_button_signal = pyqtSignal(str, bool)
     
     def __init__(self):
         super().__init__()
         self.setWindowTitle("自动点击器")
         self.setMinimumSize(600, 500)
         
-        # 状态变量
-        self.left_clicking_active = False
-        self.right_clicking_active = False
-        self.left_button_held = False
-        self.right_button_held = False
-        
-        # 模式状态
-        self.mode = "normal"  # normal, mode1, mode2
-        self.mode1_continuous = False  # 模式一中的连续点击状态
-        
-        # 点击计数
-        self.left_click_count = 0
-        self.right_click_count = 0
-        self.side_button_count = 0
-        self.last_left_click_time = 0
-        self.last_right_click_time = 0
-        self.last_side_button_time = 0
-        self.last_side_button = None
-        
         # 左键点击参数
         self.left_max_cps = 12
         self.left_min_cps = 10
@@ -54,8 +30,18 @@ class AutoClickerGUI(QMainWindow):
         # 键盘快捷键配置
         self.use_mouse_side_buttons = True
         
-        # 创建鼠标控制器
-        self.mouse_controller = ms.Controller()
+        # 模式状态机和点击引擎，模式切换时通过信号在界面线程同步按钮
+        # 带--process启动时调度和输出点击在独立的子进程中运行，界面卡顿不会影响点击计时
+        self.modes = ModePolicy(on_check=self.check_button_signal.emit)
+        if "--process" in sys.argv[1:]:
+            from core.process_engine import ProcessEngine
+            self.engine = ProcessEngine(self.modes)
+        else:
+            self.engine = ClickEngine(self.modes)
+        self.engine.configure("left", min_cps=self.left_min_cps, max_cps=self.left_max_cps,
+                              cursor_jitter=self.left_jitter_range)
+        self.engine.configure("right", min_cps=self.right_min_cps, max_cps=self.right_max_cps,
+                              cursor_jitter=self.right_jitter_range)
         
         # 设置UI样式
         self.set_style()
@@ -63,11 +49,9 @@ class AutoClickerGUI(QMainWindow):
         # 初始化UI
         self.init_ui()
         
-        # 启动线程
-        self.start_threads()
-        
-        # 启动鼠标监听
-        self.start_mouse_listener()
+        # 启动调度线程和鼠标监听
+        # 事件循环开始后再启动，导入pynput不会推迟窗口的首次显示
+        QTimer.singleShot(0, self.engine.start)
         
     def set_style(self):
         """设置应用的样式"""
@@ -296,13 +280,11 @@ class AutoClickerGUI(QMainWindow):
         # 连接信号
         self.update_left_cps_signal.connect(self.update_left_cps_display)
         self.update_right_cps_signal.connect(self.update_right_cps_display)
+        self.check_button_signal.connect(self.check_button)
     
     def toggle_left_clicking(self):
         """切换左键自动点击状态"""
-        with lock:
-            self.left_clicking_active = not self.left_clicking_active
-        
-        if self.left_clicking_active:
+        if self.modes.toggle_clicking(self.engine, "left"):
             self.left_button.setText("关闭左键自动点击")
             self.left_button.setStyleSheet("background-color: #a83232;")
         else:
@@ -311,10 +293,7 @@ class AutoClickerGUI(QMainWindow):
     
     def toggle_right_clicking(self):
         """切换右键自动点击状态"""
-        with lock:
-            self.right_clicking_active = not self.right_clicking_active
-        
-        if self.right_clicking_active:
+        if self.modes.toggle_clicking(self.engine, "right"):
             self.right_button.setText("关闭右键自动点击")
             self.right_button.setStyleSheet("background-color: #a83232;")
         else:
@@ -324,6 +303,12 @@ class AutoClickerGUI(QMainWindow):
     def toggle_mouse_side_buttons(self, state):
         """切换是否使用鼠标侧键控制"""
         self.use_mouse_side_buttons = state
+        self.modes.enabled = state
+    
+    def check_button(self, name, checked):
+        """模式切换时同步按钮的选中状态"""
+        button = self.left_button if name == "left" else self.right_button
+        button.setChecked(checked)
     
     def update_left_max_cps(self, value):
         """更新左键最大CPS值"""
@@ -332,6 +317,7 @@ class AutoClickerGUI(QMainWindow):
         if self.left_min_cps > value:
             self.left_min_cps = value
             self.left_min_cps_spin.setValue(value)
+        self.engine.configure("left", min_cps=self.left_min_cps, max_cps=value)
     
     def update_left_min_cps(self, value):
         """更新左键最小CPS值"""
@@ -340,10 +326,12 @@ class AutoClickerGUI(QMainWindow):
         if self.left_max_cps < value:
             self.left_max_cps = value
             self.left_max_cps_spin.setValue(value)
+        self.engine.configure("left", min_cps=value, max_cps=self.left_max_cps)
     
     def update_left_jitter(self, value):
         """更新左键抖动范围"""
         self.left_jitter_range = value
+        self.engine.configure("left", cursor_jitter=value)
     
     def update_right_max_cps(self, value):
         """更新右键最大CPS值"""
@@ -352,6 +340,7 @@ class AutoClickerGUI(QMainWindow):
         if self.right_min_cps > value:
             self.right_min_cps = value
             self.right_min_cps_spin.setValue(value)
+        self.engine.configure("right", min_cps=self.right_min_cps, max_cps=value)
     
     def update_right_min_cps(self, value):
         """更新右键最小CPS值"""
@@ -360,10 +349,12 @@ class AutoClickerGUI(QMainWindow):
         if self.right_max_cps < value:
             self.right_max_cps = value
             self.right_max_cps_spin.setValue(value)
+        self.engine.configure("right", min_cps=value, max_cps=self.right_max_cps)
     
     def update_right_jitter(self, value):
         """更新右键抖动范围"""
         self.right_jitter_range = value
+        self.engine.configure("right", cursor_jitter=value)
     
     def update_left_cps_display(self, actual_cps, target_cps):
         """更新左键CPS显示"""
@@ -373,173 +364,10 @@ class AutoClickerGUI(QMainWindow):
         """更新右键CPS显示"""
         self.right_cps_label.setText(f"实际CPS: {actual_cps:.2f} | 目标CPS: {target_cps:.2f}")
     
-    def start_threads(self):
-        """启动自动点击线程"""
-        # 左键自动点击线程
-        self.left_click_thread = threading.Thread(target=self.left_auto_clicker)
-        self.left_click_thread.daemon = True
-        self.left_click_thread.start()
-        
-        # 右键自动点击线程
-        self.right_click_thread = threading.Thread(target=self.right_auto_clicker)
-        self.right_click_thread.daemon = True
-        self.right_click_thread.start()
-    
-    def start_mouse_listener(self):
-        """启动鼠标监听器"""
-        self.mouse_listener = ms.Listener(on_click=self.on_mouse_click)
-        self.mouse_listener.daemon = True
-        self.mouse_listener.start()
-    
-    def on_mouse_click(self, x, y, button, pressed):
-        """处理鼠标点击事件"""
-        if not self.use_mouse_side_buttons:
-            return
-            
-        current_time = time.time()
-        
-        # 处理侧键点击
-        if button == ms.Button.x1 or button == ms.Button.x2:  # 侧键4或5
-            if pressed:
-                if current_time - self.last_side_button_time < 0.3 and self.last_side_button == button:
-                    self.side_button_count += 1
-                else:
-                    self.side_button_count = 1
-                self.last_side_button_time = current_time
-                self.last_side_button = button
-            else:
-                # 松开侧键时处理模式切换
-                if self.side_button_count == 1:  # 单次点击
-                    if self.mode == "normal":  # 从普通模式进入模式一
-                        self.mode = "mode1"
-                        self.left_clicking_active = False
-                        self.right_clicking_active = False
-                        self.mode1_continuous = False
-                        if button == ms.Button.x1:
-                            self.left_button.setChecked(True)
-                        else:
-                            self.right_button.setChecked(True)
-                    elif self.mode == "mode1":  # 从模式一返回普通模式
-                        self.mode = "normal"
-                        self.left_clicking_active = False
-                        self.right_clicking_active = False
-                        self.mode1_continuous = False
-                        if button == ms.Button.x1:
-                            self.left_button.setChecked(False)
-                        else:
-                            self.right_button.setChecked(False)
-                elif self.side_button_count >= 3:  # 三次点击
-                    if self.mode == "normal":  # 从普通模式进入模式二
-                        self.mode = "mode2"
-                        self.left_clicking_active = True
-                        self.right_clicking_active = True
-                        self.mode1_continuous = False
-                        if button == ms.Button.x1:
-                            self.left_button.setChecked(True)
-                        else:
-                            self.right_button.setChecked(True)
-                    elif self.mode == "mode2":  # 从模式二返回普通模式
-                        self.mode = "normal"
-                        self.left_clicking_active = False
-                        self.right_clicking_active = False
-                        self.mode1_continuous = False
-                        if button == ms.Button.x1:
-                            self.left_button.setChecked(False)
-                        else:
-                            self.right_button.setChecked(False)
-                    
-        # 处理左键点击
-        elif button == ms.Button.left:
-            if pressed:
-                self.left_button_held = True
-                if self.mode == "mode1":  # 只在模式一下处理连续点击
-                    self.left_click_count += 1
-                    if current_time - self.last_left_click_time < 0.3:  # 300ms内连续点击
-                        if self.left_click_count >= 3:  # 连续点击3次进入自动模式
-                            self.mode1_continuous = True
-                            self.left_clicking_active = True
-                    else:
-                        self.left_click_count = 1
-                    self.last_left_click_time = current_time
-            else:
-                self.left_button_held = False
-                if self.mode == "mode1" and self.mode1_continuous:
-                    # 在模式一的连续点击状态下，停止点击则退出连续模式
-                    self.mode1_continuous = False
-                    self.left_clicking_active = False
-                    
-        # 处理右键点击
-        elif button == ms.Button.right:
-            if pressed:
-                self.right_button_held = True
-                if self.mode == "mode1":  # 只在模式一下处理连续点击
-                    self.right_click_count += 1
-                    if current_time - self.last_right_click_time < 0.3:  # 300ms内连续点击
-                        if self.right_click_count >= 3:  # 连续点击3次进入自动模式
-                            self.mode1_continuous = True
-                            self.right_clicking_active = True
-                    else:
-                        self.right_click_count = 1
-                    self.last_right_click_time = current_time
-            else:
-                self.right_button_held = False
-                if self.mode == "mode1" and self.mode1_continuous:
-                    # 在模式一的连续点击状态下，停止点击则退出连续模式
-                    self.mode1_continuous = False
-                    self.right_clicking_active = False
-    
-    def left_auto_clicker(self):
-        """左键自动点击线程"""
-        last_click_time = 0
-        while True:
-            if self.left_clicking_active and (
-                self.mode == "mode2" or  # 模式二直接点击
-                (self.mode == "mode1" and self.mode1_continuous)  # 模式一需要连续点击状态
-            ):
-                current_time = time.time()
-                if current_time - last_click_time >= 1.0 / random.uniform(self.left_min_cps, self.left_max_cps):
-                    with lock:
-                        self.mouse_controller.click(ms.Button.left)
-                        # 添加随机抖动
-                        if self.left_jitter_range > 0:
-                            x, y = self.mouse_controller.position
-                            self.mouse_controller.position = (
-                                x + random.uniform(-self.left_jitter_range, self.left_jitter_range),
-                                y + random.uniform(-self.left_jitter_range, self.left_jitter_range)
-                            )
-                            self.mouse_controller.position = (x, y)
-                    last_click_time = current_time
-            time.sleep(0.001)
-    
-    def right_auto_clicker(self):
-        """右键自动点击线程"""
-        last_click_time = 0
-        while True:
-            if self.right_clicking_active and (
-                self.mode == "mode2" or  # 模式二直接点击
-                (self.mode == "mode1" and self.mode1_continuous)  # 模式一需要连续点击状态
-            ):
-                current_time = time.time()
-                if current_time - last_click_time >= 1.0 / random.uniform(self.right_min_cps, self.right_max_cps):
-                    with lock:
-                        self.mouse_controller.click(ms.Button.right)
-                        # 添加随机抖动
-                        if self.right_jitter_range > 0:
-                            x, y = self.mouse_controller.position
-                            self.mouse_controller.position = (
-                                x + random.uniform(-self.right_jitter_range, self.right_jitter_range),
-                                y + random.uniform(-self.right_jitter_range, self.right_jitter_range)
-                            )
-                            self.mouse_controller.position = (x, y)
-                    last_click_time = current_time
-            time.sleep(0.001)
-    
     def closeEvent(self, event):
         """窗口关闭事件处理"""
         # 停止所有活动
-        with lock:
-            self.left_clicking_active = False
-            self.right_clicking_active = False
+        self.engine.close()
         
         # 接受关闭事件
         event.accept()
@@ -0,0 +1,126 @@
+"""辅助决策微基准：每次调度读取用户CPS和是否仍在点击的耗时
+
+模拟用户以固定CPS点击、辅助线程每5ms做一次决策（main.py最初的轮询频率），对比三种实现：
+列表（main.py最初的calculate_real_cps + is_user_actively_clicking，每次用推导式重新扫描），
+ClickWindow（改动前的AssistPolicy，滑动窗口计数），
+EWMA（改动后的RateEstimator，每次用户点击更新一次，读取O(1)）。
+每种实现输出每次决策的平均耗时（含均摊的点击记录开销）和读到的平均用户CPS。
+
+用法: python benchmarks/bench_assist_decision.py [--cps 8] [--duration 600]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ClickWindow, RateEstimator, real_cps  # noqa: E402
+from core.timing import NS  # noqa: E402
+
+IDLE_TIMEOUT = 0.20  # AssistPolicy的默认值
+TICK = 0.005  # 决策间隔（秒）
+
+
+class ListDecision:
+    """main.py最初的实现，时间为浮点秒，列表只保留最近2秒"""
+
+    def __init__(self):
+        self.clicks = []
+        self.last = 0.0
+
+    def append(self, now):
+        now /= NS
+        self.clicks.append(now)
+        self.clicks = [t for t in self.clicks if now - t <= 2.0]
+        self.last = now
+
+    def decide(self, now):
+        now /= NS
+        recent_clicks = [t for t in self.clicks if now - t <= 1.5]
+        if len(recent_clicks) <= 1:
+            cps = len(recent_clicks)
+        else:
+            recent_1s_clicks = [t for t in recent_clicks if now - t <= 1.0]
+            if len(recent_1s_clicks) >= 2:
+                cps = len(recent_1s_clicks)
+            else:
+                span = recent_clicks[-1] - recent_clicks[0]
+                cps = (len(recent_clicks) - 1) / span if span > 0 else len(recent_clicks)
+        active = now - self.last <= IDLE_TIMEOUT
+        if not active:
+            recent = [t for t in self.clicks if now - t <= IDLE_TIMEOUT * 3]
+            if len(recent) >= 2:
+                active = now - self.last <= IDLE_TIMEOUT * 1.5
+        return cps, active
+
+
+class WindowDecision:
+    """改动前的AssistPolicy：ClickWindow + real_cps"""
+
+    def __init__(self):
+        self.clicks = ClickWindow()
+        self.last = 0
+
+    def append(self, now):
+        self.clicks.append(now)
+        self.last = now
+
+    def decide(self, now):
+        cps = real_cps(self.clicks, now)
+        active = now - self.last <= IDLE_TIMEOUT * NS
+        if not active and self.clicks.count(IDLE_TIMEOUT * 3, now) >= 2:
+            active = now - self.last <= IDLE_TIMEOUT * 1.5 * NS
+        return cps, active
+
+
+class EwmaDecision:
+    """改动后的AssistPolicy：RateEstimator"""
+
+    def __init__(self):
+        self.rate = RateEstimator()
+
+    def append(self, now):
+        self.rate.append(now)
+
+    def decide(self, now):
+        rate = self.rate
+        return rate.rate(now), rate.is_active(now, IDLE_TIMEOUT)
+
+
+def run(decision, cps, duration):
+    """返回(每次决策的平均耗时ns, 读到的平均用户CPS)"""
+    tick = round(TICK * NS)
+    period = round(NS / cps)
+    ticks = int(duration / TICK)
+    next_click = 0
+    total = 0.0
+    decide = decision.decide
+    start = time.perf_counter_ns()
+    for n in range(ticks):
+        now = n * tick
+        if now >= next_click:
+            decision.append(now)
+            next_click += period
+        total += decide(now)[0]
+    elapsed = time.perf_counter_ns() - start
+    return elapsed / ticks, total / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cps", type=float, default=8.0, help="模拟用户的CPS")
+    parser.add_argument("--duration", type=float, default=600.0, help="模拟时长（秒）")
+    args = parser.parse_args()
+
+    print(f"用户 {args.cps:g} CPS，每{TICK * 1000:g}ms决策一次，共{int(args.duration / TICK)}次")
+    print(f"{'实现':<14}{'每次决策(ns)':>14}{'平均用户CPS':>14}")
+    for label, decision in (("列表", ListDecision()), ("ClickWindow", WindowDecision()),
+                            ("EWMA", EwmaDecision())):
+        per_tick, mean_cps = run(decision, args.cps, args.duration)
+        print(f"{label:<14}{per_tick:>14.0f}{mean_cps:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
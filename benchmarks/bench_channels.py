@@ -0,0 +1,111 @@
+"""多通道CPU占用基准：每通道一个轮询线程 vs 单个堆调度线程 vs ClickEngine
+
+engine为ClickEngine的默认设置（isolate=True），每个通道另有一个输出线程，线程数随通道数增长；
+engine-inline为isolate=False，所有通道在调度线程中输出，线程数不变。
+
+用法: python benchmarks/bench_channels.py [--duration 秒]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ClickEngine, ClickScheduler, NullBackend, TogglePolicy  # noqa: E402
+
+MIN_CPS = 10
+MAX_CPS = 12
+
+
+def run_polling(channels, duration):
+    """旧实现：每个通道一个线程，每1ms轮询一次"""
+    running = True
+    clicks = [0] * channels
+    wakeups = [0] * channels
+
+    def worker(index):
+        last_click_time = 0
+        while running:
+            current_time = time.time()
+            if current_time - last_click_time >= 1.0 / random.uniform(MIN_CPS, MAX_CPS):
+                clicks[index] += 1
+                last_click_time = current_time
+            wakeups[index] += 1
+            time.sleep(0.001)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(channels)]
+    cpu_start = time.process_time()
+    for thread in threads:
+        thread.start()
+    thread_count = threading.active_count()
+    time.sleep(duration)
+    running = False
+    for thread in threads:
+        thread.join()
+    return time.process_time() - cpu_start, thread_count, sum(wakeups), sum(clicks)
+
+
+def run_scheduler(channels, duration):
+    """新实现：单个调度线程用最小堆驱动所有通道"""
+    scheduler = ClickScheduler()
+    clicks = [0] * channels
+
+    def make_step(index):
+        def step():
+            clicks[index] += 1
+            return 1.0 / random.uniform(MIN_CPS, MAX_CPS)
+        return step
+
+    for i in range(channels):
+        scheduler.add_channel(i, make_step(i))
+        scheduler.set_active(i, True)
+    cpu_start = time.process_time()
+    scheduler.start()
+    thread_count = threading.active_count()
+    time.sleep(duration)
+    scheduler.stop()
+    return time.process_time() - cpu_start, thread_count, scheduler.wakeups, sum(clicks)
+
+
+def run_engine(channels, duration, isolate=True):
+    """ClickEngine：isolate为True时每个通道在自己的输出线程中点击"""
+    backend = NullBackend()
+    engine = ClickEngine(TogglePolicy(), backend=backend, isolate=isolate)
+    for i in range(channels):
+        engine.configure(str(i), min_cps=MIN_CPS, max_cps=MAX_CPS)
+        engine.set_active(str(i), True)
+    cpu_start = time.process_time()
+    engine.start(listen=False)
+    thread_count = threading.active_count()
+    time.sleep(duration)
+    engine.stop()
+    # 隔离的通道每次点击还要唤醒一次输出线程
+    wakeups = engine.scheduler.wakeups + (backend.clicks if isolate else 0)
+    return time.process_time() - cpu_start, thread_count, wakeups, backend.clicks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+
+    runners = (
+        ("polling", run_polling),
+        ("scheduler", run_scheduler),
+        ("engine", run_engine),
+        ("engine-inline", lambda channels, duration: run_engine(channels, duration, isolate=False)),
+    )
+    print(f"{'实现':<14}{'通道':>6}{'线程':>6}{'CPU%':>8}{'唤醒/秒':>10}{'点击/秒':>10}")
+    for channels in (2, 8, 32):
+        for name, runner in runners:
+            cpu, threads, wakeups, clicks = runner(channels, args.duration)
+            print(f"{name:<14}{channels:>6}{threads:>6}{cpu / args.duration * 100:>8.1f}"
+                  f"{wakeups / args.duration:>10.0f}{clicks / args.duration:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""CPS统计微基准：列表重建 vs 环形缓冲区
+
+模拟窗口内保持N个事件的稳态：每个tick插入一个新事件、清理过期事件并计算一次CPS。
+另外对比每条记录的内存：float列表 vs array('q')整数纳秒。
+用法: python benchmarks/bench_cps_window.py
+"""
+
+import os
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ClickWindow  # noqa: E402
+from core.timing import NS  # noqa: E402
+
+
+def legacy_real_cps(click_times, current_time):
+    """main.py中原来的calculate_real_cps"""
+    if len(click_times) == 0:
+        return 0.0
+    recent_clicks = [t for t in click_times if current_time - t <= 1.5]
+    if len(recent_clicks) <= 1:
+        return len(recent_clicks)
+    recent_1s_clicks = [t for t in recent_clicks if current_time - t <= 1.0]
+    if len(recent_1s_clicks) >= 2:
+        return len(recent_1s_clicks)
+    time_span = recent_clicks[-1] - recent_clicks[0]
+    return (len(recent_clicks) - 1) / time_span if time_span > 0 else len(recent_clicks)
+
+
+def ring_real_cps(click_times, current_time):
+    """基于ClickWindow的calculate_real_cps"""
+    if len(click_times) == 0:
+        return 0.0
+    recent_count = click_times.count(1.5, current_time)
+    if recent_count <= 1:
+        return recent_count
+    recent_1s_count = click_times.count(1.0, current_time)
+    if recent_1s_count >= 2:
+        return recent_1s_count
+    time_span = (click_times.last() - click_times.first(1.5, current_time)) / NS
+    return (recent_count - 1) / time_span if time_span > 0 else recent_count
+
+
+def bench_legacy(events, ticks):
+    step = 1.0 / events
+    click_times = [i * step for i in range(events)]
+    now = events * step
+    start = time.perf_counter()
+    for _ in range(ticks):
+        click_times.append(now)
+        click_times = [t for t in click_times if now - t <= 1.0]
+        legacy_real_cps(click_times, now)
+        now += step
+    return (time.perf_counter() - start) / ticks
+
+
+def bench_ring(events, ticks):
+    step = NS // events
+    click_times = ClickWindow(capacity=events * 2)
+    for i in range(events):
+        click_times.append(i * step)
+    now = events * step
+    start = time.perf_counter()
+    for _ in range(ticks):
+        click_times.append(now)
+        ring_real_cps(click_times, now)
+        now += step
+    return (time.perf_counter() - start) / ticks
+
+
+def bytes_per_event(events):
+    """旧实现time.time()浮点列表与array('q')纳秒时间戳每条记录的字节数"""
+    start = time.time()
+    floats = [start + i / events for i in range(events)]
+    list_bytes = sys.getsizeof(floats) + sum(sys.getsizeof(t) for t in floats)
+    ints = array('q', range(events))
+    return list_bytes / events, sys.getsizeof(ints) / events
+
+
+def main():
+    print(f"{'窗口事件数':>10}{'列表(us/tick)':>16}{'环形(us/tick)':>16}{'加速':>10}")
+    for events, ticks in ((1_000, 2_000), (100_000, 20)):
+        legacy = bench_legacy(events, ticks)
+        ring = bench_ring(events, max(ticks, 2_000))
+        print(f"{events:>10}{legacy * 1e6:>16.2f}{ring * 1e6:>16.2f}{legacy / ring:>9.0f}x")
+
+    floats, ints = bytes_per_event(100_000)
+    print(f"\n每条记录内存: float列表 {floats:.1f} 字节, array('q') {ints:.1f} 字节 ({floats / ints:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""辅助版界面的后台开销：窗口在前台、在后台、最小化、隐藏时的空闲CPU占用
+
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_gui_idle.py [--duration 秒]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QTimer  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from core import NullBackend  # noqa: E402
+from main import AutoClickerGUI  # noqa: E402
+
+
+def measure(app, window, duration):
+    """运行事件循环duration秒，返回(CPU秒, 统计快照次数, setText次数)"""
+    app.processEvents()
+    ticks = window.stats_worker.ticks
+    updates = window.label_updates
+    cpu_start = time.process_time()
+    QTimer.singleShot(int(duration * 1000), app.quit)
+    app.exec_()
+    return (time.process_time() - cpu_start, window.stats_worker.ticks - ticks,
+            window.label_updates - updates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    window = AutoClickerGUI(backend=NullBackend(), listen=False)
+
+    states = (
+        ("前台", lambda: (window.showNormal(), window.activateWindow())),
+        ("后台", lambda: (window.showNormal(), window.stats_worker.set_interval(window.REFRESH_INACTIVE))),
+        ("最小化", window.showMinimized),
+        ("隐藏", window.hide),
+    )
+    print(f"{'窗口状态':<8}{'刷新周期':>10}{'CPU%':>8}{'快照/秒':>10}{'setText/秒':>12}")
+    for name, enter in states:
+        enter()
+        app.processEvents()
+        if name == "前台" and not window.isActiveWindow():
+            # offscreen平台没有窗口管理器，无法真正激活窗口
+            window.stats_worker.set_interval(window.REFRESH_ACTIVE)
+        interval = window.stats_worker.interval
+        cpu, ticks, updates = measure(app, window, args.duration)
+        period = f"{interval * 1000:g}ms" if interval is not None else "暂停"
+        print(f"{name:<8}{period:>10}{cpu / args.duration * 100:>8.2f}"
+              f"{ticks / args.duration:>10.1f}{updates / args.duration:>12.1f}")
+
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""空闲开销与激活延迟基准：轮询线程 vs 事件驱动调度器
+
+用法: python benchmarks/bench_idle.py [--duration 秒]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ClickScheduler  # noqa: E402
+from core.bench import percentile  # noqa: E402
+
+# 旧实现中未激活时的轮询周期：命令行版、模式版GUI、辅助版GUI
+LEGACY_POLLS = (("cli-100ms", 0.1), ("gui-1ms", 0.001), ("assist-5ms", 0.005))
+
+
+class PollingClicker:
+    """旧实现：未激活时按固定周期轮询开关"""
+
+    def __init__(self, poll):
+        self.poll = poll
+        self.active = False
+        self.running = True
+        self.wakeups = 0
+        self.on_click = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while self.running:
+            if self.active:
+                self.on_click()
+                self.active = False
+            self.wakeups += 1
+            time.sleep(self.poll)
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+
+
+def measure_idle(duration):
+    """两个未激活通道在duration秒内的CPU占用和唤醒次数"""
+    results = []
+    for name, poll in LEGACY_POLLS:
+        cpu_start = time.process_time()
+        clickers = [PollingClicker(poll), PollingClicker(poll)]
+        time.sleep(duration)
+        for clicker in clickers:
+            clicker.stop()
+        results.append((name, time.process_time() - cpu_start, sum(c.wakeups for c in clickers)))
+
+    scheduler = ClickScheduler()
+    scheduler.add_channel("left", lambda: None)
+    scheduler.add_channel("right", lambda: None)
+    cpu_start = time.process_time()
+    scheduler.start()
+    time.sleep(duration)
+    scheduler.stop()
+    results.append(("scheduler", time.process_time() - cpu_start, scheduler.wakeups))
+    return results
+
+
+def measure_activation(samples):
+    """从激活到第一次点击的延迟（秒）"""
+    results = []
+    for name, poll in LEGACY_POLLS:
+        clicker = PollingClicker(poll)
+        latencies = []
+        fired = threading.Event()
+        clicker.on_click = lambda: (latencies.append(time.perf_counter() - start), fired.set())
+        for _ in range(max(10, samples // 10) if poll >= 0.1 else samples):
+            time.sleep(random.uniform(0.005, 0.02))
+            fired.clear()
+            start = time.perf_counter()
+            clicker.active = True
+            fired.wait()
+        clicker.stop()
+        results.append((name, latencies))
+
+    scheduler = ClickScheduler()
+    latencies = []
+    fired = threading.Event()
+
+    def step():
+        latencies.append(time.perf_counter() - start)
+        fired.set()
+        return None
+
+    scheduler.add_channel("left", step)
+    scheduler.start()
+    for _ in range(samples):
+        time.sleep(random.uniform(0.005, 0.02))
+        fired.clear()
+        start = time.perf_counter()
+        scheduler.set_active("left", True)
+        fired.wait()
+    scheduler.stop()
+    results.append(("scheduler", latencies))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args()
+
+    print("空闲（两个通道均未激活）:")
+    print(f"{'实现':<12}{'CPU%':>8}{'唤醒/秒':>10}")
+    for name, cpu, wakeups in measure_idle(args.duration):
+        print(f"{name:<12}{cpu / args.duration * 100:>8.2f}{wakeups / args.duration:>10.1f}")
+
+    print("\n激活到第一次点击的延迟:")
+    print(f"{'实现':<12}{'p50(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}")
+    for name, latencies in measure_activation(args.samples):
+        print(f"{name:<12}{percentile(latencies, 0.5) * 1e3:>10.3f}"
+              f"{percentile(latencies, 0.99) * 1e3:>10.3f}{max(latencies) * 1e3:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""鼠标监听回调耗时：在回调中直接处理事件 vs 只写入队列由调度线程处理
+
+模拟pynput监听线程以固定频率送入按键按下/松开事件（辅助和模式版为左键，命令行版为侧键x1，
+每次按下都切换通道并像命令行版一样打印状态），
+测量每次回调的耗时分布。回调阻塞的时间就是系统输入钩子被推迟的时间。
+同时统计回调线程自身的CPU时间：单核机器上唤醒调度线程会让它抢占回调线程，
+墙钟耗时中包含了调度线程处理事件的时间，CPU时间只包含回调本身的工作。
+
+用法: python benchmarks/bench_input_callback.py [--rate 每秒点击数] [--duration 秒]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import AssistPolicy, ClickEngine, ModePolicy, NullBackend, TogglePolicy  # noqa: E402
+from core.bench import percentile  # noqa: E402
+
+
+class Button:
+    """代替pynput.mouse.Button，监听回调只用到name"""
+
+    def __init__(self, name):
+        self.name = name
+
+
+# 名称 -> (策略, 模拟的按键)
+POLICIES = {
+    "辅助": (AssistPolicy, Button("left")),
+    "模式": (ModePolicy, Button("left")),
+    "命令行": (TogglePolicy, Button("x1")),
+}
+
+
+def noop_callback(engine):
+    """空回调，测量本机的计时下限"""
+    def callback(x, y, button, pressed):
+        pass
+    return callback
+
+
+def inline_callback(engine):
+    """旧实现：回调中直接运行策略"""
+    def callback(x, y, button, pressed):
+        engine.on_mouse_click(button.name, pressed)
+    return callback
+
+
+def queued_callback(engine):
+    """新实现：回调只写入InputQueue"""
+    return engine._on_listener_click
+
+
+def run(policy, button, make_callback, rate, duration):
+    """返回(每次回调的墙钟耗时列表, 每次回调的线程CPU时间列表, 引擎)，单位微秒"""
+    engine = ClickEngine(policy, backend=NullBackend())
+    engine.configure("left", min_cps=20, max_cps=22)
+    engine.configure("right", min_cps=20, max_cps=22)
+    devnull = open(os.devnull, "w", encoding="utf-8")
+    engine.state_callbacks.append(lambda name, active: print(f"{name}: {active}", file=devnull))
+    engine.start(listen=False)
+    callback = make_callback(engine)
+    durations = []
+    cpu_times = []
+
+    def listener():
+        period = 1.0 / rate
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            for pressed in (True, False):
+                start = time.perf_counter_ns()
+                cpu_start = time.thread_time_ns()
+                callback(0, 0, button, pressed)
+                cpu_times.append((time.thread_time_ns() - cpu_start) / 1000)
+                durations.append((time.perf_counter_ns() - start) / 1000)
+            time.sleep(period)
+
+    thread = threading.Thread(target=listener, name="Listener")
+    thread.start()
+    thread.join()
+    time.sleep(0.05)
+    engine.stop()
+    devnull.close()
+    return durations, cpu_times, engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=15.0, help="模拟用户每秒点击次数")
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"用户 {args.rate:g} CPS，{args.duration:g} 秒；回调耗时（微秒）")
+    print(f"{'策略':<6}{'回调':<6}{'事件':>6}{'p50':>9}{'p99':>9}{'max':>10}"
+          f"{'CPU p50':>9}{'CPU p99':>9}{'丢弃':>6}")
+    rows = [("-", AssistPolicy, Button("left"), "空", noop_callback)]
+    for policy_name, (make_policy, button) in POLICIES.items():
+        rows.append((policy_name, make_policy, button, "直接", inline_callback))
+        rows.append((policy_name, make_policy, button, "队列", queued_callback))
+    for policy_name, make_policy, button, callback_name, make_callback in rows:
+        durations, cpu_times, engine = run(make_policy(), button, make_callback, args.rate, args.duration)
+        print(f"{policy_name:<6}{callback_name:<6}{len(durations):>6}"
+              f"{percentile(durations, 0.50):>9.2f}{percentile(durations, 0.99):>9.2f}"
+              f"{max(durations):>10.2f}{percentile(cpu_times, 0.50):>9.2f}"
+              f"{percentile(cpu_times, 0.99):>9.2f}{engine.input_events.dropped:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""双通道干扰基准：右键26CPS运行时左键点击的延迟
+
+左右键使用命令行版的默认CPS范围（左键10-12，右键23-26），每次点击的输出模拟为耗时--emit-ms毫秒且释放GIL的调用（与SendInput及光标抖动相同），
+统计左键每次开始输出时相对截止时间的延迟，分别在左键单独运行和左右键同时运行时测量。
+用法: python benchmarks/bench_interference.py [--duration 秒] [--emit-ms 毫秒]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ClickEngine, DeadlineTimer, OutputBackend, TogglePolicy  # noqa: E402
+from core.bench import percentile  # noqa: E402
+from core.timing import clock_ns, to_ns  # noqa: E402
+
+LEFT_CPS = (10, 12)
+RIGHT_CPS = (23, 26)
+
+
+class SlowBackend(OutputBackend):
+    """每次点击阻塞emit秒，期间释放GIL"""
+
+    def __init__(self, emit):
+        self.emit = emit
+
+    def click(self, button, cursor_jitter=0.0):
+        time.sleep(self.emit)
+
+
+def shared_lock(backend, duration, with_right):
+    """旧实现：每个通道一个线程，输出时持有同一把模块级锁"""
+    lock = threading.Lock()
+    lateness = []
+    end = clock_ns() + to_ns(duration)
+
+    def loop(button, cps, record):
+        timer = DeadlineTimer()
+        timer.advance(0.0)
+        while clock_ns() < end:
+            timer.wait()
+            with lock:
+                if record:
+                    lateness.append(clock_ns() - timer.deadline)
+                backend.click(button)
+            timer.advance(1.0 / random.uniform(*cps))
+
+    threads = [threading.Thread(target=loop, args=("left", LEFT_CPS, True))]
+    if with_right:
+        threads.append(threading.Thread(target=loop, args=("right", RIGHT_CPS, False)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return lateness
+
+
+class LatenessPolicy(TogglePolicy):
+    """记录左键每次step开始时相对截止时间的延迟"""
+
+    def __init__(self):
+        super().__init__()
+        self.lateness = []
+
+    def step(self, engine, name):
+        if name == "left":
+            self.lateness.append(engine.clock() - engine.scheduler.channels[name].timer.deadline)
+        return super().step(engine, name)
+
+
+def engine_run(isolate):
+    def run(backend, duration, with_right):
+        policy = LatenessPolicy()
+        engine = ClickEngine(policy, backend=backend, isolate=isolate)
+        engine.configure("left", min_cps=LEFT_CPS[0], max_cps=LEFT_CPS[1])
+        engine.configure("right", min_cps=RIGHT_CPS[0], max_cps=RIGHT_CPS[1])
+        engine.start(listen=False)
+        engine.set_active("left", True)
+        if with_right:
+            engine.set_active("right", True)
+        time.sleep(duration)
+        engine.stop()
+        return policy.lateness
+    return run
+
+
+IMPLEMENTATIONS = (
+    ("shared-lock", shared_lock),
+    ("single-thread", engine_run(isolate=False)),
+    ("per-channel", engine_run(isolate=True)),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--emit-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    backend = SlowBackend(args.emit_ms / 1e3)
+    print(f"左键{LEFT_CPS[0]}-{LEFT_CPS[1]}CPS，右键{RIGHT_CPS[0]}-{RIGHT_CPS[1]}CPS，"
+          f"每次输出{args.emit_ms:g}ms，左键输出延迟(ms):")
+    print(f"{'实现':<15}{'右键':<6}{'点击':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    for name, run in IMPLEMENTATIONS:
+        for with_right in (False, True):
+            lateness = [value / 1e6 for value in run(backend, args.duration, with_right)]
+            print(f"{name:<15}{'开' if with_right else '关':<6}{len(lateness):>6}{percentile(lateness, 0.5):>9.3f}{percentile(lateness, 0.95):>9.3f}"
+                  f"{percentile(lateness, 0.99):>9.3f}{max(lateness):>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""点击间隔的抽取开销：每次点击调用全局random.uniform vs 通道自己的rng按批预先抽取
+
+第一部分比较抽取一个间隔的耗时：旧实现每次调用random.uniform，
+新实现分为每次点击的取值和每批重新抽取（按每个间隔均摊）两部分；
+第二部分直接循环调用TogglePolicy.step（NullBackend），统计从进入step到backend.click的耗时
+（截止时间到达后点击被推迟的时间）和每次step的总耗时；
+最后确认相同seed的两个通道得到完全相同的间隔序列。
+
+用法: python benchmarks/bench_intervals.py [--clicks 200000] [--seed 1]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ChannelConfig, ClickEngine, NullBackend, TogglePolicy  # noqa: E402
+from core.bench import percentile  # noqa: E402
+
+
+def old_interval(config):
+    """旧实现：每次点击从全局random抽取CPS再求倒数"""
+    cps = random.uniform(config.min_cps, config.max_cps)
+    if config.cps_jitter > 0:
+        cps += random.uniform(-config.cps_jitter, config.cps_jitter)
+    return 1.0 / max(1.0, cps)
+
+
+class OldTogglePolicy(TogglePolicy):
+    """改动前的TogglePolicy.step：先抽取再点击"""
+
+    def step(self, engine, name):
+        current_cps = 1.0 / old_interval(engine.configs[name])
+        self.current_cps[name] = current_cps
+        engine.click(name)
+        return 1.0 / current_cps
+
+
+class StampBackend(NullBackend):
+    """记录最近一次click被调用的时间"""
+
+    clicked = 0
+
+    def click(self, button, cursor_jitter=0.0):
+        self.clicked = time.perf_counter_ns()
+
+
+def per_call_ns(func, calls):
+    for _ in range(min(calls, 10000)):  # 预热
+        func()
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter_ns() - start) / calls
+
+
+def run_steps(policy, clicks):
+    """返回(进入step到输出点击的耗时列表, 每次step的平均总耗时)，单位纳秒"""
+    backend = StampBackend()
+    engine = ClickEngine(policy, backend=backend)
+    engine.configure("left", min_cps=10, max_cps=12, cps_jitter=0.5)
+    step = policy.step
+    total = per_call_ns(lambda: step(engine, "left"), clicks)
+    delays = []
+    for _ in range(clicks):
+        start = time.perf_counter_ns()
+        step(engine, "left")
+        delays.append(backend.clicked - start)
+    return delays, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clicks", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    config = ChannelConfig("left", min_cps=10, max_cps=12, cps_jitter=0.5, seed=args.seed)
+    old = per_call_ns(lambda: old_interval(config), args.clicks)
+    batches = max(1, args.clicks // ChannelConfig.BATCH)
+    refill = per_call_ns(config.refill, batches) / ChannelConfig.BATCH
+
+    def draw():
+        config._next = 0  # 只测取值，不触发重新抽取
+        return config.draw_interval()
+    fetch = per_call_ns(draw, args.clicks)
+    print(f"抽取一个间隔: 全局random {old:.0f} ns；按批预抽取 取值 {fetch:.0f} ns + "
+          f"重新抽取均摊 {refill:.0f} ns（每{ChannelConfig.BATCH}次点击一批，在点击输出之后）")
+
+    print(f"{'TogglePolicy.step':<20}{'到点击p50':>10}{'p99':>8}{'总耗时':>9}  (ns)")
+    for label, policy in (("改动前", OldTogglePolicy()), ("改动后", TogglePolicy())):
+        delays, total = run_steps(policy, args.clicks)
+        print(f"{label:<20}{percentile(delays, 0.5):>10}{percentile(delays, 0.99):>8}{total:>9.0f}")
+
+    a = ChannelConfig("left", cps_jitter=0.5, seed=args.seed)
+    b = ChannelConfig("right", cps_jitter=0.5, seed=args.seed)
+    same = all(a.draw_interval() == b.draw_interval() for _ in range(ChannelConfig.BATCH * 4))
+    print(f"seed={args.seed} 的两个通道间隔序列{'相同' if same else '不同'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""系统负载下点击线程的优先级和CPU亲和性对计时的影响
+
+启动--load个忙循环进程（默认每个CPU一个）占满CPU，分别用不同的ThreadPriority设置以目标CPS运行两个通道，
+用ClickTrace统计每次点击开始输出相对截止时间的延迟，并打印每项设置是否生效（没有权限时会失败并回退）。
+
+用法: python benchmarks/bench_priority.py [--cps 25] [--duration 5] [--load N] [--cpus 0]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ClickEngine, ClickScheduler, ClickTrace, NullBackend, TogglePolicy  # noqa: E402
+from core.bench import percentile  # noqa: E402
+from core.priority import ThreadPriority, format_results  # noqa: E402
+
+
+def run(priority, cps, duration):
+    """返回(延迟列表（微秒）, priority.results)"""
+    trace = ClickTrace()
+    engine = ClickEngine(TogglePolicy(), backend=NullBackend(), trace=trace,
+                         scheduler=ClickScheduler(priority=priority))
+    engine.configure("left", min_cps=cps, max_cps=cps)
+    engine.configure("right", min_cps=cps, max_cps=cps)
+    engine.start(listen=False)
+    engine.set_active("left", True)
+    engine.set_active("right", True)
+    time.sleep(duration)
+    engine.stop()
+    lateness = [(start - deadline) / 1000 for _, deadline, start, _ in trace.rows()]
+    return lateness, priority.results if priority is not None else {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cps", type=float, default=25.0)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--load", type=int, default=os.cpu_count() or 1, help="忙循环进程数")
+    parser.add_argument("--cpus", default="0", help="亲和性设置使用的CPU编号，逗号分隔")
+    args = parser.parse_args()
+    cpus = [int(cpu) for cpu in args.cpus.split(",")]
+
+    settings = {
+        "默认": None,
+        "nice -10": ThreadPriority(nice=-10),
+        "SCHED_RR": ThreadPriority(realtime="rr", nice=-10),
+        "SCHED_FIFO": ThreadPriority(realtime="fifo", nice=-10),
+        f"CPU{args.cpus}+FIFO": ThreadPriority(cpus=cpus, realtime="fifo", nice=-10),
+    }
+
+    load = [subprocess.Popen([sys.executable, "-c", "while True: pass"]) for _ in range(args.load)]
+    try:
+        time.sleep(0.5)
+        print(f"{args.load} 个忙循环进程，{args.cps:g} CPS x 2通道，每种 {args.duration:g} 秒；"
+              f"开始输出相对截止时间的延迟（微秒）")
+        print(f"{'设置':<16}{'点击':>6}{'p50':>9}{'p90':>9}{'p99':>10}{'max':>10}")
+        reports = []
+        for label, priority in settings.items():
+            lateness, results = run(priority, args.cps, args.duration)
+            print(f"{label:<16}{len(lateness):>6}{percentile(lateness, 0.5):>9.1f}"
+                  f"{percentile(lateness, 0.9):>9.1f}{percentile(lateness, 0.99):>10.1f}{max(lateness):>10.1f}")
+            if results:
+                reports.append(f"  {label}: {format_results(results)}")
+    finally:
+        for process in load:
+            process.kill()
+            process.wait()
+    print("设置结果:")
+    print("\n".join(reports))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""界面进程繁忙时的点击计时：点击线程在界面进程中 vs 在子进程中（ProcessEngine）
+
+在主进程中启动一个模拟界面工作的线程：不断执行纯Python计算（持有GIL），并定期创建大量对象触发垃圾回收；
+同时以目标CPS运行两个通道，用ClickTrace统计每次点击开始输出相对截止时间的延迟。
+子进程模式下由子进程记录，退出时写入CSV后在这里读取。
+
+用法: python benchmarks/bench_process.py [--cps 25] [--duration 5] [--no-load]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ClickEngine, ClickTrace, NullBackend, TogglePolicy  # noqa: E402
+from core.bench import percentile  # noqa: E402
+from core.process_engine import ProcessEngine  # noqa: E402
+
+
+def gui_load(stop):
+    """模拟界面线程：计算、分配对象，偶尔一次大的垃圾回收"""
+    while not stop.is_set():
+        total = 0
+        for i in range(20000):
+            total += i * i
+        garbage = [[i] for i in range(20000)]
+        del garbage
+
+
+def run(make_engine, cps, duration, load):
+    engine, lateness = make_engine()
+    engine.configure("left", min_cps=cps, max_cps=cps)
+    engine.configure("right", min_cps=cps, max_cps=cps)
+    stop = threading.Event()
+    worker = threading.Thread(target=gui_load, args=(stop,))
+    if load:
+        worker.start()
+    engine.start(listen=False)
+    engine.set_active("left", True)
+    engine.set_active("right", True)
+    time.sleep(duration)
+    engine.stop()
+    stop.set()
+    if load:
+        worker.join()
+    return lateness(engine)
+
+
+def in_process():
+    trace = ClickTrace()
+    engine = ClickEngine(TogglePolicy(), backend=NullBackend(), trace=trace)
+    return engine, lambda engine: [(start - deadline) / 1000 for _, deadline, start, _ in trace.rows()]
+
+
+def child_process():
+    path = os.path.join(tempfile.mkdtemp(), "trace.csv")
+    engine = ProcessEngine(TogglePolicy(), backend="null", trace_path=path)
+
+    def lateness(engine):
+        engine.close()
+        with open(path, encoding="utf-8") as f:
+            return [float(row["lateness_us"]) for row in csv.DictReader(f)]
+    return engine, lateness
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cps", type=float, default=25.0)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--no-load", action="store_true", help="不模拟界面工作")
+    args = parser.parse_args()
+
+    load = not args.no_load
+    print(f"{args.cps:g} CPS x 2通道，每种 {args.duration:g} 秒，界面负载{'开' if load else '关'}；"
+          f"开始输出相对截止时间的延迟（微秒）")
+    print(f"{'点击线程':<10}{'点击':>6}{'p50':>9}{'p90':>9}{'p99':>10}{'max':>10}")
+    for label, make_engine in (("界面进程", in_process), ("子进程", child_process)):
+        lateness = run(make_engine, args.cps, args.duration, load)
+        print(f"{label:<10}{len(lateness):>6}{percentile(lateness, 0.5):>9.1f}{percentile(lateness, 0.9):>9.1f}"
+              f"{percentile(lateness, 0.99):>10.1f}{max(lateness):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""闭环速率控制的收敛性：在VirtualClock上模拟长时间点击，比较开环和开启rate_control时的长期CPS
+
+用命令行版的两个通道参数（左键10-12±1，右键23-26±1.2），模拟的输出后端在每次点击时推进虚拟时钟：
+输出耗时固定，负载场景下还会以一定概率挂起（超过DeadlineTimer.max_lag，开环时这些点击会丢失）。
+对每个场景打印累计CPS相对目标中点的误差，以及此后一直保持在1%以内的时刻。
+闭环CPS的误差超过--tolerance或没有收敛时判为失败，有失败时以非0状态退出。
+
+用法: python benchmarks/bench_rate_control.py [--duration 600] [--seed 1] [--tolerance 0.01]
+"""
+
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ClickEngine, NullBackend, TogglePolicy, VirtualClock  # noqa: E402
+from core.timing import NS  # noqa: E402
+
+CHANNELS = {"left": (10, 12, 1.0), "right": (23, 26, 1.2)}  # 名称 -> (min_cps, max_cps, cps_jitter)
+
+# 场景 -> (输出耗时秒, 每次点击挂起的概率, 挂起秒数)
+SCENARIOS = {
+    "理想": (0.0, 0.0, 0.0),
+    "输出耗时5ms": (0.005, 0.0, 0.0),
+    "负载(1%挂起0.4s)": (0.002, 0.01, 0.4),
+}
+
+
+class SimBackend(NullBackend):
+    """每次点击推进虚拟时钟，模拟输出耗时和系统负载"""
+
+    def __init__(self, clock, cost, stall_chance, stall, seed):
+        super().__init__()
+        self.clock = clock
+        self.cost = cost
+        self.stall_chance = stall_chance
+        self.stall = stall
+        self.rng = random.Random(seed)
+
+    def click(self, button, cursor_jitter=0.0):
+        self.clicks += 1
+        delay = self.cost
+        if self.stall_chance and self.rng.random() < self.stall_chance:
+            delay += self.stall
+        self.clock.advance(delay)
+
+
+def simulate(scenario, rate_control, duration, seed):
+    """返回 名称 -> (累计CPS, 此后一直在1%以内的时刻（秒），未收敛为None)"""
+    cost, stall_chance, stall = SCENARIOS[scenario]
+    clock = VirtualClock()
+    engine = ClickEngine(TogglePolicy(), backend=SimBackend(clock, cost, stall_chance, stall, seed),
+                         clock=clock)
+    times = {name: [] for name in CHANNELS}
+    engine.click_callbacks.append(lambda name, now: times[name].append(now))
+    for index, (name, (low, high, jitter)) in enumerate(CHANNELS.items()):
+        engine.configure(name, min_cps=low, max_cps=high, cps_jitter=jitter, seed=seed + index,
+                         rate_control=rate_control)
+        engine.set_active(name, True)
+    engine.run_for(duration)
+
+    result = {}
+    for name, (low, high, _) in CHANNELS.items():
+        target = (low + high) / 2
+        clicks = times[name]
+        start = clicks[0]
+        settled = None
+        # 从后往前找最后一次累计误差超过1%的点击
+        for k in range(len(clicks) - 1, 0, -1):
+            cps = k * NS / (clicks[k] - start)
+            if abs(cps / target - 1) > 0.01:
+                settled = (clicks[k] - start) / NS if k < len(clicks) - 1 else None
+                break
+        else:
+            settled = 0.0
+        result[name] = ((len(clicks) - 1) * NS / (clicks[-1] - start), settled)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=600.0, help="模拟时长（虚拟秒）")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tolerance", type=float, default=0.01, help="闭环CPS相对目标允许的误差")
+    args = parser.parse_args()
+
+    print(f"模拟 {args.duration:g} 秒；误差为累计CPS相对目标中点，收敛为此后一直在1%以内的时刻")
+    print(f"{'场景':<16}{'通道':<7}{'目标':>6}{'开环CPS':>9}{'误差':>8}{'闭环CPS':>9}{'误差':>8}{'收敛(s)':>9}  结果")
+    failed = False
+    for scenario in SCENARIOS:
+        open_loop = simulate(scenario, False, args.duration, args.seed)
+        closed_loop = simulate(scenario, True, args.duration, args.seed)
+        for name, (low, high, _) in CHANNELS.items():
+            target = (low + high) / 2
+            open_cps, _ = open_loop[name]
+            closed_cps, settled = closed_loop[name]
+            problems = []
+            if abs(closed_cps / target - 1) > args.tolerance:
+                problems.append("超出误差")
+            if settled is None:
+                problems.append("未收敛")
+            failed = failed or bool(problems)
+            settled = "-" if settled is None else f"{settled:.1f}"
+            print(f"{scenario:<16}{name:<7}{target:>6g}{open_cps:>9.3f}{(open_cps / target - 1):>8.2%}"
+                  f"{closed_cps:>9.3f}{(closed_cps / target - 1):>8.2%}{settled:>9}  {'；'.join(problems) or 'OK'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""辅助版界面的启动时间：从启动进程到窗口第一次绘制
+
+每次测量启动一个新的Python进程，分别记录导入完成、窗口创建完成、show()返回和第一次绘制的时刻。
+--all-tabs在显示前创建所有选项卡，相当于不使用懒加载时的启动开销。
+
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py [--runs 10] [--all-tabs]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ("导入", "创建窗口", "show", "首次绘制")
+
+
+def child(launched, all_tabs):
+    """子进程：启动界面，第一次绘制后输出各阶段距启动的毫秒数"""
+    sys.path.insert(0, ROOT)
+    from PyQt5.QtCore import QEvent, QObject
+    from PyQt5.QtWidgets import QApplication
+
+    from core import NullBackend
+    from main import AutoClickerGUI
+
+    marks = [time.perf_counter_ns()]
+    app = QApplication(sys.argv)
+    window = AutoClickerGUI(backend=NullBackend(), listen=False)
+    if all_tabs:
+        for index in list(window.pending_tabs):
+            window.build_pending_tab(index)
+    marks.append(time.perf_counter_ns())
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and len(marks) == 3:
+                marks.append(time.perf_counter_ns())
+                app.quit()
+            return False
+
+    first_paint = FirstPaint()
+    window.installEventFilter(first_paint)
+    window.show()
+    marks.append(time.perf_counter_ns())
+    app.exec_()
+    window.close()
+    print(json.dumps([(mark - launched) / 1e6 for mark in marks]))
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--all-tabs", action="store_true", help="显示前创建所有选项卡")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        child(args.child, args.all_tabs)
+        return
+
+    runs = []
+    for _ in range(args.runs):
+        command = [sys.executable, os.path.abspath(__file__)]
+        if args.all_tabs:
+            command.append("--all-tabs")
+        # perf_counter_ns是系统范围的单调时钟，父子进程的读数可以直接相减
+        command += ["--child", str(time.perf_counter_ns())]
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        runs.append(json.loads(output.splitlines()[-1]))
+
+    print(f"{args.runs} 次启动（毫秒，距启动进程）{'，显示前创建所有选项卡' if args.all_tabs else ''}")
+    print(f"{'阶段':<10}{'中位数':>10}{'最小':>10}{'最大':>10}")
+    for i, phase in enumerate(PHASES):
+        values = [run[i] for run in runs]
+        print(f"{phase:<10}{median(values):>10.1f}{min(values):>10.1f}{max(values):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
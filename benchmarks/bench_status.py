@@ -0,0 +1,111 @@
+"""共享内存状态发布对点击计时的影响，以及单次发布和读取的耗时
+
+以目标CPS运行两个通道，分别在不发布、按默认周期发布、按--fast-interval高频发布并由另一个进程不停读取时，
+用ClickTrace统计每次点击开始输出相对截止时间的延迟；读取进程报告读取次数和因遇到写入中途而重试的次数。
+最后在当前线程中测量StatusPublisher.publish和StatusReader.read的耗时。
+
+用法: python benchmarks/bench_status.py [--cps 25] [--duration 5] [--fast-interval 0.001]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core import ClickEngine, ClickTrace, NullBackend, TogglePolicy  # noqa: E402
+from core.bench import percentile  # noqa: E402
+from core.status import BLOCK_SIZE, StatusPublisher, StatusReader  # noqa: E402
+from core.timing import clock_ns  # noqa: E402
+
+NAME = "auto_click_status_bench"
+
+# 读取进程：在duration秒内不停读取，最后打印 读取次数 重试次数 最大发布序号
+READER = """
+import sys, time
+from core.status import StatusReader
+reader = StatusReader(sys.argv[1])
+end = time.perf_counter() + float(sys.argv[2])
+reads = 0
+while time.perf_counter() < end:
+    status = reader.read()
+    reads += 1
+print(reads, reader.retries, status.publishes)
+reader.close()
+"""
+
+
+def run(cps, duration, interval, read):
+    """返回(延迟列表（微秒）, 读取进程的输出或None)"""
+    trace = ClickTrace()
+    engine = ClickEngine(TogglePolicy(), backend=NullBackend(), trace=trace)
+    engine.configure("left", min_cps=cps, max_cps=cps)
+    engine.configure("right", min_cps=cps, max_cps=cps)
+    publisher = None
+    reader = None
+    if interval is not None:
+        publisher = StatusPublisher(engine, NAME, interval)
+        publisher.start()
+    if read:
+        reader = subprocess.Popen([sys.executable, "-c", READER, NAME, str(duration)],
+                                  cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    engine.start(listen=False)
+    engine.set_active("left", True)
+    engine.set_active("right", True)
+    time.sleep(duration)
+    engine.stop()
+    output = reader.communicate()[0].split() if reader is not None else None
+    if publisher is not None:
+        publisher.close()
+    return [(start - deadline) / 1000 for _, deadline, start, _ in trace.rows()], output
+
+
+def call_cost(function, count):
+    """function平均每次调用的耗时（微秒）"""
+    start = clock_ns()
+    for _ in range(count):
+        function()
+    return (clock_ns() - start) / count / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cps", type=float, default=25.0)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--fast-interval", type=float, default=0.001, help="高频发布的周期（秒）")
+    args = parser.parse_args()
+
+    print(f"{args.cps:g} CPS x 2通道，每种 {args.duration:g} 秒；开始输出相对截止时间的延迟（微秒）")
+    print(f"{'发布方式':<22}{'点击':>6}{'p50':>9}{'p90':>9}{'p99':>10}{'max':>10}")
+    rows = (
+        ("不发布", None, False),
+        ("每0.1秒", 0.1, False),
+        (f"每{args.fast_interval:g}秒+读取进程", args.fast_interval, True),
+    )
+    reads = None
+    for label, interval, read in rows:
+        lateness, output = run(args.cps, args.duration, interval, read)
+        print(f"{label:<22}{len(lateness):>6}{percentile(lateness, 0.5):>9.1f}{percentile(lateness, 0.9):>9.1f}"
+              f"{percentile(lateness, 0.99):>10.1f}{max(lateness):>10.1f}")
+        reads = output or reads
+    if reads is not None:
+        count, retries, publishes = (int(value) for value in reads)
+        print(f"读取进程: {count} 次读取（{count / args.duration:.0f}/秒），重试 {retries} 次，"
+              f"期间发布 {publishes} 次")
+
+    engine = ClickEngine(TogglePolicy(), backend=NullBackend(), trace=ClickTrace())
+    engine.configure("left", min_cps=args.cps, max_cps=args.cps)
+    engine.configure("right", min_cps=args.cps, max_cps=args.cps)
+    publisher = StatusPublisher(engine, NAME)
+    reader = StatusReader(NAME)
+    print(f"publish: {call_cost(publisher.publish, 20000):.2f} us/次，"
+          f"read: {call_cost(reader.read, 20000):.2f} us/次（2个通道，块大小 {BLOCK_SIZE} 字节）")
+    reader.close()
+    publisher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""点击记录的开销：开启ClickTrace前后每次点击的耗时和内存分配
+
+第一部分直接循环调用ClickEngine.click（NullBackend），比较每次点击的平均耗时，
+并用tracemalloc确认环形缓冲区写满后记录不再占用新的内存；
+第二部分以目标CPS真实运行几秒，把记录保存为CSV并打印延迟统计。
+
+用法: python benchmarks/bench_trace.py [--clicks 200000] [--cps 25] [--duration 3] [--output trace.csv]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ClickEngine, ClickTrace, NullBackend, TogglePolicy  # noqa: E402
+from core.bench import percentile  # noqa: E402
+
+
+def per_click_ns(trace, clicks):
+    """直接调用click的平均耗时（纳秒）和记录期间新增的内存（字节）"""
+    engine = ClickEngine(TogglePolicy(), backend=NullBackend(), trace=trace)
+    engine.configure("left")
+    click = engine.click
+    for _ in range(min(clicks, 10000)):  # 预热，并让环形缓冲区写满一轮
+        click("left")
+    start = time.perf_counter_ns()
+    for _ in range(clicks):
+        click("left")
+    elapsed = time.perf_counter_ns() - start
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(clicks):
+        click("left")
+    grown = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return elapsed / clicks, grown
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clicks", type=int, default=200000)
+    parser.add_argument("--cps", type=float, default=25.0)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--output", default="trace.csv")
+    args = parser.parse_args()
+
+    plain, plain_grown = per_click_ns(None, args.clicks)
+    traced, traced_grown = per_click_ns(ClickTrace(capacity=4096), args.clicks)
+    print(f"每次点击: 不记录 {plain:.0f} ns，记录 {traced:.0f} ns（+{traced - plain:.0f} ns）")
+    print(f"记录{args.clicks}次点击期间新增内存: 不记录 {plain_grown} 字节，记录 {traced_grown} 字节")
+
+    trace = ClickTrace()
+    engine = ClickEngine(TogglePolicy(), backend=NullBackend(), trace=trace)
+    engine.configure("left", min_cps=args.cps, max_cps=args.cps)
+    engine.configure("right", min_cps=args.cps, max_cps=args.cps)
+    engine.start(listen=False)
+    engine.set_active("left", True)
+    engine.set_active("right", True)
+    time.sleep(args.duration)
+    engine.stop()
+
+    rows = trace.rows()
+    lateness = [(start - deadline) / 1000 for _, deadline, start, _ in rows]
+    print(f"{args.cps:g} CPS x 2通道运行 {args.duration:g} 秒，{len(rows)} 次点击；"
+          f"开始输出相对截止时间的延迟 p50 {percentile(lateness, 0.5):.1f} us，"
+          f"p99 {percentile(lateness, 0.99):.1f} us，max {max(lateness):.1f} us")
+    print(f"已保存到 {args.output}（{trace.dump(args.output)} 行）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""唤醒延迟的尾部分布：相对休眠 vs Linux上按绝对截止时间等待
+
+每种等待方式按固定周期连续等待到绝对截止时间，统计实际醒来时间比截止时间晚多少（微秒）：
+sleep: time.sleep(截止时间 - 当前时间)；condition: Condition.wait(超时)（ClickScheduler默认）；
+clock_nanosleep: linux_timing.sleep_until；timerfd: linux_timing.TimerfdWaiter（ClickScheduler(waiter=...)）。
+Linux上的两种各用内核默认的定时器松弛量和--timer-slack各测一次；--load启动若干个忙循环进程模拟系统负载。
+
+用法: python benchmarks/bench_wakeup.py [--period 5] [--count 2000] [--timer-slack 1000] [--load 0]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import linux_timing  # noqa: E402
+from core.bench import percentile  # noqa: E402
+from core.timing import NS, clock_ns  # noqa: E402
+
+
+def sleep_wait():
+    def wait(deadline):
+        delay = deadline - clock_ns()
+        if delay > 0:
+            time.sleep(delay / NS)
+    return wait
+
+
+def condition_wait():
+    cond = threading.Condition()
+
+    def wait(deadline):
+        with cond:
+            delay = deadline - clock_ns()
+            if delay > 0:
+                cond.wait(delay / NS)
+    return wait
+
+
+def nanosleep_wait():
+    return linux_timing.sleep_until
+
+
+def timerfd_wait():
+    waiter = linux_timing.TimerfdWaiter()
+    lock = threading.Lock()
+
+    def wait(deadline):
+        with lock:
+            waiter.wait(lock, deadline)
+    return wait
+
+
+def measure(make_wait, period, count, timer_slack):
+    """在新线程中等待count次，返回每次的延迟列表（微秒）和是否设置了松弛量"""
+    lateness = []
+    applied = []
+
+    def target():
+        if timer_slack is not None:
+            applied.append(linux_timing.set_timer_slack(timer_slack))
+        wait = make_wait()
+        deadline = clock_ns() + period
+        for _ in range(count):
+            wait(deadline)
+            lateness.append((clock_ns() - deadline) / 1000)
+            deadline += period
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    return lateness, bool(applied and applied[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--period", type=float, default=5.0, help="等待周期（毫秒）")
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--timer-slack", type=int, default=1000, help="定时器松弛量（纳秒）")
+    parser.add_argument("--load", type=int, default=0, help="忙循环进程数")
+    args = parser.parse_args()
+
+    rows = [("sleep", sleep_wait, None), ("condition", condition_wait, None)]
+    if linux_timing.available():
+        for name, make_wait in (("clock_nanosleep", nanosleep_wait), ("timerfd", timerfd_wait)):
+            rows.append((name, make_wait, None))
+            rows.append((f"{name}/slack", make_wait, args.timer_slack))
+    else:
+        print("当前平台不支持core.linux_timing，只测量sleep和condition")
+
+    load = [subprocess.Popen([sys.executable, "-c", "while True: pass"]) for _ in range(args.load)]
+    try:
+        print(f"周期 {args.period:g} ms，每种 {args.count} 次，{args.load} 个忙循环进程；"
+              f"松弛量 {linux_timing.get_timer_slack() if linux_timing.available() else '-'} ns -> "
+              f"{args.timer_slack} ns；延迟（微秒）")
+        print(f"{'等待方式':<22}{'p50':>8}{'p90':>8}{'p99':>9}{'p99.9':>9}{'max':>9}")
+        for name, make_wait, timer_slack in rows:
+            lateness, applied = measure(make_wait, round(args.period * NS / 1000), args.count, timer_slack)
+            if timer_slack is not None and not applied:
+                name += "(未生效)"
+            print(f"{name:<22}{percentile(lateness, 0.5):>8.1f}{percentile(lateness, 0.9):>8.1f}"
+                  f"{percentile(lateness, 0.99):>9.1f}{percentile(lateness, 0.999):>9.1f}{max(lateness):>9.1f}")
+    finally:
+        for process in load:
+            process.kill()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""启动导入开销检查：用 -X importtime 测量各入口的导入耗时，超出记录的基线加余量时失败
+
+每个入口在新的Python进程中导入多次，取顶层模块累计导入耗时的中位数，除以同样方式测得的解释器启动时
+自身的导入耗时（python -c pass），得到与机器快慢无关的相对值；相对值超过 import_budget.json 中
+记录的基线乘以margin时失败。同时检查入口没有导入不该导入的模块（命令行版不加载PyQt5，任何入口都不在导入时加载pynput）。
+
+用法: python benchmarks/check_import_budget.py [--runs 7] [--record [--margin 1.5]]
+--record 以本次测量的相对值重新记录基线，并记录 --margin。
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import_budget.json")
+
+# 入口 -> (导入语句, 顶层模块, 不允许导入的模块)
+ENTRIES = {
+    "cli": ("import core", "core", ("PyQt5", "pynput")),
+    "bench": ("import core.bench", "core.bench", ("PyQt5", "pynput")),
+    "mode_gui": ("import auto_clicker_gui", "auto_clicker_gui", ("pynput",)),
+    "assist_gui": ("import main", "main", ("pynput",)),
+}
+
+
+def import_times(statement):
+    """在新进程中执行statement，返回 模块名 -> 累计导入耗时（微秒）"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT, check=True, capture_output=True, text=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def startup_time():
+    """在新进程中运行python -c pass，返回解释器启动时顶层模块累计导入耗时之和（微秒）"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"],
+                            cwd=ROOT, check=True, capture_output=True, text=True)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # 缩进表示被其他模块导入，只累加顶层模块
+            total += int(cumulative)
+    return total
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def measure(runs):
+    """返回 入口 -> (累计导入耗时中位数（微秒）, 导入了的禁止模块)"""
+    results = {}
+    for entry, (statement, module, forbidden) in ENTRIES.items():
+        samples = []
+        loaded = set()
+        for _ in range(runs):
+            times = import_times(statement)
+            samples.append(times[module])
+            loaded.update(name for name in times
+                          if any(name == f or name.startswith(f + ".") for f in forbidden))
+        results[entry] = (median(samples), sorted(loaded))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--record", action="store_true", help="重新记录基线")
+    parser.add_argument("--margin", type=float, default=1.5, help="记录基线时一并记录的允许倍数")
+    args = parser.parse_args()
+
+    # 先导入一次，避免把编译.pyc的时间算进去
+    for statement, _, _ in ENTRIES.values():
+        import_times(statement)
+    startup = median([startup_time() for _ in range(args.runs)])
+    results = measure(args.runs)
+
+    if args.record:
+        budget = {
+            "margin": args.margin,
+            "baseline": {entry: round(us / startup, 2) for entry, (us, _) in results.items()},
+        }
+        with open(BUDGET_FILE, "w", encoding="utf-8") as f:
+            json.dump(budget, f, indent=2)
+            f.write("\n")
+    with open(BUDGET_FILE, encoding="utf-8") as f:
+        budget = json.load(f)
+    margin = budget["margin"]
+
+    failed = False
+    print(f"解释器启动导入 {startup / 1000:.1f} ms；相对值 = 入口导入耗时 / 启动导入耗时，上限 = 基线 x {margin:g}")
+    print(f"{'入口':<12}{'导入(ms)':>10}{'相对值':>8}{'基线':>8}{'上限':>8}  结果")
+    for entry, (us, loaded) in results.items():
+        ratio = us / startup
+        baseline = budget["baseline"].get(entry)
+        problems = []
+        if baseline is not None and ratio > baseline * margin:
+            problems.append("超出基线")
+        if loaded:
+            problems.append("导入了 " + ", ".join(loaded))
+        failed = failed or bool(problems)
+        baseline_text = f"{baseline:.2f}" if baseline is not None else "-"
+        limit_text = f"{baseline * margin:.2f}" if baseline is not None else "-"
+        print(f"{entry:<12}{us / 1000:>10.1f}{ratio:>8.2f}{baseline_text:>8}{limit_text:>8}  "
+              f"{'；'.join(problems) or 'OK'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+"""自动点击器核心模块（不依赖Qt）"""
+
+from .backends import NullBackend, OutputBackend, PynputBackend, RecordingBackend
+from .control import RateController
+from .cpu import CpuMonitor, ThreadUsage
+from .engine import ChannelConfig, ClickEngine
+from .events import InputQueue
+from .policies import AssistPolicy, ModePolicy, TogglePolicy
+from .scheduler import Channel, ClickScheduler
+from .stats import ChannelStats, StatsSnapshot, StatsWorker
+from .timing import DeadlineTimer, VirtualClock
+from .trace import ClickTrace
+from .window import ClickWindow, RateEstimator, real_cps
+
+__all__ = [
+    "AssistPolicy", "Channel", "ChannelConfig", "ChannelStats", "ClickEngine", "ClickScheduler",
+    "ClickTrace", "ClickWindow", "CpuMonitor", "DeadlineTimer", "InputQueue", "ModePolicy",
+    "NullBackend", "OutputBackend", "PynputBackend", "RateController", "RateEstimator",
+    "RecordingBackend", "StatsSnapshot", "StatsWorker", "ThreadUsage", "TogglePolicy",
+    "VirtualClock", "real_cps",
+]
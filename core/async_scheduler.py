@@ -0,0 +1,182 @@
+"""基于asyncio的点击调度器
+
+与ClickScheduler接口相同，可通过ClickEngine(policy, scheduler=AsyncScheduler())替换线程调度：
+每个通道是事件循环中的一个协程，按loop.call_at的截止时间唤醒，所有step都在事件循环线程中执行，
+除鼠标监听外不需要其他线程。单独放在一个模块中，不使用时不导入asyncio。
+"""
+
+import asyncio
+import threading
+
+from .cpu import CpuMonitor
+from .scheduler import Channel
+from .timing import NS, clock_ns
+
+
+def _resolve(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class AsyncChannel(Channel):
+    """在事件循环中运行的点击通道"""
+
+    def __init__(self, name, step, clock):
+        super().__init__(name, step, clock)
+        self.waiter = None  # 通道协程正在等待的future
+
+
+class AsyncScheduler:
+    """在asyncio事件循环中驱动任意数量的点击通道
+
+    事件循环由调用方运行：await scheduler.run()，直到stop()。
+    set_active/stop可以从任意线程（如pynput监听线程）调用，唤醒请求通过call_soon_threadsafe送入事件循环。
+    step在事件循环线程中依次执行，输出较慢时会推迟其他通道（线程调度器的isolated在这里不适用）。
+    priority为ThreadPriority（见core.priority）时run()先调整事件循环线程的CPU亲和性和优先级。
+    """
+
+    def __init__(self, clock=clock_ns, priority=None):
+        self.clock = clock
+        self.priority = priority
+        self.channels = {}
+        self.wakeups = 0  # 通道协程被唤醒的次数
+        self.cpu = CpuMonitor()
+        self.loop = None  # run()运行期间的事件循环
+        self._lock = threading.Lock()
+        self._tasks = []
+        self._stopped = None
+        self._running = False
+        self._loop_cpu = None
+
+    def add_channel(self, name, step, isolated=False):
+        """注册通道，初始为未激活"""
+        channel = AsyncChannel(name, step, self.clock)
+        with self._lock:
+            self.channels[name] = channel
+        if self.loop is not None:
+            self._call(self._spawn, channel)
+        return channel
+
+    def set_active(self, name, active):
+        """激活或停用通道，激活后立即执行第一次step"""
+        with self._lock:
+            channel = self.channels[name]
+            if channel.active == active:
+                # step可能正要返回None，记下请求以免丢失这次唤醒
+                channel.rearm = active
+                return
+            channel.active = active
+            channel.generation += 1
+            channel.timer.stop()
+            if active:
+                channel.timer.advance(0.0)
+        self._call(self._wake, channel)
+
+    def toggle(self, name):
+        """切换通道状态，返回切换后的状态"""
+        active = not self.channels[name].active
+        self.set_active(name, active)
+        return active
+
+    def is_active(self, name):
+        return self.channels[name].active
+
+    def start(self):
+        """与ClickScheduler兼容；事件循环由调用方通过run()运行"""
+
+    def stop(self):
+        """停止所有通道协程，run()随之返回"""
+        self._running = False
+        if self._stopped is not None:
+            self._call(_resolve, self._stopped)
+
+    async def run(self):
+        """在当前事件循环中运行所有通道，直到stop()"""
+        self.loop = asyncio.get_running_loop()
+        self._loop_cpu = self.cpu.thread("事件循环")
+        if self.priority is not None:
+            self.priority.apply(self._loop_cpu.name)
+        self._running = True
+        self._stopped = self.loop.create_future()
+        for channel in list(self.channels.values()):
+            self._spawn(channel)
+        try:
+            await self._stopped
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+            self._stopped = None
+            self.loop = None
+
+    def _call(self, callback, *args):
+        """在事件循环线程中执行callback，可从任意线程调用"""
+        loop = self.loop
+        if loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            callback(*args)
+        else:
+            loop.call_soon_threadsafe(callback, *args)
+
+    def _spawn(self, channel):
+        if self._running:
+            self._tasks.append(self.loop.create_task(self._channel_loop(channel)))
+
+    def _wake(self, channel):
+        """通道状态变化，让通道协程重新计算截止时间"""
+        if channel.waiter is not None:
+            _resolve(channel.waiter)
+
+    async def _sleep(self, channel, when):
+        """等待到事件循环时间when，when为None时一直等到_wake"""
+        loop = self.loop
+        self._loop_cpu.sample()
+        waiter = channel.waiter = loop.create_future()
+        handle = loop.call_at(when, _resolve, waiter) if when is not None else None
+        try:
+            await waiter
+        finally:
+            channel.waiter = None
+            if handle is not None:
+                handle.cancel()
+        self.wakeups += 1
+
+    async def _channel_loop(self, channel):
+        """通道协程：休眠到截止时间，执行step，安排下一次截止时间"""
+        loop = self.loop
+        while self._running:
+            deadline = channel.timer.deadline
+            if not channel.active or deadline is None:
+                await self._sleep(channel, None)
+                continue
+            delay = deadline - self.clock()
+            if delay > 0:
+                await self._sleep(channel, loop.time() + delay / NS)
+                continue
+            with self._lock:
+                if not channel.active or channel.timer.deadline != deadline:
+                    continue  # 其他线程刚刚切换了通道状态
+                generation = channel.generation
+                channel.rearm = False
+            self._finish(channel, generation, channel.step())
+
+    def _finish(self, channel, generation, interval):
+        """根据step的返回值安排通道的下一次截止时间"""
+        with self._lock:
+            if generation != channel.generation:
+                return
+            if interval is None and channel.rearm:
+                # step期间有新的激活请求，立即重新执行
+                interval = 0.0
+            if interval is None:
+                channel.active = False
+                channel.generation += 1
+                channel.timer.stop()
+            else:
+                channel.timer.advance(interval)
@@ -0,0 +1,79 @@
+"""点击输出后端
+
+ClickEngine只通过click(button, cursor_jitter)输出点击，button为按键名（left、right等）。
+PynputBackend输出真实鼠标事件；NullBackend什么都不做，用于测量调度本身的开销；
+RecordingBackend记录每次点击的时间，用于无桌面环境下的计时测试和基准。
+"""
+
+import random
+from array import array
+
+from .timing import clock_ns
+
+
+class OutputBackend:
+    """输出后端接口"""
+
+    def click(self, button, cursor_jitter=0.0):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PynputBackend(OutputBackend):
+    """通过pynput输出真实的鼠标点击"""
+
+    def __init__(self, controller=None):
+        from pynput import mouse
+
+        self._buttons = mouse.Button
+        self.controller = controller if controller is not None else mouse.Controller()
+
+    def click(self, button, cursor_jitter=0.0):
+        controller = self.controller
+        controller.click(getattr(self._buttons, button))
+        # 添加光标随机抖动后复位
+        if cursor_jitter > 0:
+            x, y = controller.position
+            controller.position = (x + random.uniform(-cursor_jitter, cursor_jitter),
+                                   y + random.uniform(-cursor_jitter, cursor_jitter))
+            controller.position = (x, y)
+
+
+class NullBackend(OutputBackend):
+    """丢弃所有点击，只计数"""
+
+    def __init__(self):
+        self.clicks = 0
+
+    def click(self, button, cursor_jitter=0.0):
+        self.clicks += 1
+
+
+class RecordingBackend(OutputBackend):
+    """按按键记录每次点击的输出时间"""
+
+    def __init__(self, clock=clock_ns):
+        self.clock = clock
+        self.times = {}  # 按键名 -> array('q')，纳秒
+
+    def click(self, button, cursor_jitter=0.0):
+        times = self.times.get(button)
+        if times is None:
+            times = self.times[button] = array('q')
+        times.append(self.clock())
+
+    def count(self, button=None):
+        """点击次数，button为None时返回所有按键的总数"""
+        if button is None:
+            return sum(len(times) for times in self.times.values())
+        return len(self.times.get(button, ()))
+
+    def intervals(self, button):
+        """相邻两次点击的间隔（纳秒）"""
+        times = self.times.get(button, ())
+        return [b - a for a, b in zip(times, times[1:])]
+
+    def clear(self):
+        self.times.clear()
@@ -0,0 +1,240 @@
+"""点击循环计时精度基准
+
+每种点击循环实现以固定CPS向RecordingBackend点击duration秒，统计：
+实际平均CPS、相邻点击间隔与目标间隔之差的p50/p95/p99/max、每1000次点击的CPU秒数和唤醒次数。
+指定--guards时scheduler按每个guard（毫秒，见ClickScheduler）各运行一次，另外统计自旋占用的CPU比例。
+Linux上另有abstime和timerfd两种按绝对截止时间等待的实现（见core.linux_timing），
+--timer-slack设置它们等待线程的定时器松弛量（纳秒，内核默认50000）。
+结果保存为JSON，便于在不同改动之间对比。
+
+用法: python auto_clicker.py bench [--cps 12] [--duration 5] [--loops sleep,scheduler] [--guards 0,1,2]
+      [--spin-share 0.05] [--timer-slack 1000] [--output 文件]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import threading
+import time
+
+from .backends import RecordingBackend
+from .engine import ClickEngine
+from .policies import TogglePolicy
+from .scheduler import ClickScheduler
+from .timing import NS, DeadlineTimer, clock_ns, to_ns
+
+
+def sleep_loop(backend, cps, duration):
+    """最初的实现：点击后固定休眠1/cps，点击耗时和休眠超时会累积"""
+    wakeups = 0
+    end = clock_ns() + to_ns(duration)
+    while clock_ns() < end:
+        backend.click("left")
+        time.sleep(1.0 / cps)
+        wakeups += 1
+    return wakeups
+
+
+def deadline_loop(backend, cps, duration):
+    """每个通道一个线程，按绝对截止时间休眠"""
+    wakeups = 0
+    timer = DeadlineTimer()
+    end = clock_ns() + to_ns(duration)
+    timer.advance(0.0)
+    while clock_ns() < end:
+        backend.click("left")
+        timer.advance(1.0 / cps)
+        timer.wait()
+        wakeups += 1
+    return wakeups
+
+
+def scheduler_loop(backend, cps, duration, guard=0.0, spin_share=None, spin=None):
+    """ClickEngine：所有通道共用一个堆调度线程，每个通道在自己的输出线程中点击
+
+    guard为截止时间前开始自旋的秒数；spin为dict时写入自旋时间占运行时间的比例
+    """
+    engine = ClickEngine(TogglePolicy(), backend=backend, scheduler=ClickScheduler(guard=guard))
+    engine.configure("left", min_cps=cps, max_cps=cps)
+    channel = engine.scheduler.channels["left"]
+    if spin_share is not None:
+        channel.spin_share = spin_share
+    engine.start(listen=False)
+    engine.set_active("left", True)
+    time.sleep(duration)
+    engine.stop()
+    if spin is not None:
+        spin["share"] = channel.spin_time / to_ns(duration)
+    return engine.scheduler.wakeups
+
+
+def asyncio_loop(backend, cps, duration):
+    """ClickEngine + AsyncScheduler：通道协程在事件循环中按loop.call_at唤醒"""
+    import asyncio
+
+    from .async_scheduler import AsyncScheduler
+
+    engine = ClickEngine(TogglePolicy(), backend=backend, scheduler=AsyncScheduler())
+    engine.configure("left", min_cps=cps, max_cps=cps)
+
+    async def main():
+        engine.start(listen=False)
+        engine.set_active("left", True)
+        asyncio.get_running_loop().call_later(duration, engine.stop)
+        await engine.scheduler.run()
+
+    asyncio.run(main())
+    return engine.scheduler.wakeups
+
+
+def abstime_loop(backend, cps, duration, timer_slack=None):
+    """每个通道一个线程，用clock_nanosleep(TIMER_ABSTIME)休眠到绝对截止时间（仅Linux）"""
+    from .linux_timing import set_timer_slack, sleep_until
+
+    if timer_slack is not None:
+        set_timer_slack(timer_slack)
+    wakeups = 0
+    timer = DeadlineTimer()
+    end = clock_ns() + to_ns(duration)
+    timer.advance(0.0)
+    while clock_ns() < end:
+        backend.click("left")
+        sleep_until(timer.advance(1.0 / cps))
+        wakeups += 1
+    return wakeups
+
+
+def timerfd_loop(backend, cps, duration, timer_slack=None):
+    """ClickEngine + TimerfdWaiter：调度线程用timerfd按绝对截止时间等待（仅Linux）"""
+    from .linux_timing import TimerfdWaiter
+
+    waiter = TimerfdWaiter(timer_slack)
+    engine = ClickEngine(TogglePolicy(), backend=backend, scheduler=ClickScheduler(waiter=waiter))
+    engine.configure("left", min_cps=cps, max_cps=cps)
+    engine.start(listen=False)
+    engine.set_active("left", True)
+    time.sleep(duration)
+    engine.stop()
+    waiter.close()
+    return engine.scheduler.wakeups
+
+
+# 名称 -> loop(backend, cps, duration)，返回唤醒次数
+LOOPS = {
+    "sleep": sleep_loop,
+    "deadline": deadline_loop,
+    "scheduler": scheduler_loop,
+    "asyncio": asyncio_loop,
+}
+# 名称 -> loop(backend, cps, duration, timer_slack)
+LINUX_LOOPS = {
+    "abstime": abstime_loop,
+    "timerfd": timerfd_loop,
+}
+if sys.platform.startswith("linux"):
+    LOOPS.update(LINUX_LOOPS)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run_loop(loop, cps, duration, **options):
+    """在独立线程中运行一种实现，返回统计结果"""
+    backend = RecordingBackend()
+    result = {}
+
+    def target():
+        result["wakeups"] = loop(backend, cps, duration, **options)
+
+    cpu_start = time.process_time()
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    cpu = time.process_time() - cpu_start
+
+    times = backend.times.get("left", ())
+    clicks = len(times)
+    intervals = backend.intervals("left")
+    target = NS / cps
+    errors = [abs(interval - target) / 1e6 for interval in intervals] or [0.0]
+    span = (times[-1] - times[0]) / NS if clicks > 1 else 0.0
+    return {
+        "clicks": clicks,
+        "mean_cps": (clicks - 1) / span if span > 0 else 0.0,
+        "error_ms": {
+            "p50": percentile(errors, 0.50),
+            "p95": percentile(errors, 0.95),
+            "p99": percentile(errors, 0.99),
+            "max": max(errors),
+        },
+        "cpu_per_1000": cpu / clicks * 1000 if clicks else 0.0,
+        "wakeups": result["wakeups"],
+    }
+
+
+def run(loops, cps, duration, guards=None, spin_share=None, timer_slack=None):
+    results = {}
+    for name in loops:
+        if name in LINUX_LOOPS:
+            results[name] = run_loop(LOOPS[name], cps, duration, timer_slack=timer_slack)
+        elif name == "scheduler" and guards:
+            for guard in guards:
+                spin = {}
+                result = run_loop(scheduler_loop, cps, duration, guard=guard / 1000, spin_share=spin_share,
+                                  spin=spin)
+                result["spin_share"] = spin["share"]
+                results[f"scheduler/{guard:g}ms"] = result
+        else:
+            results[name] = run_loop(LOOPS[name], cps, duration)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="auto_clicker.py bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--cps", type=float, default=12.0, help="目标CPS（固定，不随机）")
+    parser.add_argument("--duration", type=float, default=5.0, help="每种实现运行的秒数")
+    parser.add_argument("--loops", default=",".join(LOOPS), help="要运行的实现，逗号分隔")
+    parser.add_argument("--guards", help="scheduler自旋等待的guard（毫秒），逗号分隔，例如0,0.5,1,2")
+    parser.add_argument("--spin-share", type=float, help="每个通道自旋最多占用的CPU比例，默认0.05")
+    parser.add_argument("--timer-slack", type=int, help="abstime和timerfd等待线程的定时器松弛量（纳秒）")
+    parser.add_argument("--output", help="结果JSON路径，默认bench-<时间>.json")
+    args = parser.parse_args(argv)
+
+    loops = [name for name in args.loops.split(",") if name]
+    unknown = [name for name in loops if name not in LOOPS]
+    if unknown:
+        parser.error(f"未知的实现: {', '.join(unknown)}（可选: {', '.join(LOOPS)}）")
+
+    try:
+        guards = [float(guard) for guard in args.guards.split(",")] if args.guards else None
+    except ValueError:
+        parser.error(f"无效的guard: {args.guards}")
+
+    results = run(loops, args.cps, args.duration, guards, args.spin_share, args.timer_slack)
+
+    print(f"目标CPS {args.cps:g}，每种实现 {args.duration:g} 秒")
+    print(f"{'实现':<16}{'点击':>7}{'CPS':>8}{'p50(ms)':>9}{'p95(ms)':>9}{'p99(ms)':>9}"
+          f"{'max(ms)':>9}{'CPU秒/千次':>12}{'唤醒':>7}{'自旋CPU':>9}")
+    for name, r in results.items():
+        e = r["error_ms"]
+        spin = f"{r['spin_share']:.2%}" if "spin_share" in r else "-"
+        print(f"{name:<16}{r['clicks']:>7}{r['mean_cps']:>8.2f}{e['p50']:>9.3f}{e['p95']:>9.3f}"
+              f"{e['p99']:>9.3f}{e['max']:>9.3f}{r['cpu_per_1000']:>12.4f}{r['wakeups']:>7}{spin:>9}")
+
+    output = args.output or time.strftime("bench-%Y%m%d-%H%M%S.json")
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cps": args.cps,
+        "duration": args.duration,
+        "timer_slack": args.timer_slack,
+        "results": results,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"结果已保存到 {output}")
+    return 0
@@ -0,0 +1,53 @@
+"""闭环点击速率控制
+
+开环运行时长期CPS会偏离设定范围的中点：间隔1/uniform(min_cps, max_cps)的期望大于1/中点，实际CPS偏低；
+线程被挂起超过DeadlineTimer.max_lag时截止时间重新对齐，落后的点击不再补回。
+RateController记录通道激活后第一次点击的时间t0和点击次数k，理想情况下第k次点击应在t0 + k/target，
+每次点击后用实际时间与理想时间之差（相位误差）修正策略给出的下一个间隔，误差有界，长期CPS收敛到target。
+"""
+
+from .timing import NS
+
+
+class RateController:
+    """单个通道的速率控制器，只由该通道的点击线程调用
+
+    gain为每次点击消除的相位误差比例；修正后的间隔限制在策略间隔的[1/max_ratio, max_ratio]倍内，
+    追赶时CPS不会超过目标的max_ratio倍；落后最多只追赶max_lag秒，更早的部分（例如系统休眠）直接放弃。
+    """
+
+    def __init__(self, target_cps, gain=0.2, max_ratio=2.0, max_lag=1.0):
+        self.target_cps = target_cps
+        self.gain = gain
+        self.max_ratio = max_ratio
+        self.max_lag = max_lag
+        self.error = 0.0  # 最近一次点击的相位误差（秒），正数表示落后
+        self.reset()
+
+    def reset(self):
+        """通道停用或重新激活时调用，下一次点击重新作为起点"""
+        self._start = None
+        self._clicks = 0
+        self._last = None
+
+    def clicked(self, now):
+        """每次输出点击后调用，now为点击完成的时间（纳秒）"""
+        if self._start is None:
+            self._start = now
+            self._clicks = 0
+        else:
+            self._clicks += 1
+        self._last = now
+
+    def correct(self, interval):
+        """根据最近一次点击的相位误差修正策略给出的下一个间隔（秒）"""
+        if self._last is None:
+            return interval
+        error = (self._last - self._start) / NS - self._clicks / self.target_cps
+        if error > self.max_lag:
+            # 把起点后移，只保留max_lag秒的落后
+            self._start += round((error - self.max_lag) * NS)
+            error = self.max_lag
+        self.error = error
+        corrected = interval - self.gain * error
+        return min(max(corrected, interval / self.max_ratio), interval * self.max_ratio)
@@ -0,0 +1,67 @@
+"""按线程统计点击器自身的CPU占用
+
+time.thread_time只能读取当前线程的CPU时间，因此每个线程在休眠前自己调用ThreadCpu.sample()，
+记录到目前为止的CPU时间并计一次唤醒；休眠期间不消耗CPU，其他线程读到的值始终是准确的。
+CpuMonitor汇总所有线程，计算两次读取之间各线程的CPU占用百分比和每秒唤醒次数。
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from .timing import NS, clock_ns
+
+# cpu_percent: 占一个CPU核心的百分比；wakeups: 每秒唤醒次数
+ThreadUsage = namedtuple("ThreadUsage", "name cpu_percent wakeups")
+
+
+class ThreadCpu:
+    """由线程自己更新、其他线程只读的CPU时间和唤醒次数"""
+
+    def __init__(self, name):
+        self.name = name
+        self.cpu = 0  # 最近一次sample时的线程CPU时间（纳秒）
+        self.wakeups = 0
+
+    def sample(self):
+        """在线程休眠前调用"""
+        self.cpu = time.thread_time_ns()
+        self.wakeups += 1
+
+
+class CpuMonitor:
+    """汇总各线程的ThreadCpu"""
+
+    def __init__(self, clock=clock_ns):
+        self.clock = clock
+        self.threads = {}  # 名称 -> ThreadCpu
+        self._lock = threading.Lock()
+        self._last = {}  # 名称 -> (cpu, wakeups)，上一次usage()时的读数
+        self._last_time = clock()
+
+    def thread(self, name):
+        """获取（不存在时创建）名为name的线程计数器"""
+        counter = self.threads.get(name)
+        if counter is None:
+            with self._lock:
+                counter = self.threads.setdefault(name, ThreadCpu(name))
+        return counter
+
+    def usage(self):
+        """返回自上次调用以来各线程的ThreadUsage列表"""
+        now = self.clock()
+        elapsed = max(1, now - self._last_time)
+        self._last_time = now
+        result = []
+        for name, counter in list(self.threads.items()):
+            cpu, wakeups = counter.cpu, counter.wakeups
+            last_cpu, last_wakeups = self._last.get(name, (cpu, wakeups))
+            self._last[name] = (cpu, wakeups)
+            result.append(ThreadUsage(name, round((cpu - last_cpu) * 100 / elapsed, 1),
+                                      round((wakeups - last_wakeups) * NS / elapsed)))
+        return result
+
+
+def format_usage(usage):
+    """格式化为一行文本，例如 "调度 0.2% 25/s | 左键 0.5% 12/s" """
+    return " | ".join(f"{u.name} {u.cpu_percent:.1f}% {u.wakeups}/s" for u in usage)
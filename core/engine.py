@@ -0,0 +1,249 @@
+"""无界面的点击引擎，命令行版和两个图形界面共用"""
+
+import random
+from array import array
+
+from .backends import PynputBackend
+from .control import RateController
+from .events import INJECTED, PRESSED, InputQueue
+from .scheduler import ClickScheduler
+from .timing import clock_ns, to_ns
+
+
+class ChannelConfig:
+    """单个点击通道的参数
+
+    每个通道有自己的随机数生成器rng（指定seed时结果可复现），点击间隔按批预先抽取到固定数组中：
+    每次点击只取下一个值，一批用完或参数变化时才重新抽取。
+    rate_control为True时由RateController（见core.control）把长期CPS保持在min_cps和max_cps的中点。
+    """
+
+    BATCH = 256  # 每批预先抽取的间隔数
+
+    def __init__(self, button, min_cps=10, max_cps=12, cps_jitter=0.0, cursor_jitter=0.0, enabled=True,
+                 seed=None, rate_control=False):
+        self.button = button  # 输出的鼠标按键名（left、right、middle等）
+        self.min_cps = min_cps
+        self.max_cps = max_cps
+        self.cps_jitter = cps_jitter  # 在抽取的CPS上再叠加±cps_jitter的随机抖动
+        self.cursor_jitter = cursor_jitter  # 点击后光标随机偏移±cursor_jitter像素再复位
+        self.enabled = enabled
+        self.rate_control = rate_control
+        self.controller = None
+        self.update_controller()
+        self.rng = random.Random(seed)
+        self._cps = array('d', bytes(8 * self.BATCH))
+        self._intervals = array('d', bytes(8 * self.BATCH))
+        self._next = 0
+        self.cps = 0.0  # 最近一次draw_interval对应的CPS，尚未抽取时为0
+        self.refill()
+
+    def refill(self):
+        """在[min_cps, max_cps]内重新抽取一批CPS和对应的间隔"""
+        rand = self.rng.random
+        low, span, jitter = self.min_cps, self.max_cps - self.min_cps, self.cps_jitter
+        cps_batch, intervals = self._cps, self._intervals
+        for index in range(self.BATCH):
+            cps = low + span * rand()  # 等价于uniform(min_cps, max_cps)，省去方法调用
+            if jitter > 0:
+                cps += jitter * (2.0 * rand() - 1.0)
+            # 确保CPS不会为负或过小
+            if cps < 1.0:
+                cps = 1.0
+            cps_batch[index] = cps
+            intervals[index] = 1.0 / cps
+        self._next = 0
+
+    def update_controller(self):
+        """按rate_control和当前CPS范围创建或移除速率控制器"""
+        if self.rate_control:
+            self.controller = RateController((self.min_cps + self.max_cps) / 2)
+        else:
+            self.controller = None
+
+    def draw_interval(self):
+        """取出下一次点击的间隔（秒）；策略在点击输出之后调用，重新抽取不会推迟点击"""
+        index = self._next
+        if index >= self.BATCH:
+            self.refill()
+            index = 0
+        self._next = index + 1
+        self.cps = self._cps[index]
+        return self._intervals[index]
+
+
+class ClickEngine:
+    """点击引擎：管理通道参数、调度线程、鼠标监听和点击输出
+
+    何时激活通道、每次调度时是否点击由policy决定（见core.policies）。
+    引擎不依赖Qt，界面只通过configure/start/stop和回调与其交互。
+    点击通过backend输出（见core.backends），clock可替换为VirtualClock进行模拟。
+    isolate为True时每个通道在自己的输出线程中点击，输出路径上没有跨通道共享的锁，
+    代价是线程数随通道数增长（每个通道一个输出线程，见bench_channels）；通道很多时传入isolate=False，
+    所有通道在调度线程中输出，只有一个点击线程。
+    scheduler默认为ClickScheduler，也可以传入AsyncScheduler（见core.async_scheduler）在事件循环中调度。
+    监听线程只把鼠标事件放入input_events，由调度线程中的输入通道交给policy处理。
+    trace为ClickTrace（见core.trace）时记录每次点击的计划时间、实际时间和输出耗时。
+    cpu汇总调度、输出和监听线程各自记录的CPU时间（见core.cpu），界面线程也可以注册进来。
+    """
+
+    INPUT_CHANNEL = "_input"  # 处理鼠标事件的调度器通道
+
+    def __init__(self, policy, backend=None, clock=clock_ns, isolate=True, scheduler=None, trace=None):
+        self.policy = policy
+        self.backend = backend  # 输出后端，未指定时在第一次激活通道时创建PynputBackend
+        self.clock = clock
+        self.isolate = isolate
+        self.trace = trace
+        self.configs = {}
+        self.scheduler = scheduler if scheduler is not None else ClickScheduler(clock)
+        self.cpu = self.scheduler.cpu
+        self.emitting = {}  # 按键名 -> 是否正在输出模拟点击，监听回调据此标记模拟事件
+        self.click_callbacks = []  # callback(name, now)，每次输出点击后调用
+        self.state_callbacks = []  # callback(name, active)，通过set_active切换通道时调用
+        self.input_events = InputQueue()
+        self.scheduler.add_channel(self.INPUT_CHANNEL, self._drain_input)
+        self._listener = None
+        self._listener_cpu = None
+
+    def configure(self, name, **options):
+        """新建或更新通道参数，返回ChannelConfig"""
+        config = self.configs.get(name)
+        if config is None:
+            config = ChannelConfig(options.pop("button", name), **options)
+            self.configs[name] = config
+            self.scheduler.add_channel(name, lambda: self._step(name), self.isolate)
+            if self.trace is not None:
+                self.trace.add_channel(name)
+            self.policy.add_channel(self, name)
+            return config
+        seed = options.pop("seed", None)
+        changed = set()
+        for key, value in options.items():
+            if not hasattr(config, key):
+                raise TypeError(f"未知的通道参数: {key}")
+            if getattr(config, key) != value:
+                setattr(config, key, value)
+                changed.add(key)
+        if seed is not None:
+            config.rng.seed(seed)
+        # 只有CPS分布变化（或重新设置seed）时才在调用者的线程中重新抽取，
+        # 只改enabled、cursor_jitter时不重建输出线程正在读取的批次，也不重置速率控制器的相位
+        if seed is not None or changed & {"min_cps", "max_cps", "cps_jitter"}:
+            config.refill()
+        if changed & {"min_cps", "max_cps", "rate_control"}:
+            config.update_controller()
+        if not config.enabled:
+            self.set_active(name, False)
+        return config
+
+    def start(self, listen=True):
+        """启动调度线程，listen为True时同时启动鼠标监听"""
+        self.scheduler.start()
+        if listen and self._listener is None:
+            from pynput import mouse
+
+            self._listener_cpu = self.cpu.thread("监听")
+            self._listener = mouse.Listener(on_click=self._on_listener_click)
+            self._listener.daemon = True
+            self._listener.start()
+
+    def stop(self):
+        """停止所有通道、调度线程和鼠标监听"""
+        for name in self.configs:
+            self.set_active(name, False)
+        self.scheduler.stop()
+        if self._listener is not None:
+            self._listener.stop()
+            self.input_events = InputQueue()
+        self.scheduler.add_channel(self.INPUT_CHANNEL, self._drain_input)
+        self._listener = None
+
+    def close(self):
+        """停止并释放引擎占用的资源，之后不再使用"""
+        self.stop()
+
+    def run_for(self, seconds):
+        """不启动线程，在当前线程中模拟运行seconds秒（clock需为VirtualClock）"""
+        self.scheduler.run_until(self.clock() + to_ns(seconds))
+
+    def set_active(self, name, active):
+        """激活或停用通道"""
+        if active and not self.configs[name].enabled:
+            return
+        if active and self.backend is None:
+            # 第一次激活通道时才加载pynput的输出后端
+            self.backend = PynputBackend()
+        changed = self.scheduler.is_active(name) != active
+        controller = self.configs[name].controller
+        if changed and active and controller is not None:
+            controller.reset()
+        self.scheduler.set_active(name, active)
+        if changed:
+            for callback in self.state_callbacks:
+                callback(name, active)
+
+    def toggle(self, name):
+        """切换通道状态，返回切换后的状态"""
+        active = not self.scheduler.is_active(name)
+        self.set_active(name, active)
+        return self.scheduler.is_active(name)
+
+    def is_active(self, name):
+        return self.scheduler.is_active(name)
+
+    def _on_listener_click(self, x, y, button, pressed):
+        """监听回调：只记录事件，不做任何处理"""
+        name = button.name
+        flags = PRESSED if pressed else 0
+        if self.emitting.get(name):
+            flags |= INJECTED
+        if self.input_events.push(name, flags, self.clock()):
+            self.scheduler.set_active(self.INPUT_CHANNEL, True)
+        if self._listener_cpu is not None:
+            self._listener_cpu.sample()
+
+    def _step(self, name):
+        """通道的step：由policy决定是否点击和下一个间隔，开启速率控制时再修正间隔"""
+        interval = self.policy.step(self, name)
+        controller = self.configs[name].controller
+        if controller is not None:
+            if interval is None:
+                controller.reset()
+            else:
+                interval = controller.correct(interval)
+        return interval
+
+    def _drain_input(self):
+        """输入通道的step：在调度线程中处理队列中的所有鼠标事件"""
+        policy = self.policy
+        for button, flags, now in self.input_events.drain():
+            policy.on_mouse_click(self, button, bool(flags & PRESSED), now, bool(flags & INJECTED))
+        return None
+
+    def on_mouse_click(self, button, pressed, now=None):
+        """在当前线程中直接处理一次鼠标按键事件，button为按键名（left、right、x1、x2等）"""
+        if now is None:
+            now = self.clock()
+        self.policy.on_mouse_click(self, button, pressed, now, bool(self.emitting.get(button)))
+
+    def click(self, name):
+        """输出一次点击，返回点击完成的时间（纳秒）"""
+        config = self.configs[name]
+        trace = self.trace
+        if trace is not None:
+            start = self.clock()
+        # 设置本按键的模拟点击标志，防止被监听器当作用户点击；其他通道不受影响
+        self.emitting[config.button] = True
+        self.backend.click(config.button, config.cursor_jitter)
+        self.emitting[config.button] = False
+        now = self.clock()
+        if trace is not None:
+            # step在截止时间到达时执行，此时计时器中仍是本次的截止时间
+            deadline = self.scheduler.channels[name].timer.deadline
+            trace.record(name, start if deadline is None else deadline, start, now - start)
+        if config.controller is not None:
+            config.controller.clicked(now)
+        for callback in self.click_callbacks:
+            callback(name, now)
+        return now
@@ -0,0 +1,52 @@
+"""监听线程到调度线程的鼠标事件队列
+
+pynput的监听回调运行在系统输入钩子中，回调越慢，用户真实的鼠标输入延迟越大；
+回调只把(按键, 标志, 时间戳)写入InputQueue，所有处理都在调度线程中完成。
+"""
+
+from array import array
+
+PRESSED = 1  # 按下（否则为松开）
+INJECTED = 2  # 引擎自己输出的模拟点击
+
+
+class InputQueue:
+    """单生产者单消费者的有界环形队列，不加锁
+
+    只有生产者修改head、只有消费者修改tail，各字段预先分配，push不分配内存。
+    队列已满时丢弃新事件并计入dropped。
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.buttons = [None] * capacity
+        self.flags = array('B', bytes(capacity))
+        self.times = array('q', bytes(8 * capacity))
+        self.head = 0  # 已写入的事件总数
+        self.tail = 0  # 已取出的事件总数
+        self.dropped = 0
+
+    def push(self, button, flags, timestamp):
+        """写入一个事件（生产者），返回写入前队列是否已被取空，此时需要唤醒消费者"""
+        head = self.head
+        if head - self.tail >= self.capacity:
+            self.dropped += 1
+            return False
+        index = head % self.capacity
+        self.buttons[index] = button
+        self.flags[index] = flags
+        self.times[index] = timestamp
+        self.head = head + 1
+        # 先发布head再读tail：消费者取空后会重新检查head，不会漏掉这个事件
+        return self.tail == head
+
+    def drain(self):
+        """依次取出所有事件（消费者），生成(按键, 标志, 时间戳)"""
+        while self.tail != self.head:
+            index = self.tail % self.capacity
+            event = self.buttons[index], self.flags[index], self.times[index]
+            self.tail += 1
+            yield event
+
+    def __len__(self):
+        return self.head - self.tail
@@ -0,0 +1,144 @@
+"""Linux上按绝对截止时间等待（通过ctypes调用libc）
+
+clock_ns（perf_counter_ns）在Linux上就是CLOCK_MONOTONIC，调度器中的截止时间可以直接交给内核：
+sleep_until用clock_nanosleep(TIMER_ABSTIME)休眠到绝对时间，TimerfdWaiter用timerfd + eventfd + epoll
+代替Condition.wait，既按绝对时间唤醒又可以被notify()随时唤醒。
+内核默认给每个线程50微秒的定时器松弛量（timer slack），set_timer_slack可以用prctl减小它。
+其他平台上available()返回False，不要使用本模块的其他函数。
+"""
+
+import ctypes
+import errno
+import os
+import select
+import sys
+import time
+
+from .timing import NS
+
+CLOCK_MONOTONIC = 1
+TIMER_ABSTIME = 1
+TFD_TIMER_ABSTIME = 1
+TFD_NONBLOCK = os.O_NONBLOCK
+TFD_CLOEXEC = os.O_CLOEXEC
+PR_SET_TIMERSLACK = 29
+PR_GET_TIMERSLACK = 30
+
+
+class timespec(ctypes.Structure):
+    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+
+class itimerspec(ctypes.Structure):
+    _fields_ = [("it_interval", timespec), ("it_value", timespec)]
+
+
+_libc = None
+
+
+def _load():
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.clock_nanosleep.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.POINTER(timespec),
+                                         ctypes.POINTER(timespec)]
+        libc.timerfd_create.argtypes = [ctypes.c_int, ctypes.c_int]
+        libc.timerfd_settime.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.POINTER(itimerspec),
+                                         ctypes.POINTER(itimerspec)]
+        libc.prctl.argtypes = [ctypes.c_int, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong]
+        _libc = libc
+    return _libc
+
+
+def available():
+    """是否为Linux且clock_ns使用CLOCK_MONOTONIC"""
+    if not sys.platform.startswith("linux"):
+        return False
+    if time.get_clock_info("perf_counter").implementation != "clock_gettime(CLOCK_MONOTONIC)":
+        return False
+    try:
+        _load()
+    except (OSError, AttributeError):
+        return False
+    return True
+
+
+def _timespec(timestamp):
+    return timespec(*divmod(timestamp, NS))
+
+
+def sleep_until(deadline):
+    """休眠到CLOCK_MONOTONIC上的绝对时间deadline（纳秒），被信号中断时继续休眠"""
+    libc = _load()
+    request = _timespec(deadline)
+    while True:
+        error = libc.clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, ctypes.byref(request), None)
+        if error != errno.EINTR:
+            break
+    if error:
+        raise OSError(error, os.strerror(error))
+
+
+def set_timer_slack(slack):
+    """设置当前线程的定时器松弛量（纳秒），成功返回True"""
+    return _load().prctl(PR_SET_TIMERSLACK, slack, 0, 0, 0) == 0
+
+
+def get_timer_slack():
+    """当前线程的定时器松弛量（纳秒）"""
+    return _load().prctl(PR_GET_TIMERSLACK, 0, 0, 0, 0)
+
+
+class TimerfdWaiter:
+    """按绝对截止时间等待、可被其他线程唤醒，用于ClickScheduler(waiter=...)
+
+    timer_slack不为None时，第一次wait时把等待线程的定时器松弛量设为timer_slack纳秒，
+    slack_applied记录是否成功。
+    """
+
+    def __init__(self, timer_slack=None):
+        libc = _load()
+        self._timer = libc.timerfd_create(CLOCK_MONOTONIC, TFD_NONBLOCK | TFD_CLOEXEC)
+        if self._timer < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._event = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+        self._epoll = select.epoll()
+        self._epoll.register(self._timer, select.EPOLLIN)
+        self._epoll.register(self._event, select.EPOLLIN)
+        self.timer_slack = timer_slack
+        self.slack_applied = None  # 尚未在等待线程中设置
+
+    def _arm(self, deadline):
+        """deadline为None时停止计时器"""
+        value = itimerspec()
+        if deadline is not None:
+            value.it_value = _timespec(max(1, deadline))  # 全0表示停止
+        if _libc.timerfd_settime(self._timer, TFD_TIMER_ABSTIME, ctypes.byref(value), None) < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+    def wait(self, lock, deadline=None):
+        """持有lock时调用：释放lock，等待到deadline（纳秒，None为一直等待）或notify()，再重新获取lock"""
+        if self.slack_applied is None and self.timer_slack is not None:
+            self.slack_applied = set_timer_slack(self.timer_slack)
+        self._arm(deadline)
+        lock.release()
+        try:
+            events = self._epoll.poll()
+        finally:
+            lock.acquire()
+        for fd, _ in events:
+            try:
+                os.read(fd, 8)  # 清除到期次数或唤醒计数
+            except BlockingIOError:
+                pass
+
+    def notify(self):
+        """唤醒正在（或即将）等待的线程"""
+        os.eventfd_write(self._event, 1)
+
+    def close(self):
+        self._epoll.close()
+        os.close(self._timer)
+        os.close(self._event)
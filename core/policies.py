@@ -0,0 +1,230 @@
+"""点击策略：决定何时激活通道以及每次调度时如何点击
+
+每个策略实现 add_channel / on_mouse_click / step 三个方法，由ClickEngine调用：
+on_mouse_click和step都在调度线程中执行（监听线程只把事件放入队列），
+injected表示该事件是引擎自己输出的模拟点击；step返回到下一次调用的间隔（None表示空闲）。
+"""
+
+from .timing import NS
+from .window import ClickWindow, RateEstimator, real_cps
+
+
+class TogglePolicy:
+    """命令行版：侧键直接切换通道（侧键5/x1控制左键，侧键4/x2控制右键）"""
+
+    def __init__(self, bindings=None):
+        self.bindings = bindings or {"x1": "left", "x2": "right"}
+        self.current_cps = {}  # 各通道最近一次点击使用的CPS
+
+    def add_channel(self, engine, name):
+        self.current_cps[name] = 0.0
+
+    def on_mouse_click(self, engine, button, pressed, now, injected=False):
+        name = self.bindings.get(button)
+        if pressed and name is not None:
+            engine.toggle(name)
+
+    def step(self, engine, name):
+        config = engine.configs[name]
+        engine.click(name)
+        interval = config.draw_interval()
+        self.current_cps[name] = config.cps
+        return interval
+
+
+class ModePolicy:
+    """模式版：普通模式、模式一（连续点击3次后自动点击）、模式二（侧键三击后全自动）"""
+
+    SIDE_BUTTONS = {"x1": "left", "x2": "right"}
+
+    def __init__(self, on_check=None):
+        self.enabled = True  # 是否响应鼠标侧键
+        self.on_check = on_check  # callback(name, checked)，模式切换时同步界面按钮
+
+        # 模式状态
+        self.mode = "normal"  # normal, mode1, mode2
+        self.mode1_continuous = False  # 模式一中的连续点击状态
+        self.clicking_active = {}
+        self.button_held = {}
+
+        # 点击计数
+        self.click_count = {}
+        self.last_click_time = {}
+        self.side_button_count = 0
+        self.last_side_button_time = 0
+        self.last_side_button = None
+
+    def add_channel(self, engine, name):
+        self.clicking_active[name] = False
+        self.button_held[name] = False
+        self.click_count[name] = 0
+        self.last_click_time[name] = 0
+
+    def should_click(self, name):
+        """当前模式下通道是否应该自动点击"""
+        return self.clicking_active[name] and (
+            self.mode == "mode2" or  # 模式二直接点击
+            (self.mode == "mode1" and self.mode1_continuous)  # 模式一需要连续点击状态
+        )
+
+    def sync(self, engine):
+        """根据当前模式同步引擎中的通道状态"""
+        for name in self.clicking_active:
+            engine.set_active(name, self.should_click(name))
+
+    def toggle_clicking(self, engine, name):
+        """手动切换通道的自动点击开关，返回切换后的状态"""
+        self.clicking_active[name] = not self.clicking_active[name]
+        self.sync(engine)
+        return self.clicking_active[name]
+
+    def _set_mode(self, mode, clicking, button, checked):
+        self.mode = mode
+        for name in self.clicking_active:
+            self.clicking_active[name] = clicking
+        self.mode1_continuous = False
+        if self.on_check is not None:
+            self.on_check(self.SIDE_BUTTONS[button], checked)
+
+    def on_mouse_click(self, engine, button, pressed, now, injected=False):
+        if not self.enabled:
+            return
+
+        # 处理侧键点击
+        if button in self.SIDE_BUTTONS:
+            if pressed:
+                if now - self.last_side_button_time < 0.3 * NS and self.last_side_button == button:
+                    self.side_button_count += 1
+                else:
+                    self.side_button_count = 1
+                self.last_side_button_time = now
+                self.last_side_button = button
+            else:
+                # 松开侧键时处理模式切换
+                if self.side_button_count == 1:  # 单次点击
+                    if self.mode == "normal":  # 从普通模式进入模式一
+                        self._set_mode("mode1", False, button, True)
+                    elif self.mode == "mode1":  # 从模式一返回普通模式
+                        self._set_mode("normal", False, button, False)
+                elif self.side_button_count >= 3:  # 三次点击
+                    if self.mode == "normal":  # 从普通模式进入模式二
+                        self._set_mode("mode2", True, button, True)
+                    elif self.mode == "mode2":  # 从模式二返回普通模式
+                        self._set_mode("normal", False, button, False)
+
+        # 处理左右键点击
+        elif button in self.clicking_active:
+            if pressed:
+                self.button_held[button] = True
+                if self.mode == "mode1":  # 只在模式一下处理连续点击
+                    self.click_count[button] += 1
+                    if now - self.last_click_time[button] < 0.3 * NS:  # 300ms内连续点击
+                        if self.click_count[button] >= 3:  # 连续点击3次进入自动模式
+                            self.mode1_continuous = True
+                            self.clicking_active[button] = True
+                    else:
+                        self.click_count[button] = 1
+                    self.last_click_time[button] = now
+            else:
+                self.button_held[button] = False
+                if self.mode == "mode1" and self.mode1_continuous:
+                    # 在模式一的连续点击状态下，停止点击则退出连续模式
+                    self.mode1_continuous = False
+                    self.clicking_active[button] = False
+
+        # 模式或开关变化后更新引擎
+        self.sync(engine)
+
+    def step(self, engine, name):
+        engine.click(name)
+        return engine.configs[name].draw_interval()
+
+
+class AssistPolicy:
+    """辅助版：用户点击频率超过阈值且仍在点击时，补充模拟点击使总CPS落在目标范围内"""
+
+    def __init__(self, threshold=3, idle_timeout=0.20):
+        self.enabled = True  # 辅助模式开关
+        self.threshold = threshold  # CPS阈值，超过此值启动辅助
+        self.idle_timeout = idle_timeout  # 用户停止点击多长时间后停止辅助（秒）
+
+        # 点击记录，所有CPS读取方共享
+        self.total_clicks = {}  # 用户+辅助，滑动窗口计数
+        self.user_rate = {}  # 仅用户，每次点击更新的流式估计，辅助决策每次读取都是O(1)
+        self.user_click_count = {}  # 仅用户，累计点击次数
+
+        # 辅助目标CPS，在设定范围内定期随机浮动
+        self.target_cps = {}
+        self.cps_change_time = {}
+        self.cps_change_interval = {}
+
+    def add_channel(self, engine, name):
+        self.total_clicks[name] = ClickWindow()
+        self.user_rate[name] = RateEstimator()
+        self.user_click_count[name] = 0
+        self.target_cps[name] = engine.configs[name].min_cps
+        self.cps_change_time[name] = engine.clock()
+        self.cps_change_interval[name] = engine.configs[name].rng.uniform(0.5, 2.0)
+
+    def set_enabled(self, engine, enabled):
+        """开关辅助模式，关闭时立即停止正在进行的辅助点击"""
+        self.enabled = enabled
+        if not enabled:
+            for name in self.total_clicks:
+                engine.set_active(name, False)
+
+    def user_cps(self, engine, name):
+        return self.user_rate[name].rate(engine.clock())
+
+    def total_cps(self, engine, name):
+        return real_cps(self.total_clicks[name], engine.clock())
+
+    def is_user_active(self, engine, name):
+        """用户是否仍在点击：最近idle_timeout秒内有点击，连续点击时适当放宽"""
+        return self.user_rate[name].is_active(engine.clock(), self.idle_timeout)
+
+    def on_mouse_click(self, engine, button, pressed, now, injected=False):
+        # 跳过释放事件和辅助点击本身
+        if not pressed or injected or button not in self.user_rate:
+            return
+
+        self.total_clicks[button].append(now)
+        self.user_rate[button].append(now)  # 单独记录用户点击
+        self.user_click_count[button] += 1
+
+        # 唤醒空闲的辅助通道，由调度线程判断是否需要辅助
+        if self.enabled:
+            engine.set_active(button, True)
+
+    def step(self, engine, name):
+        config = engine.configs[name]
+        if not (self.enabled and config.enabled):
+            return None
+
+        current_time = engine.clock()
+
+        # 定期更新目标CPS，在设定范围内随机浮动
+        if current_time - self.cps_change_time[name] >= self.cps_change_interval[name] * NS:
+            self.target_cps[name] = config.rng.uniform(config.min_cps, config.max_cps)
+            self.cps_change_time[name] = current_time
+            self.cps_change_interval[name] = config.rng.uniform(0.5, 2.0)  # 下次变化间隔
+
+        # 当前用户CPS（不包含辅助点击）
+        user_rate = self.user_rate[name]
+        user_cps = user_rate.rate(current_time)
+
+        # 如果用户CPS超过阈值且用户仍在点击，提供辅助点击
+        if user_cps > self.threshold and user_rate.is_active(current_time, self.idle_timeout):
+            # 计算需要的辅助CPS，确保总CPS达到目标
+            assist_cps = self.target_cps[name] - user_cps
+
+            # 确保辅助CPS为正数且不超过合理范围
+            if 0 < assist_cps <= 40:
+                engine.click(name)
+                # 记录辅助点击到总点击记录（但不记录到用户点击记录）
+                self.total_clicks[name].append(current_time)
+                # 辅助点击间隔，调度器从本次截止时间推进
+                return 1.0 / assist_cps
+
+        # 用户CPS只会因新的点击而升高，空闲等待下一次用户点击唤醒
+        return None
@@ -0,0 +1,101 @@
+"""点击线程的CPU亲和性和调度优先级（可选）
+
+系统繁忙（游戏、浏览器、录屏）时点击线程可能被抢占，计时明显变差。ThreadPriority由每个点击线程在启动时
+自己调用apply()：绑定到指定的CPU核心，并按顺序尝试实时调度（SCHED_FIFO/SCHED_RR）、降低nice值，
+Windows上提高线程优先级。没有权限或平台不支持时跳过，不影响点击；每项设置是否生效记录在results中。
+"""
+
+import os
+import sys
+import threading
+from collections import namedtuple
+
+# setting: 设置项；applied: 是否生效；detail: 生效的值或失败原因
+PriorityResult = namedtuple("PriorityResult", "setting applied detail")
+
+REALTIME_POLICIES = {"fifo": "SCHED_FIFO", "rr": "SCHED_RR"}
+
+THREAD_PRIORITY_HIGHEST = 2  # Windows SetThreadPriority
+
+
+class ThreadPriority:
+    """点击线程的亲和性和优先级设置
+
+    cpus: 允许运行的CPU编号，None表示不限制；realtime: "fifo"、"rr"或None；
+    realtime_priority: 实时优先级（1-99）；nice: 实时调度不可用时使用的nice值（负数表示提高优先级），None表示不调整。
+    """
+
+    def __init__(self, cpus=None, realtime=None, realtime_priority=10, nice=None):
+        if realtime is not None and realtime not in REALTIME_POLICIES:
+            raise ValueError(f"未知的实时调度策略: {realtime}（可选: {', '.join(REALTIME_POLICIES)}）")
+        self.cpus = None if cpus is None else set(cpus)
+        self.realtime = realtime
+        self.realtime_priority = realtime_priority
+        self.nice = nice
+        self.results = {}  # 线程名 -> [PriorityResult]
+        self._lock = threading.Lock()
+
+    def apply(self, name):
+        """在要调整的线程中调用，返回并记录各项设置的结果"""
+        results = []
+        if self.cpus is not None:
+            results.append(self._affinity())
+        boosted = False
+        if self.realtime is not None:
+            result = self._realtime()
+            results.append(result)
+            boosted = result.applied
+        if not boosted and self.nice is not None:
+            results.append(self._nice())
+        with self._lock:
+            self.results[name] = results
+        return results
+
+    def _affinity(self):
+        if not hasattr(os, "sched_setaffinity"):
+            return PriorityResult("affinity", False, "平台不支持")
+        try:
+            os.sched_setaffinity(0, self.cpus)  # 0表示当前线程
+        except (OSError, ValueError) as e:
+            return PriorityResult("affinity", False, str(e))
+        return PriorityResult("affinity", True, ",".join(str(cpu) for cpu in sorted(os.sched_getaffinity(0))))
+
+    def _realtime(self):
+        name = REALTIME_POLICIES[self.realtime]
+        if not hasattr(os, name):
+            return PriorityResult(name, False, "平台不支持")
+        policy = getattr(os, name)
+        try:
+            os.sched_setscheduler(0, policy, os.sched_param(self.realtime_priority))
+        except (OSError, ValueError) as e:
+            return PriorityResult(name, False, str(e))
+        return PriorityResult(name, os.sched_getscheduler(0) == policy, str(self.realtime_priority))
+
+    def _nice(self):
+        if sys.platform == "win32":
+            return self._windows_priority()
+        try:
+            # Linux上nice是线程属性，用线程ID只调整当前线程
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self.nice)
+            current = os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+        except (OSError, AttributeError) as e:
+            return PriorityResult("nice", False, str(e))
+        return PriorityResult("nice", current == self.nice, str(current))
+
+    def _windows_priority(self):
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        thread = kernel32.GetCurrentThread()
+        if not kernel32.SetThreadPriority(thread, THREAD_PRIORITY_HIGHEST):
+            return PriorityResult("priority", False, f"错误码 {kernel32.GetLastError()}")
+        return PriorityResult("priority", True, str(kernel32.GetThreadPriority(thread)))
+
+
+def format_results(results):
+    """格式化为一行文本，例如 "调度 affinity=0 SCHED_FIFO=10 | 输出-left SCHED_FIFO失败(...) nice=-5" """
+    parts = []
+    for name, items in results.items():
+        text = " ".join(f"{r.setting}={r.detail}" if r.applied else f"{r.setting}失败({r.detail})" for r in items)
+        parts.append(f"{name} {text or '未设置'}")
+    return " | ".join(parts)
@@ -0,0 +1,364 @@
+"""在独立子进程中调度和输出点击
+
+界面进程中的点击线程和Qt事件循环、pynput监听、统计线程共用GIL，界面卡顿或垃圾回收都会变成点击抖动。
+ProcessEngine把调度线程和输出线程放到子进程（python -m core.process_engine），两个进程只通过一块共享内存通信：
+界面进程写入各通道的参数和开关，子进程写回点击次数、最近一次点击时间和"正在输出"标志。
+参数或开关变化后界面进程向子进程的stdin写一个字节唤醒它；stdin关闭（包括界面进程意外退出）时子进程退出。
+
+策略、鼠标监听和统计仍在界面进程中运行，子进程中每个通道的step固定为"点击后抽取下一个间隔"，
+因此只支持TogglePolicy和ModePolicy；AssistPolicy每次step都要读取用户点击记录，不能放到子进程。
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from multiprocessing import shared_memory
+
+from .backends import NullBackend, PynputBackend, RecordingBackend
+from .engine import ClickEngine
+from .policies import AssistPolicy
+from .scheduler import ClickScheduler
+
+MAX_CHANNELS = 8
+NAME_SIZE = 16  # 按键名的最大字节数（UTF-8）
+
+# 共享内存布局，所有字段8字节对齐：
+# 头部: [0] 通道数
+# 每个通道SLOT_SIZE字节: 按键名(16字节) + 下列8字节字段
+HEADER_SIZE = 8
+FIELDS = (
+    "min_cps", "max_cps", "cps_jitter", "cursor_jitter",  # double，界面进程写
+    "enabled", "rate_control", "active",  # int64，界面进程写
+    "clicks", "last_click", "emitting",  # int64，子进程写
+    "cps",  # double，子进程写，最近一次抽取的CPS
+)
+DOUBLE_FIELDS = {"min_cps", "max_cps", "cps_jitter", "cursor_jitter", "cps"}
+SLOT_SIZE = NAME_SIZE + 8 * len(FIELDS)
+BLOCK_SIZE = HEADER_SIZE + MAX_CHANNELS * SLOT_SIZE
+
+BACKENDS = {
+    "pynput": PynputBackend,
+    "null": NullBackend,
+    "recording": RecordingBackend,
+}
+
+
+class SharedChannels:
+    """共享内存中的通道表，界面进程和子进程各自打开一个"""
+
+    def __init__(self, buf):
+        self._buf = buf
+        self._q = buf.cast('q')
+        self._d = buf.cast('d')
+
+    def release(self):
+        self._q.release()
+        self._d.release()
+
+    def _index(self, slot, field):
+        return (HEADER_SIZE + slot * SLOT_SIZE + NAME_SIZE) // 8 + FIELDS.index(field)
+
+    @property
+    def count(self):
+        return self._q[0]
+
+    def add(self, button):
+        """登记新通道，返回槽位"""
+        slot = self._q[0]
+        if slot >= MAX_CHANNELS:
+            raise ValueError(f"子进程最多支持{MAX_CHANNELS}个通道")
+        name = button.encode("utf-8")
+        if len(name) > NAME_SIZE:
+            raise ValueError(f"按键名过长: {button}")
+        start = HEADER_SIZE + slot * SLOT_SIZE
+        self._buf[start:start + NAME_SIZE] = name.ljust(NAME_SIZE, b"\0")
+        self._q[0] = slot + 1
+        return slot
+
+    def button(self, slot):
+        start = HEADER_SIZE + slot * SLOT_SIZE
+        return bytes(self._buf[start:start + NAME_SIZE]).rstrip(b"\0").decode("utf-8")
+
+    def get(self, slot, field):
+        index = self._index(slot, field)
+        return self._d[index] if field in DOUBLE_FIELDS else self._q[index]
+
+    def set(self, slot, field, value):
+        index = self._index(slot, field)
+        if field in DOUBLE_FIELDS:
+            self._d[index] = value
+        else:
+            self._q[index] = int(value)
+
+    def counter(self, slot):
+        """子进程每次点击写入的字段的下标：(clicks, last_click, emitting, cps)，cps在double视图中"""
+        clicks = self._index(slot, "clicks")
+        return clicks, clicks + 1, clicks + 2, clicks + 3
+
+
+class SharedFlags:
+    """按键名 -> 是否正在输出模拟点击，读写共享内存中的emitting字段，代替ClickEngine.emitting字典"""
+
+    def __init__(self, channels):
+        self._channels = channels
+        self._slots = {}  # 按键名 -> emitting字段的下标
+
+    def add(self, button, slot):
+        self._slots[button] = self._channels.counter(slot)[2]
+
+    def get(self, button, default=None):
+        index = self._slots.get(button)
+        if index is None:
+            return default
+        return bool(self._channels._q[index])
+
+    def __setitem__(self, button, value):
+        index = self._slots.get(button)
+        if index is not None:
+            self._channels._q[index] = 1 if value else 0
+
+
+class ProcessEngine(ClickEngine):
+    """调度和输出在子进程中运行的ClickEngine，界面进程中的用法不变
+
+    backend为子进程使用的输出后端名（见BACKENDS）；trace_path不为None时子进程记录每次点击，退出时保存为CSV。
+    click_callbacks不会被调用，点击次数和最近一次点击时间用clicks()/last_click()读取。
+    cpu只包含界面进程自己的调度和监听线程，子进程中点击线程的CPU占用不在其中。
+    timerfd为True时子进程的调度线程用linux_timing.TimerfdWaiter等待；priority为ThreadPriority（见core.priority）时
+    把它的设置传给子进程，由子进程中的点击线程各自应用，结果由子进程打印。
+    """
+
+    def __init__(self, policy, backend="pynput", trace_path=None, timerfd=False, priority=None, **kwargs):
+        if isinstance(policy, AssistPolicy):
+            raise TypeError("AssistPolicy需要在点击线程中读取用户点击记录，不能在子进程中运行")
+        if backend not in BACKENDS:
+            raise ValueError(f"未知的输出后端: {backend}（可选: {', '.join(BACKENDS)}）")
+        if getattr(sys, "frozen", False):
+            raise RuntimeError("打包后的程序不能用python -m启动子进程")
+        # 界面进程自己不输出点击，本地调度器只处理鼠标事件，点击通道不创建输出线程
+        kwargs["isolate"] = False
+        super().__init__(policy, backend=NullBackend(), **kwargs)
+        self.remote_backend = backend
+        self.trace_path = None if trace_path is None else os.path.abspath(trace_path)
+        self.timerfd = timerfd
+        self.priority = priority
+        self._shm = shared_memory.SharedMemory(create=True, size=BLOCK_SIZE)
+        self._shm.buf[:BLOCK_SIZE] = bytes(BLOCK_SIZE)
+        self.shared = SharedChannels(self._shm.buf)
+        self.emitting = SharedFlags(self.shared)
+        self._slots = {}  # 通道名 -> 槽位
+        self._process = None
+
+    def configure(self, name, **options):
+        """新建或更新通道参数并同步到子进程"""
+        if name not in self.configs and name not in self._slots:
+            slot = self.shared.add(options.get("button", name))
+            self._slots[name] = slot
+            self.emitting.add(options.get("button", name), slot)
+        config = super().configure(name, **options)
+        slot = self._slots[name]
+        for field in ("min_cps", "max_cps", "cps_jitter", "cursor_jitter", "enabled", "rate_control"):
+            self.shared.set(slot, field, getattr(config, field))
+        self._ring()
+        return config
+
+    def start(self, listen=True):
+        """启动子进程、本地的输入调度线程和鼠标监听"""
+        if self._process is None:
+            command = [sys.executable, "-m", "core.process_engine", self._shm.name, self.remote_backend]
+            if self.trace_path is not None:
+                command.append(f"--trace={self.trace_path}")
+            if self.timerfd:
+                command.append("--timerfd")
+            priority = self.priority
+            if priority is not None:
+                if priority.cpus is not None:
+                    command.append("--cpus=" + ",".join(str(cpu) for cpu in sorted(priority.cpus)))
+                if priority.realtime is not None:
+                    command += [f"--realtime={priority.realtime}", f"--realtime-priority={priority.realtime_priority}"]
+                if priority.nice is not None:
+                    command.append(f"--nice={priority.nice}")
+            root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            self._process = subprocess.Popen(command, stdin=subprocess.PIPE, cwd=root)
+        super().start(listen)
+
+    def stop(self):
+        """停止所有通道和子进程，之后仍可以重新start"""
+        super().stop()
+        process = self._process
+        if process is not None:
+            self._process = None
+            process.stdin.close()
+            process.wait()
+
+    def close(self):
+        """停止并释放共享内存"""
+        self.stop()
+        self.shared.release()
+        self._shm.close()
+        self._shm.unlink()
+
+    def _ring(self):
+        """唤醒子进程重新读取共享内存"""
+        process = self._process
+        if process is not None:
+            try:
+                process.stdin.write(b"\0")
+                process.stdin.flush()
+            except (BrokenPipeError, ValueError):
+                pass
+
+    def set_active(self, name, active):
+        """激活或停用子进程中的通道"""
+        if active and not self.configs[name].enabled:
+            return
+        slot = self._slots[name]
+        # ModePolicy.sync每个鼠标事件都会调用，状态没变时不唤醒子进程
+        if bool(self.shared.get(slot, "active")) == active:
+            return
+        self.shared.set(slot, "active", active)
+        self._ring()
+        for callback in self.state_callbacks:
+            callback(name, active)
+
+    def toggle(self, name):
+        active = not self.is_active(name)
+        self.set_active(name, active)
+        return self.is_active(name)
+
+    def is_active(self, name):
+        return bool(self.shared.get(self._slots[name], "active"))
+
+    def clicks(self, name):
+        """子进程已输出的点击次数"""
+        return self.shared.get(self._slots[name], "clicks")
+
+    def last_click(self, name):
+        """子进程最近一次点击完成的时间（clock_ns，纳秒），没有点击时为0"""
+        return self.shared.get(self._slots[name], "last_click")
+
+    def cps(self, name):
+        """子进程最近一次抽取的CPS，尚未抽取时为0"""
+        return self.shared.get(self._slots[name], "cps")
+
+
+class _RemotePolicy:
+    """子进程中的策略：点击后按通道参数抽取下一个间隔，并把抽取的CPS写回共享内存"""
+
+    def __init__(self, shared):
+        self._d = shared._d
+        self.cps_index = {}  # 通道名 -> cps字段在double视图中的下标
+
+    def add_channel(self, engine, name):
+        pass
+
+    def on_mouse_click(self, engine, button, pressed, now, injected=False):
+        pass
+
+    def step(self, engine, name):
+        engine.click(name)
+        config = engine.configs[name]
+        interval = config.draw_interval()
+        self._d[self.cps_index[name]] = config.cps
+        return interval
+
+
+def _sync(engine, shared, counters):
+    """按共享内存更新子进程中的通道参数和开关，counters为 通道名 -> 点击次数和时间字段的下标"""
+    for slot in range(shared.count):
+        name = str(slot)
+        options = {field: shared.get(slot, field)
+                   for field in ("min_cps", "max_cps", "cps_jitter", "cursor_jitter")}
+        options["enabled"] = bool(shared.get(slot, "enabled"))
+        options["rate_control"] = bool(shared.get(slot, "rate_control"))
+        if name not in engine.configs:
+            button = shared.button(slot)
+            engine.configure(name, button=button, **options)
+            engine.emitting.add(button, slot)
+            clicks, last_click, _, cps = shared.counter(slot)
+            counters[name] = clicks, last_click
+            engine.policy.cps_index[name] = cps
+        else:
+            config = engine.configs[name]
+            if any(getattr(config, key) != value for key, value in options.items()):
+                engine.configure(name, **options)
+        engine.set_active(name, bool(shared.get(slot, "active")))
+
+
+def serve(shm_name, backend="pynput", trace_path=None, timerfd=False, priority=None):
+    """子进程主循环：每次stdin收到一个字节就同步一次，stdin关闭时退出"""
+    # 终端里的Ctrl+C同时发给子进程，由界面进程关闭stdin来结束子进程
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    if os.name == "posix":
+        # 共享内存由界面进程创建和释放，不能让子进程的resource_tracker在退出时删除它
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    shared = SharedChannels(shm.buf)
+    trace = None
+    if trace_path is not None:
+        from .trace import ClickTrace
+        trace = ClickTrace()
+    waiter = None
+    if timerfd:
+        from . import linux_timing
+        if linux_timing.available():
+            waiter = linux_timing.TimerfdWaiter(timer_slack=1000)
+        else:
+            print("子进程: --timerfd仅支持Linux，使用默认的等待方式")
+    engine = ClickEngine(_RemotePolicy(shared), backend=BACKENDS[backend](),
+                         scheduler=ClickScheduler(waiter=waiter, priority=priority), trace=trace)
+    engine.emitting = SharedFlags(shared)
+    counters = {}
+    q = shared._q
+
+    def record(name, now):
+        clicks, last_click = counters[name]
+        q[last_click] = now
+        q[clicks] += 1
+
+    engine.click_callbacks.append(record)
+    engine.start(listen=False)
+    stdin = sys.stdin.buffer
+    try:
+        _sync(engine, shared, counters)
+        if priority is not None:
+            from .priority import format_results
+            time.sleep(0.1)  # 等各点击线程启动并完成设置
+            print(f"子进程线程优先级: {format_results(priority.results)}", flush=True)
+        while stdin.read1(4096):
+            _sync(engine, shared, counters)
+    finally:
+        engine.stop()
+        if trace is not None:
+            trace.dump(trace_path)
+        del engine
+        shared.release()
+        shm.close()
+
+
+def main(argv):
+    """解析ProcessEngine.start传入的参数并运行serve"""
+    parser = argparse.ArgumentParser(description="ProcessEngine的子进程")
+    parser.add_argument("shm_name")
+    parser.add_argument("backend", choices=BACKENDS)
+    parser.add_argument("--trace", help="退出时保存点击记录的CSV路径")
+    parser.add_argument("--timerfd", action="store_true")
+    parser.add_argument("--cpus", help="点击线程允许运行的CPU编号，逗号分隔")
+    parser.add_argument("--realtime", help="fifo或rr")
+    parser.add_argument("--realtime-priority", type=int, default=10)
+    parser.add_argument("--nice", type=int)
+    args = parser.parse_args(argv)
+    priority = None
+    if args.cpus is not None or args.realtime is not None or args.nice is not None:
+        from .priority import ThreadPriority
+        priority = ThreadPriority(cpus=None if args.cpus is None else [int(cpu) for cpu in args.cpus.split(",")],
+                                  realtime=args.realtime, realtime_priority=args.realtime_priority, nice=args.nice)
+    serve(args.shm_name, args.backend, args.trace, args.timerfd, priority)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
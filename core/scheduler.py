@@ -0,0 +1,276 @@
+"""多通道点击调度器"""
+
+import heapq
+import itertools
+import threading
+import time
+
+from .cpu import CpuMonitor
+from .timing import NS, DeadlineTimer, clock_ns, to_ns
+
+
+class Channel:
+    """一个点击通道（左键、右键或其他按键）
+
+    step() 在截止时间到达时由调度线程调用：执行一次点击（或一次决策），
+    返回到下一次调用的间隔（秒）；返回None表示通道进入空闲，直到再次激活。
+    isolated为True时step在通道自己的输出线程中执行，慢速点击不会推迟其他通道。
+    """
+
+    def __init__(self, name, step, clock, isolated=False):
+        self.name = name
+        self.step = step
+        self.timer = DeadlineTimer(clock)
+        self.active = False
+        self.generation = 0  # 每次激活/停用递增，用于丢弃堆中的过期条目
+        self.rearm = False  # step执行期间收到了新的激活请求
+        self.isolated = isolated
+        self.dispatch = threading.Condition()  # 仅isolated通道使用，只在本通道内竞争
+        self.pending = None  # 等待输出线程执行的代数
+        self.emitter = None
+        # 自旋等待的CPU上限：额度按spin_share（一个CPU核心的比例）随时间累积，最多攒1秒的额度
+        self.spin_share = 0.05
+        self.spin_credit = None  # 可用的自旋时间（纳秒），None表示尚未开始累积
+        self.spin_checked = 0  # 上次累积额度的时间（纳秒）
+        self.spin_time = 0  # 累计自旋的纳秒数
+
+
+class ClickScheduler:
+    """用单个线程和最小堆驱动任意数量的点击通道
+
+    堆中保存各通道的下一次截止时间，线程只在最早的截止时间醒来；
+    没有激活的通道时在条件变量上阻塞，不产生任何唤醒。
+    isolated通道到期时只把step交给该通道的输出线程，调度线程自己不输出点击。
+    调度线程和各输出线程在休眠前把自己的CPU时间记录到cpu（见core.cpu）。
+    guard大于0时先在条件变量上休眠到截止时间前guard秒，剩下的时间不持锁反复让出CPU直到截止时间，
+    消除休眠唤醒的延迟和抖动；每个通道的自旋时间受Channel.spin_share限制，额度不足时直接休眠。
+    waiter不为None时（例如core.linux_timing.TimerfdWaiter）用waiter.wait(锁, 绝对截止时间)代替条件变量的超时等待，
+    此时clock必须是clock_ns。
+    priority为ThreadPriority（见core.priority）时调度线程和各输出线程启动后先调整自己的CPU亲和性和优先级。
+    """
+
+    def __init__(self, clock=clock_ns, guard=0.0, waiter=None, priority=None):
+        self.clock = clock
+        self.guard = to_ns(guard)  # 纳秒
+        self.waiter = waiter
+        self.priority = priority
+        self.channels = {}
+        self.wakeups = 0  # 调度线程被唤醒的次数
+        self.cpu = CpuMonitor()
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def add_channel(self, name, step, isolated=False):
+        """注册通道，初始为未激活"""
+        channel = Channel(name, step, self.clock, isolated)
+        with self._cond:
+            self.channels[name] = channel
+            if self._running:
+                self._start_emitter(channel)
+        return channel
+
+    def set_active(self, name, active):
+        """激活或停用通道，激活后立即执行第一次step"""
+        with self._cond:
+            channel = self.channels[name]
+            if channel.active == active:
+                # step可能正要返回None，记下请求以免丢失这次唤醒
+                channel.rearm = active
+                return
+            channel.active = active
+            channel.generation += 1
+            channel.timer.stop()
+            if active:
+                self._push(channel, channel.timer.advance(0.0))
+                self._notify()
+
+    def toggle(self, name):
+        """切换通道状态，返回切换后的状态"""
+        with self._cond:
+            active = not self.channels[name].active
+            self.set_active(name, active)
+        return active
+
+    def is_active(self, name):
+        return self.channels[name].active
+
+    def start(self):
+        """启动调度线程"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            for channel in self.channels.values():
+                self._start_emitter(channel)
+        self._thread = threading.Thread(target=self._run, name="ClickScheduler")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """停止调度线程和所有输出线程"""
+        with self._cond:
+            self._running = False
+            self._notify()
+        current = threading.current_thread()
+        if self._thread is not None and self._thread is not current:
+            self._thread.join()
+        self._thread = None
+        for channel in list(self.channels.values()):
+            if channel.emitter is None:
+                continue
+            with channel.dispatch:
+                channel.dispatch.notify()
+            if channel.emitter is not current:
+                channel.emitter.join()
+            channel.emitter = None
+
+    def _start_emitter(self, channel):
+        if channel.isolated and channel.emitter is None:
+            channel.emitter = threading.Thread(target=self._emit_loop, args=(channel,),
+                                               name=f"ClickEmitter-{channel.name}")
+            channel.emitter.daemon = True
+            channel.emitter.start()
+
+    def _emit_loop(self, channel):
+        """isolated通道的输出线程：等待调度线程派发，执行step"""
+        dispatch = channel.dispatch
+        cpu = self.cpu.thread(f"输出-{channel.name}")
+        if self.priority is not None:
+            self.priority.apply(cpu.name)
+        while True:
+            with dispatch:
+                while channel.pending is None and self._running:
+                    cpu.sample()
+                    dispatch.wait()
+                if not self._running:
+                    return
+                generation = channel.pending
+                channel.pending = None
+            self._finish(channel, generation, channel.step())
+
+    def _push(self, channel, deadline):
+        heapq.heappush(self._heap, (deadline, next(self._seq), channel.generation, channel))
+
+    def _next_due(self, cpu):
+        """阻塞直到有通道到期，返回(通道, 代数)；调度器停止时返回None"""
+        while self._running:
+            if not self._heap:
+                cpu.sample()
+                if self.waiter is None:
+                    self._cond.wait()
+                else:
+                    self.waiter.wait(self._cond)
+                self.wakeups += 1
+                continue
+            deadline, _, generation, channel = self._heap[0]
+            if generation != channel.generation:
+                # 通道已被停用或重新激活，丢弃旧条目
+                heapq.heappop(self._heap)
+                continue
+            now = self.clock()
+            delay = deadline - now
+            if delay > 0:
+                guard = self.guard
+                if guard and delay <= guard:
+                    if self._spin(channel, deadline, now):
+                        continue
+                    guard = 0  # 额度不足，本次直接休眠到截止时间
+                cpu.sample()
+                if self.waiter is None:
+                    self._cond.wait((delay - guard) / NS)
+                else:
+                    self.waiter.wait(self._cond, deadline - guard)
+                self.wakeups += 1
+                continue
+            heapq.heappop(self._heap)
+            channel.rearm = False
+            return channel, generation
+        return None
+
+    def _notify(self):
+        """唤醒等待中的调度线程，调用时持有锁"""
+        if self.waiter is None:
+            self._cond.notify()
+        else:
+            self.waiter.notify()
+
+    def _spin(self, channel, deadline, now):
+        """额度足够时释放锁自旋到deadline并返回True，否则返回False"""
+        share = channel.spin_share
+        if channel.spin_credit is None:
+            channel.spin_credit = NS * share
+        else:
+            channel.spin_credit = min(NS * share, channel.spin_credit + (now - channel.spin_checked) * share)
+        channel.spin_checked = now
+        if channel.spin_credit < deadline - now:
+            return False
+        clock = self.clock
+        self._cond.release()
+        try:
+            while clock() < deadline:
+                time.sleep(0)  # 让出CPU和GIL，其他线程不会被自旋拖慢
+        finally:
+            self._cond.acquire()
+        spent = clock() - now
+        channel.spin_credit -= spent
+        channel.spin_time += spent
+        return True
+
+    def _run(self):
+        """调度线程主循环"""
+        cpu = self.cpu.thread("调度")
+        if self.priority is not None:
+            self.priority.apply(cpu.name)
+        while True:
+            with self._cond:
+                due = self._next_due(cpu)
+            if due is None:
+                return
+            channel, generation = due
+            if channel.isolated:
+                # 交给通道自己的输出线程，调度线程立即处理下一个截止时间
+                with channel.dispatch:
+                    channel.pending = generation
+                    channel.dispatch.notify()
+                continue
+            # 在锁外执行点击，其他线程可以随时切换通道状态
+            self._finish(channel, generation, channel.step())
+
+    def _finish(self, channel, generation, interval):
+        """根据step的返回值安排通道的下一次截止时间"""
+        with self._cond:
+            if generation != channel.generation:
+                return
+            if interval is None and channel.rearm:
+                # step期间有新的激活请求，立即重新执行
+                interval = 0.0
+            if interval is None:
+                channel.active = False
+                channel.generation += 1
+                channel.timer.stop()
+            else:
+                self._push(channel, channel.timer.advance(interval))
+                if channel.isolated and self._heap[0][3] is channel:
+                    # 由输出线程调用，调度线程可能正在等待更晚的截止时间
+                    self._notify()
+
+    def run_until(self, end):
+        """不启动线程，在当前线程中按截止时间顺序执行所有到期的step，直到时钟到达end（纳秒）
+
+        时钟必须支持advance_to（见VirtualClock）：每次直接跳到下一个截止时间，不真实休眠。
+        """
+        while True:
+            with self._cond:
+                heap = self._heap
+                while heap and heap[0][2] != heap[0][3].generation:
+                    heapq.heappop(heap)
+                if not heap or heap[0][0] > end:
+                    break
+                deadline, _, generation, channel = heapq.heappop(heap)
+                channel.rearm = False
+            self.clock.advance_to(deadline)
+            self._finish(channel, generation, channel.step())
+        self.clock.advance_to(end)
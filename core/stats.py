@@ -0,0 +1,125 @@
+"""辅助模式的CPS统计快照
+
+StatsWorker在自己的线程中定时计算各通道的总CPS、用户CPS、辅助CPS和状态以及各线程的CPU占用，
+每个周期生成一个不可变的StatsSnapshot；界面只负责显示最新的快照，
+界面卡顿不会影响统计和点击线程，显示开销也不随点击数量变化。
+"""
+
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+from .timing import NS, clock_ns
+
+# 通道状态
+STATUS_DISABLED = "辅助模式已关闭"
+STATUS_ASSISTING = "辅助中"
+STATUS_USER_STOPPED = "用户停止点击"
+STATUS_IDLE = "待机"
+
+ChannelStats = namedtuple("ChannelStats", "name total_cps user_cps assist_cps status")
+# channels: 只读的 名称 -> ChannelStats；threads: 各线程的ThreadUsage（见core.cpu）
+StatsSnapshot = namedtuple("StatsSnapshot", "time channels threads")
+
+
+def channel_stats(engine, assist, name):
+    """计算单个通道的统计"""
+    user_cps = assist.user_cps(engine, name)
+    total_cps = assist.total_cps(engine, name)
+    if not assist.enabled:
+        status = STATUS_DISABLED
+    elif user_cps > assist.threshold:
+        status = STATUS_ASSISTING if assist.is_user_active(engine, name) else STATUS_USER_STOPPED
+    else:
+        status = STATUS_IDLE
+    return ChannelStats(name, total_cps, user_cps, max(0, total_cps - user_cps), status)
+
+
+def snapshot(engine, assist, threads=()):
+    """生成所有通道的统计快照"""
+    channels = {name: channel_stats(engine, assist, name) for name in engine.configs}
+    return StatsSnapshot(engine.clock(), MappingProxyType(channels), threads)
+
+
+class StatsWorker:
+    """统计线程：每interval秒生成一次快照，快照内容变化时调用callback()通知
+
+    通知是合并的：上一次通知的快照被take()取走之前不会再次通知，
+    界面线程卡住时不会堆积排队的信号，恢复后直接显示最新的快照。
+    interval为None时暂停，不产生任何唤醒（例如窗口最小化时）。
+    各线程的CPU占用每CPU_INTERVAL秒更新一次，统计窗口太短时百分比跳动太大。
+    """
+
+    CPU_INTERVAL = 1.0
+
+    def __init__(self, engine, assist, callback, interval=0.1):
+        self.engine = engine
+        self.assist = assist
+        self.callback = callback
+        self.interval = interval
+        self.latest = None  # 最近一次的快照
+        self.ticks = 0  # 生成快照的次数
+        self._pending = threading.Event()  # 已通知但尚未take
+        self._threads = ()  # 最近一次的各线程CPU占用
+        self._cpu_time = 0
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def set_interval(self, interval):
+        """修改刷新周期，None表示暂停"""
+        with self._cond:
+            if interval == self.interval:
+                return
+            self.interval = interval
+            self._cond.notify()
+
+    def take(self):
+        """取走最新的快照"""
+        self._pending.clear()
+        return self.latest
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="StatsWorker")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _wait(self, cpu):
+        """等待一个周期，返回是否继续运行"""
+        with self._cond:
+            if self._running:
+                cpu.sample()
+                self._cond.wait(self.interval)
+            while self._running and self.interval is None:
+                cpu.sample()
+                self._cond.wait()
+            return self._running
+
+    def _run(self):
+        cpu = self.engine.cpu.thread("统计")
+        while self._wait(cpu):
+            now = clock_ns()
+            if now - self._cpu_time >= self.CPU_INTERVAL * NS:
+                self._threads = tuple(self.engine.cpu.usage())
+                self._cpu_time = now
+            current = snapshot(self.engine, self.assist, self._threads)
+            self.ticks += 1
+            previous, self.latest = self.latest, current
+            # 数值和状态都没变时不通知，界面无需重绘
+            if (previous is not None and previous.channels == current.channels
+                    and previous.threads == current.threads):
+                continue
+            if not self._pending.is_set():
+                self._pending.set()
+                self.callback()
@@ -0,0 +1,324 @@
+"""通过命名共享内存发布运行状态，供外部程序读取（可选）
+
+StatusPublisher在自己的线程中定时把各通道的状态写入一块固定布局、带版本号的命名共享内存，
+悬浮窗、脚本和监控面板用StatusReader（或任何能映射共享内存的语言）按任意频率读取，
+不需要和点击器进程通信，读取方再多、读得再快也不会影响点击线程。
+
+写入用顺序锁（seqlock）保护：写入前把seq加1变成奇数，写完再加1变回偶数；
+读取方先读seq，为偶数时复制整块数据，再读一次seq，两次相同才说明读到的是完整的一次发布，否则重试。
+Python中写入有序依赖CPython逐条执行写内存的语句；用C等语言读取时seq的两次读取需要acquire语义。
+
+布局（小端，按8字节对齐）：
+头部 HEADER_SIZE 字节: magic(8s) version(I) header_size(I) slot_size(I) max_channels(I)
+    seq(q) pid(q) count(q) time(q，clock_ns，Linux上为CLOCK_MONOTONIC) wall_time(q，time.time_ns) publishes(q)
+之后 max_channels 个通道槽，每个 SLOT_SIZE 字节: 见SLOT_FIELDS
+布局变化时增加VERSION，读取方遇到不认识的版本直接报错。
+
+用法: python -m core.status [名称]    # 每秒打印一次正在运行的点击器状态
+"""
+
+import math
+import os
+import struct
+import sys
+import threading
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+from .bench import percentile
+from .timing import NS
+
+DEFAULT_NAME = "auto_click_status"
+MAGIC = b"ACSTATUS"
+VERSION = 1
+MAX_CHANNELS = 8
+NAME_SIZE = 16  # 通道名的最大字节数（UTF-8）
+
+HEADER = struct.Struct("<8sIIIIqqqqqq")
+SEQ_OFFSET = 24  # 头部中seq的偏移
+BODY_OFFSET = 40  # 头部中受seq保护的部分（count起）的偏移
+HEADER_SIZE = HEADER.size
+
+# 每个通道槽的字段，顺序即布局
+SLOT_FIELDS = (
+    "name",  # 16s，通道名
+    "active",  # q，是否正在自动点击
+    "clicks",  # q，累计输出的模拟点击次数
+    "user_clicks",  # q，累计的用户点击次数（仅辅助版统计，其他为0）
+    "last_click",  # q，最近一次模拟点击完成的时间（clock_ns），没有点击时为0
+    "target_cps",  # d，当前的目标CPS（辅助版为辅助目标，其他为最近一次抽取的CPS）
+    "total_cps",  # d，总CPS（辅助版为用户+辅助，其他为模拟点击）
+    "user_cps",  # d，用户CPS（仅辅助版）
+    "lateness_p50",  # d，最近LATENESS_SAMPLES次点击开始输出相对截止时间的延迟（微秒），没有记录时为NaN
+    "lateness_p99",  # d
+    "lateness_max",  # d
+)
+SLOT = struct.Struct("<16sqqqqdddddd")
+SLOT_SIZE = SLOT.size
+BLOCK_SIZE = HEADER_SIZE + MAX_CHANNELS * SLOT_SIZE
+
+LATENESS_SAMPLES = 128
+RATE_WINDOW = NS  # 计算总CPS的点击次数差分窗口（纳秒）
+
+ChannelStatus = namedtuple("ChannelStatus", SLOT_FIELDS)
+# time/wall_time: 发布时间；publishes: 累计发布次数；channels: ChannelStatus的元组
+Status = namedtuple("Status", "version pid time wall_time publishes channels")
+
+
+def _pid_alive(pid):
+    if os.name != "posix":
+        # Windows上共享内存在所有句柄关闭后自动删除，还能打开说明仍有进程在使用
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _reclaim(name):
+    """删除发布进程已经退出的同名状态共享内存，仍在使用时抛出FileExistsError"""
+    existing = shared_memory.SharedMemory(name=name)
+    header = HEADER.unpack_from(existing.buf, 0) if existing.size >= HEADER_SIZE else None
+    existing.close()
+    if header is None or header[0] != MAGIC:
+        error = f"共享内存{name}已存在且不是点击器的状态共享内存"
+    elif _pid_alive(header[6]):
+        error = f"进程{header[6]}正在向共享内存{name}发布状态，请换一个名称"
+    else:
+        existing.unlink()
+        return
+    if os.name == "posix":
+        # 不是本进程创建的，退出时不能让resource_tracker删除它
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(existing._name, "shared_memory")
+    raise FileExistsError(error)
+
+
+class _ChannelTracker:
+    """发布线程中单个通道的统计状态"""
+
+    def __init__(self):
+        self.window_time = None  # 当前CPS窗口的起点
+        self.window_clicks = 0
+        self.cps = 0.0  # 最近一个完整窗口的CPS
+        self.lateness_count = -1  # 计算延迟时的点击次数，没有新点击时不重新计算
+        self.lateness = (math.nan, math.nan, math.nan)
+
+    def rate(self, clicks, now):
+        """按每RATE_WINDOW纳秒的点击次数差分更新CPS"""
+        if self.window_time is None:
+            self.window_time, self.window_clicks = now, clicks
+        elif now - self.window_time >= RATE_WINDOW:
+            self.cps = (clicks - self.window_clicks) * NS / (now - self.window_time)
+            self.window_time, self.window_clicks = now, clicks
+        return self.cps
+
+
+class StatusPublisher:
+    """状态发布线程：每interval秒把engine各通道的状态写入名为name的共享内存
+
+    延迟统计读取engine.trace（见core.trace）中每个通道的环形缓冲区，发布线程只读取不加锁；
+    engine没有trace时创建一个容量较小的，即开启逐次点击记录，每次点击多一次计时和三次数组写入（见bench_trace）。
+    ProcessEngine（见core.process_engine）的点击在子进程中，点击次数从它的共享内存读取，没有延迟统计。
+    同名的共享内存已存在时，只有它是本模块创建的、且头部记录的发布进程已经退出（上次异常退出）才删除后重新创建；
+    发布进程仍在运行或不是状态共享内存时抛出FileExistsError，可换一个name。
+    """
+
+    def __init__(self, engine, name=DEFAULT_NAME, interval=0.1):
+        from .trace import ClickTrace
+
+        self.engine = engine
+        self.interval = interval
+        self.publishes = 0
+        self._remote = callable(getattr(engine, "clicks", None))
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=BLOCK_SIZE)
+        except FileExistsError:
+            _reclaim(name)
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=BLOCK_SIZE)
+        # 共享内存创建成功后才开启点击记录，创建失败时引擎保持原样
+        if not self._remote and engine.trace is None:
+            engine.trace = ClickTrace(LATENESS_SAMPLES)
+            for channel in engine.configs:
+                engine.trace.add_channel(channel)
+        self.name = self._shm.name
+        self._buf = self._shm.buf
+        self._body = bytearray(BLOCK_SIZE - BODY_OFFSET)  # 先在这里打包，持有奇数seq的时间只有一次复制
+        self._seq = 0
+        self._trackers = {}  # 通道名 -> _ChannelTracker
+        self._buf[:BLOCK_SIZE] = bytes(BLOCK_SIZE)
+        HEADER.pack_into(self._buf, 0, MAGIC, VERSION, HEADER_SIZE, SLOT_SIZE, MAX_CHANNELS,
+                         0, os.getpid(), 0, 0, 0, 0)
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="StatusPublisher")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def close(self):
+        """停止发布并删除共享内存"""
+        self.stop()
+        self._buf = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def _run(self):
+        cpu = self.engine.cpu.thread("状态")
+        with self._cond:
+            while self._running:
+                self.publish()
+                cpu.sample()
+                self._cond.wait(self.interval)
+
+    def _channel(self, name, config, policy, now):
+        """生成单个通道槽的字段值"""
+        engine = self.engine
+        tracker = self._trackers.get(name)
+        if tracker is None:
+            tracker = self._trackers[name] = _ChannelTracker()
+        if self._remote:
+            clicks, last_click = engine.clicks(name), engine.last_click(name)
+        else:
+            trace = engine.trace.channels.get(name)
+            clicks, last_click = self._lateness(tracker, trace)
+        user_cps = policy.user_cps(engine, name) if hasattr(policy, "user_cps") else 0.0
+        if hasattr(policy, "total_cps"):
+            total_cps = policy.total_cps(engine, name)
+        else:
+            total_cps = tracker.rate(clicks, now)
+        user_clicks = getattr(policy, "user_click_count", {}).get(name, 0)
+        # 辅助版不从ChannelConfig抽取CPS；子进程模式下抽取在子进程中，本进程的config.cps不会变化
+        if hasattr(policy, "target_cps"):
+            target_cps = policy.target_cps[name]
+        elif self._remote:
+            target_cps = engine.cps(name)
+        else:
+            target_cps = config.cps
+        return (name.encode("utf-8")[:NAME_SIZE], engine.is_active(name), clicks, user_clicks, last_click,
+                target_cps, total_cps, user_cps, *tracker.lateness)
+
+    def _lateness(self, tracker, trace):
+        """从点击记录更新最近LATENESS_SAMPLES次点击的延迟统计，返回(点击次数, 最近一次点击完成时间)"""
+        if trace is None or trace.count == 0:
+            return 0, 0
+        count = trace.count
+        last = (count - 1) % trace.capacity
+        last_click = trace.starts[last] + trace.durations[last]
+        if count != tracker.lateness_count:
+            tracker.lateness_count = count
+            samples = [(trace.starts[n % trace.capacity] - trace.deadlines[n % trace.capacity]) / 1000
+                       for n in range(max(0, count - min(LATENESS_SAMPLES, trace.capacity)), count)]
+            tracker.lateness = (percentile(samples, 0.5), percentile(samples, 0.99), max(samples))
+        return count, last_click
+
+    def publish(self):
+        """立即写入一次当前状态"""
+        engine = self.engine
+        now = engine.clock()
+        policy = engine.policy
+        channels = list(engine.configs.items())[:MAX_CHANNELS]
+        body = self._body
+        self.publishes += 1
+        struct.pack_into("<qqqq", body, 0, len(channels), now, time.time_ns(), self.publishes)
+        for slot, (name, config) in enumerate(channels):
+            SLOT.pack_into(body, HEADER_SIZE - BODY_OFFSET + slot * SLOT_SIZE,
+                           *self._channel(name, config, policy, now))
+        buf = self._buf
+        self._seq += 1
+        struct.pack_into("<q", buf, SEQ_OFFSET, self._seq)
+        buf[BODY_OFFSET:BLOCK_SIZE] = body
+        self._seq += 1
+        struct.pack_into("<q", buf, SEQ_OFFSET, self._seq)
+
+
+class StatusReader:
+    """读取StatusPublisher发布的状态，retries为在写入中途时重试的累计次数"""
+
+    def __init__(self, name=DEFAULT_NAME):
+        self._shm = shared_memory.SharedMemory(name=name)
+        self._buf = self._shm.buf
+        magic, version, header_size, slot_size, max_channels, _, pid = HEADER.unpack_from(self._buf, 0)[:7]
+        if os.name == "posix" and pid != os.getpid():
+            # 共享内存由发布方创建和删除，其他进程中的读取方退出时不能删除它
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{name}不是点击器的状态共享内存")
+        if (version, header_size, slot_size) != (VERSION, HEADER_SIZE, SLOT_SIZE):
+            self.close()
+            raise ValueError(f"不支持的状态布局版本: {version}（当前为{VERSION}）")
+        self.max_channels = max_channels
+        self.retries = 0
+
+    def close(self):
+        self._buf = None
+        self._shm.close()
+
+    def read(self):
+        """读取一次完整的发布，返回Status"""
+        buf = self._buf
+        while True:
+            seq = struct.unpack_from("<q", buf, SEQ_OFFSET)[0]
+            if seq % 2 == 0:
+                data = bytes(buf[:BLOCK_SIZE])
+                if struct.unpack_from("<q", buf, SEQ_OFFSET)[0] == seq:
+                    break
+            self.retries += 1
+            time.sleep(0)
+        header = HEADER.unpack_from(data, 0)
+        version, pid, count, now, wall_time, publishes = header[1], *header[6:]
+        channels = []
+        for slot in range(min(count, self.max_channels)):
+            fields = SLOT.unpack_from(data, HEADER_SIZE + slot * SLOT_SIZE)
+            channels.append(ChannelStatus(fields[0].rstrip(b"\0").decode("utf-8"), bool(fields[1]), *fields[2:]))
+        return Status(version, pid, now, wall_time, publishes, tuple(channels))
+
+
+def format_status(status):
+    """格式化为一行文本，例如 "left 开 23.1CPS 延迟p99 120us | right 关 0.0CPS" """
+    parts = []
+    for channel in status.channels:
+        text = f"{channel.name} {'开' if channel.active else '关'} {channel.total_cps:.1f}CPS"
+        if channel.user_cps:
+            text += f"(用户{channel.user_cps:.1f})"
+        if not math.isnan(channel.lateness_p99):
+            text += f" 延迟p99 {channel.lateness_p99:.0f}us"
+        parts.append(text)
+    return " | ".join(parts) or "没有通道"
+
+
+def main(name=DEFAULT_NAME):
+    reader = StatusReader(name)
+    try:
+        while True:
+            status = reader.read()
+            age = (time.time_ns() - status.wall_time) / NS
+            print(f"[pid {status.pid}，{age:.1f}秒前] {format_status(status)}")
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,94 @@
+"""点击时间调度工具
+
+所有时间戳都是单调时钟的整数纳秒（clock_ns），不受系统时间调整影响，
+截止时间的累加没有浮点误差；间隔参数仍以秒为单位传入，在边界处换算。
+"""
+
+import time
+
+NS = 1_000_000_000  # 每秒的纳秒数
+
+# 统一使用的单调时钟：Windows上monotonic只有约15.6ms精度，perf_counter为高精度计数器
+clock_ns = time.perf_counter_ns
+
+
+def to_ns(seconds):
+    """秒 -> 整数纳秒"""
+    return round(seconds * NS)
+
+
+class DeadlineTimer:
+    """基于绝对单调时钟的点击截止时间计算器
+
+    下一次截止时间 = 上一次截止时间 + 本次间隔，而不是"点击完成时刻 + 间隔"，
+    因此click()本身的耗时和sleep的超时都会从下一个间隔中扣除，长期平均CPS与目标一致。
+    """
+
+    def __init__(self, clock=clock_ns, max_lag=0.25):
+        self.clock = clock
+        self.max_lag = to_ns(max_lag)  # 落后超过此时长时放弃补偿，重新对齐当前时间
+        self.deadline = None  # 纳秒，None表示未在计时
+
+    def stop(self):
+        """停止计时，下一次advance从当前时刻重新开始"""
+        self.deadline = None
+
+    def advance(self, interval, now=None):
+        """推进interval秒到下一次截止时间并返回（纳秒）"""
+        if now is None:
+            now = self.clock()
+        if self.deadline is None:
+            self.deadline = now
+        self.deadline += to_ns(interval)
+        # 线程被长时间挂起时不补点，避免瞬间连续点击
+        if now - self.deadline > self.max_lag:
+            self.deadline = now
+        return self.deadline
+
+    def remaining(self, now=None):
+        """距离截止时间的纳秒数，未在计时返回None"""
+        if self.deadline is None:
+            return None
+        if now is None:
+            now = self.clock()
+        return self.deadline - now
+
+    def wait(self, limit=None):
+        """休眠到截止时间，limit限制单次最长休眠（秒）"""
+        delay = self.remaining()
+        if delay is None:
+            delay = limit
+        else:
+            delay /= NS
+            if limit is not None:
+                delay = min(delay, limit)
+        if delay is not None and delay > 0:
+            time.sleep(delay)
+
+
+class VirtualClock:
+    """可手动推进的虚拟时钟，可替代clock_ns注入调度器和引擎
+
+    时间只在advance/advance_to时前进，配合ClickScheduler.run_until
+    可以在几毫秒内模拟数小时的点击。
+    """
+
+    def __init__(self, start=0):
+        self.now = start  # 纳秒
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        """向前推进seconds秒"""
+        self.now += to_ns(seconds)
+        return self.now
+
+    def advance_to(self, timestamp):
+        """推进到timestamp（纳秒），时钟不会后退"""
+        if timestamp > self.now:
+            self.now = timestamp
+        return self.now
+
+    def sleep(self, seconds):
+        self.advance(seconds)
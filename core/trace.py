@@ -0,0 +1,68 @@
+"""逐次点击的计时记录
+
+开启后ClickEngine在每次输出点击时记录：通道、计划的截止时间、实际开始输出的时间和backend.click的耗时。
+每个通道一个预先分配的固定大小环形缓冲区，只由该通道的点击线程写入，不加锁、记录时不分配内存；
+写满后覆盖最旧的记录。dump()可随时把当前内容写成CSV，用于分析CPS偏离目标的原因。
+"""
+
+from array import array
+
+
+class ChannelTrace:
+    """单个通道的点击记录环形缓冲区"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.deadlines = array('q', bytes(8 * capacity))  # 计划的截止时间（纳秒）
+        self.starts = array('q', bytes(8 * capacity))  # 实际开始输出的时间（纳秒）
+        self.durations = array('q', bytes(8 * capacity))  # backend.click耗时（纳秒）
+        self.count = 0  # 记录过的点击总数，超过capacity的部分已被覆盖
+
+    def record(self, deadline, start, duration):
+        index = self.count % self.capacity
+        self.deadlines[index] = deadline
+        self.starts[index] = start
+        self.durations[index] = duration
+        self.count += 1
+
+    def records(self):
+        """按时间顺序生成仍保留的(截止时间, 开始时间, 耗时)"""
+        count = self.count
+        first = max(0, count - self.capacity)
+        for n in range(first, count):
+            index = n % self.capacity
+            yield self.deadlines[index], self.starts[index], self.durations[index]
+
+
+class ClickTrace:
+    """所有通道的点击记录，capacity为每个通道保留的最近点击数"""
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.channels = {}  # 通道名 -> ChannelTrace
+
+    def add_channel(self, name):
+        if name not in self.channels:
+            self.channels[name] = ChannelTrace(self.capacity)
+
+    def record(self, name, deadline, start, duration):
+        self.channels[name].record(deadline, start, duration)
+
+    def rows(self):
+        """所有通道的记录，按实际开始时间排序：(通道, 截止时间, 开始时间, 耗时)"""
+        rows = [(name, *record) for name, channel in self.channels.items() for record in channel.records()]
+        rows.sort(key=lambda row: row[2])
+        return rows
+
+    def dump(self, path):
+        """把当前记录写入CSV文件，返回写入的行数"""
+        import csv
+
+        rows = self.rows()
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["channel", "deadline_ns", "start_ns", "lateness_us", "duration_us"])
+            for name, deadline, start, duration in rows:
+                writer.writerow([name, deadline, start, f"{(start - deadline) / 1000:.1f}",
+                                 f"{duration / 1000:.1f}"])
+        return len(rows)
@@ -0,0 +1,154 @@
+"""滑动窗口点击统计"""
+
+import threading
+from array import array
+
+from .timing import NS
+
+
+class ClickWindow:
+    """定长、按时间排序的环形缓冲区，用于滑动窗口CPS统计
+
+    时间戳为整数纳秒，存放在array('q')中，每条记录8字节。append为O(1)；每个查询窗口长度维护一个只向前移动的游标，
+    count/first为均摊O(1)且不分配内存。写满后覆盖最旧的记录。
+    """
+
+    MAX_CURSORS = 16  # 最多同时跟踪的窗口长度
+
+    def __init__(self, capacity=2048):
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self._mask = size - 1
+        self._times = array('q', bytes(8 * size))
+        self._head = 0  # 最旧记录的序号
+        self._tail = 0  # 下一条记录的序号
+        self._cursors = {}  # 窗口长度 -> 窗口内最旧记录的序号
+        self._write_lock = threading.Lock()  # 监听线程和点击线程可能同时写入
+
+    def __len__(self):
+        return self._tail - self._head
+
+    def append(self, timestamp):
+        """记录一次点击，时间戳（纳秒）必须单调不减"""
+        with self._write_lock:
+            tail = self._tail
+            self._times[tail & self._mask] = timestamp
+            tail += 1
+            if tail - self._head > self._mask:
+                self._head = tail - self._mask
+            self._tail = tail
+
+    def clear(self):
+        with self._write_lock:
+            self._head = self._tail
+            self._cursors.clear()
+
+    def _start(self, window, now):
+        """窗口[now-window秒, now]内最旧记录的序号"""
+        cursor = self._cursors.get(window)
+        if cursor is None:
+            if len(self._cursors) >= self.MAX_CURSORS:
+                self._cursors.clear()
+            cursor = self._head
+        elif cursor < self._head:
+            cursor = self._head
+        tail = self._tail
+        limit = now - round(window * NS)
+        times = self._times
+        mask = self._mask
+        while cursor < tail and times[cursor & mask] < limit:
+            cursor += 1
+        self._cursors[window] = cursor
+        return cursor
+
+    def count(self, window, now):
+        """最近window秒内的点击次数"""
+        return self._tail - self._start(window, now)
+
+    def first(self, window, now):
+        """最近window秒内最早的点击时间（纳秒），没有则返回None"""
+        start = self._start(window, now)
+        if start >= self._tail:
+            return None
+        return self._times[start & self._mask]
+
+    def last(self):
+        """最近一次点击时间（纳秒），没有则返回None"""
+        tail = self._tail
+        if tail == self._head:
+            return None
+        return self._times[(tail - 1) & self._mask]
+
+
+class RateEstimator:
+    """流式点击速率估计：每次点击更新一次间隔的指数加权平均（EWMA）和最近两次点击时间
+
+    rate/is_active只读取几个字段，O(1)且不遍历任何记录，适合每次调度都要读取的辅助决策。
+    相邻点击间隔超过window秒时视为新的一轮连续点击，重新开始平均。
+    """
+
+    def __init__(self, alpha=0.3, window=1.5):
+        self.alpha = alpha  # 新间隔的权重
+        self.window = round(window * NS)
+        self.interval = 0.0  # 间隔的EWMA（纳秒）
+        self.count = 0  # 本轮连续点击的次数
+        self.last = None  # 最近一次点击时间（纳秒）
+        self.previous = None  # 倒数第二次点击时间（纳秒）
+
+    def append(self, timestamp):
+        """记录一次点击，时间戳（纳秒）必须单调不减"""
+        last = self.last
+        if last is None or timestamp - last > self.window:
+            self.count = 1
+        elif self.count == 1:
+            self.interval = float(timestamp - last)
+            self.count = 2
+        else:
+            self.interval += self.alpha * (timestamp - last - self.interval)
+            self.count += 1
+        self.previous = last
+        self.last = timestamp
+
+    def rate(self, now):
+        """当前CPS：平均间隔的倒数；距上次点击已超过平均间隔时按这段时间计算，停止点击后逐渐降为0"""
+        last = self.last
+        if last is None or now - last > self.window:
+            return 0.0
+        if self.count < 2:
+            return 1.0
+        return NS / max(self.interval, now - last)
+
+    def is_active(self, now, timeout):
+        """最近timeout秒内有点击；最近3*timeout秒内有两次点击时放宽到1.5*timeout"""
+        last = self.last
+        if last is None:
+            return False
+        if now - last <= timeout * NS:
+            return True
+        previous = self.previous
+        if previous is not None and now - previous <= timeout * 3 * NS:
+            return now - last <= timeout * 1.5 * NS
+        return False
+
+
+def real_cps(click_times, now):
+    """计算真实的CPS - 优先使用最近1秒的点击数，点击稀疏时按1.5秒内的时间跨度估算"""
+    if len(click_times) == 0:
+        return 0.0
+
+    # 只考虑最近1.5秒内的点击，增加统计窗口
+    recent_count = click_times.count(1.5, now)
+    if recent_count <= 1:
+        return recent_count
+
+    # 使用最近1秒内的点击数量进行计算，更稳定
+    recent_1s_count = click_times.count(1.0, now)
+    if recent_1s_count >= 2:
+        return recent_1s_count
+
+    # 如果1秒内点击数少于2，使用时间跨度计算
+    time_span = (click_times.last() - click_times.first(1.5, now)) / NS
+    if time_span > 0:
+        return (recent_count - 1) / time_span
+    return recent_count
@@ -1,23 +1,288 @@
 import sys
-import time
 import threading
-import random
-from pynput import mouse as ms
+from core import AssistPolicy, ClickEngine, StatsWorker
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QPushButton, QSlider, QCheckBox, QGroupBox, QSpinBox,
                              QDoubleSpinBox, QStyleFactory, QTabWidget)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtCore import Qt, QTimer, QEvent, pyqtSignal
 from PyQt5.QtGui import QIcon, QFont, QColor, QPalette
 
 # 线程锁，确保线程安全
 lock = threading.Lock()
 
+class Theme:
+    """界面样式表，每个缩放因子只生成一次，所有组件和开关切换都复用同一份字符串"""
+    
+    # 辅助模式开关按钮（与缩放无关）
+    BUTTON_ENABLED = """
+        QPushButton {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 #4CAF50, stop:1 #45a049);
+            border: none;
+            border-radius: 8px;
+            color: white;
+            font-weight: bold;
+            padding: 8px;
+        }
+        QPushButton:hover {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 #5CBF60, stop:1 #4CAF50);
+        }
+        QPushButton:pressed {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 #3d8b40, stop:1 #2e7d32);
+        }
+    """
+    BUTTON_DISABLED = """
+        QPushButton {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 #f44336, stop:1 #da190b);
+            border: none;
+            border-radius: 8px;
+            color: white;
+            font-weight: bold;
+            padding: 8px;
+        }
+        QPushButton:hover {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 #f66356, stop:1 #f44336);
+        }
+        QPushButton:pressed {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                                        stop:0 #b71c0c, stop:1 #8b0000);
+        }
+    """
+    
+    _cache = {}  # 缩放因子 -> Theme
+    
+    @classmethod
+    def for_scale(cls, scale_factor):
+        """获取指定缩放因子的样式表"""
+        theme = cls._cache.get(scale_factor)
+        if theme is None:
+            theme = cls._cache[scale_factor] = cls(scale_factor)
+        return theme
+    
+    def __init__(self, scale_factor):
+        self.scale_factor = scale_factor
+        size = self.font_size
+        self._cards = {}  # 颜色 -> (卡片样式, 标题样式)
+        
+        # 全局样式表
+        self.window = f"""
+            QMainWindow {{
+                background-color: #2d3241;
+            }}
+            QTabWidget::pane {{
+                border: 2px solid #373e4e;
+                border-radius: 8px;
+                background-color: #373e4e;
+                margin-top: -2px;
+            }}
+            QTabWidget::tab-bar {{
+                alignment: center;
+            }}
+            QTabBar::tab {{
+                background-color: #2d3241;
+                color: #c8c8c8;
+                padding: 14px 24px;
+                margin-right: 2px;
+                border-top-left-radius: 8px;
+                border-top-right-radius: 8px;
+                font-weight: 500;
+                min-width: 90px;
+                max-width: 140px;
+                font-size: {size(18)}px;
+            }}
+            QTabBar::tab:selected {{
+                background-color: #6495ed;
+                color: white;
+                font-weight: 600;
+            }}
+            QTabBar::tab:hover:!selected {{
+                background-color: #4a5268;
+                color: white;
+            }}
+            QGroupBox {{
+                font-weight: 600;
+                border: 2px solid #5a6178;
+                border-radius: 10px;
+                margin-top: 15px;
+                padding-top: 10px;
+                background-color: rgba(90, 97, 120, 0.3);
+            }}
+            QGroupBox::title {{
+                subcontrol-origin: margin;
+                left: 15px;
+                padding: 0 10px 0 10px;
+                color: #6495ed;
+                font-size: {size(19)}px;
+            }}
+            QSpinBox, QDoubleSpinBox {{
+                background-color: #40465a;
+                border: 2px solid #5a6178;
+                border-radius: 6px;
+                padding: 12px;
+                color: white;
+                font-size: {size(18)}px;
+                min-width: {int(100 * scale_factor)}px;
+            }}
+            QSpinBox:focus, QDoubleSpinBox:focus {{
+                border-color: #6495ed;
+            }}
+            QLabel {{
+                color: #e0e0e0;
+                font-size: {size(18)}px;
+            }}
+            QCheckBox {{
+                color: #e0e0e0;
+                font-size: {size(18)}px;
+            }}
+        """
+        
+        # 标题栏
+        self.title = f"""
+            QLabel {{
+                font-size: {size(32)}px;
+                font-weight: bold;
+                color: #6495ed;
+                margin: 0px;
+            }}
+        """
+        self.subtitle = f"""
+            QLabel {{
+                font-size: {size(16)}px;
+                color: #a0a0a0;
+                margin: 0px;
+            }}
+        """
+        
+        # 状态指示器：运行中 / 已暂停
+        status_indicator = """
+            QLabel {{
+                font-size: {size}px;
+                font-weight: bold;
+                color: {color};
+                background-color: {background};
+                border: 1px solid {color};
+                border-radius: 15px;
+                padding: 10px 18px;
+            }}
+        """
+        self.status_running = status_indicator.format(
+            size=size(18), color="#4CAF50", background="rgba(76, 175, 80, 0.1)")
+        self.status_paused = status_indicator.format(
+            size=size(18), color="#f44336", background="rgba(244, 67, 54, 0.1)")
+        
+        self.assist_status = f"""
+            QLabel {{
+                font-size: {size(19)}px;
+                color: #c8c8c8;
+                background-color: #40465a;
+                border-radius: 6px;
+                padding: 12px 16px;
+            }}
+        """
+        
+        # CPS卡片中的数值、分解和状态
+        self.cps_value = f"""
+            QLabel {{
+                font-size: {size(32)}px;
+                font-weight: bold;
+                color: white;
+                margin: 0px;
+            }}
+        """
+        self.cps_detail = f"""
+            QLabel {{
+                font-size: {size(15)}px;
+                color: #b0b0b0;
+                margin: 0px;
+            }}
+        """
+        self.cps_status = f"""
+            QLabel {{
+                font-size: {size(16)}px;
+                color: #c8c8c8;
+                margin: 0px;
+            }}
+        """
+        
+        self.warning = f"""
+            QLabel {{
+                color: #FF9800;
+                background-color: rgba(255, 152, 0, 0.1);
+                border: 2px solid #FF9800;
+                border-radius: 8px;
+                padding: 16px 20px;
+                margin: 5px 0px;
+                font-size: {size(16)}px;
+            }}
+        """
+        
+        # 设置选项卡的说明文字
+        self.description = f"""
+            QLabel {{
+                color: #a0a0a0;
+                background-color: #40465a;
+                border-radius: 6px;
+                padding: 16px;
+                margin: 10px 0px;
+                font-size: {size(17)}px;
+            }}
+        """
+        self.features = f"""
+            QLabel {{
+                background-color: #40465a;
+                border-radius: 8px;
+                padding: 18px;
+                color: #e0e0e0;
+                line-height: 1.5;
+                font-size: {size(16)}px;
+            }}
+        """
+    
+    def font_size(self, base_size):
+        """获取缩放后的字体大小"""
+        return int(base_size * self.scale_factor)
+    
+    def cps_card(self, color):
+        """CPS卡片和卡片标题的样式，按颜色缓存"""
+        styles = self._cards.get(color)
+        if styles is None:
+            styles = self._cards[color] = (f"""
+                QWidget {{
+                    background-color: rgba(64, 70, 90, 0.8);
+                    border: 2px solid {color};
+                    border-radius: 10px;
+                    margin: 5px;
+                }}
+            """, f"""
+                QLabel {{
+                    font-size: {self.font_size(20)}px;
+                    font-weight: bold;
+                    color: {color};
+                    margin: 0px;
+                }}
+            """)
+        return styles
+    
+    def status_indicator(self, running):
+        return self.status_running if running else self.status_paused
+    
+    def button(self, enabled):
+        return self.BUTTON_ENABLED if enabled else self.BUTTON_DISABLED
+
 class AutoClickerGUI(QMainWindow):
     # 自定义信号用于线程安全更新UI
-    update_left_cps_signal = pyqtSignal(float, float)
-    update_right_cps_signal = pyqtSignal(float, float)
+    stats_ready_signal = pyqtSignal()
+    
+    # CPS监视器刷新周期（秒）：窗口在前台、在后台、最小化或隐藏（None为暂停）
+    REFRESH_ACTIVE = 0.1
+    REFRESH_INACTIVE = 0.5
+    REFRESH_HIDDEN = None
     
-    def __init__(self):
+    def __init__(self, backend=None, listen=True):
         super().__init__()
         self.setWindowTitle("智能模拟点击器 - Half Auto Clicker")
         self.setMinimumSize(800, 650)
@@ -30,18 +295,6 @@ class AutoClickerGUI(QMainWindow):
         
         # 状态变量
         self.assist_mode_active = True  # 辅助模式默认开启
-        self.left_button_held = False
-        self.right_button_held = False
-        
-        # 点击计数和时间跟踪
-        self.left_click_count = 0
-        self.right_click_count = 0
-        self.last_left_click_time = 0
-        self.last_right_click_time = 0
-        self.left_click_times = []  # 记录左键点击时间（包含用户+辅助）
-        self.right_click_times = []  # 记录右键点击时间（包含用户+辅助）
-        self.user_left_click_times = []  # 仅记录用户左键点击时间
-        self.user_right_click_times = []  # 仅记录用户右键点击时间
         
         # 左键点击参数
         self.left_max_cps = 23
@@ -60,14 +313,29 @@ class AutoClickerGUI(QMainWindow):
         
         # 用户活动检测参数
         self.idle_timeout = 0.20  # 用户停止点击多长时间后停止辅助（秒）
-        self.last_user_left_click = 0  # 最后一次用户左键点击时间
-        self.last_user_right_click = 0  # 最后一次用户右键点击时间
-        
-        # 防止辅助点击被监听器捕获的标志
-        self.is_assist_clicking = False
         
-        # 创建鼠标控制器
-        self.mouse_controller = ms.Controller()
+        # 辅助策略和点击引擎，点击记录与辅助决策都在引擎中完成
+        self.assist = AssistPolicy(self.assist_threshold, self.idle_timeout)
+        self.engine = ClickEngine(self.assist, backend)
+        self.engine.configure("left", min_cps=self.left_min_cps, max_cps=self.left_max_cps)
+        self.engine.configure("right", min_cps=self.right_min_cps, max_cps=self.right_max_cps)
+        
+        # CPS统计在独立线程中生成快照，界面线程只负责显示
+        self.stats_worker = StatsWorker(self.engine, self.assist, self.stats_ready_signal.emit,
+                                        self.REFRESH_HIDDEN)
+        self.label_texts = {}  # 标签 -> 当前显示的文本，文本不变时不调用setText
+        self.label_updates = 0  # 实际调用setText的次数
+        self.gui_cpu = self.engine.cpu.thread("界面")  # 界面线程在每次刷新后记录自己的CPU时间
+        
+        # 带--status启动时把各通道的状态发布到命名共享内存，外部程序用 python -m core.status 等方式读取
+        self.status = None
+        if "--status" in sys.argv[1:]:
+            from core.status import StatusPublisher
+            try:
+                self.status = StatusPublisher(self.engine)
+                self.status.start()
+            except FileExistsError as e:
+                print(f"--status未生效: {e}")
         
         # 设置UI样式
         self.set_style()
@@ -75,11 +343,9 @@ class AutoClickerGUI(QMainWindow):
         # 初始化UI
         self.init_ui()
         
-        # 启动线程
-        self.start_threads()
-        
-        # 启动鼠标监听（仅用于检测点击频率）
-        self.start_mouse_listener()
+        # 启动调度线程和鼠标监听（监听仅用于检测点击频率）
+        # 事件循环开始后再启动，导入pynput不会推迟窗口的首次显示
+        QTimer.singleShot(0, lambda: self.engine.start(listen))
         
         # 连接窗口大小改变事件
         self.resizeEvent = self.on_resize
@@ -117,19 +383,45 @@ class AutoClickerGUI(QMainWindow):
             self.current_scale_factor = new_scale_factor
             self.update_all_fonts()
     
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_refresh_rate()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_refresh_rate()
+    
+    def changeEvent(self, event):
+        """最小化/还原和前后台切换时调整CPS监视器的刷新周期"""
+        super().changeEvent(event)
+        if event.type() in (QEvent.WindowStateChange, QEvent.ActivationChange):
+            self.update_refresh_rate()
+    
+    def update_refresh_rate(self):
+        """窗口不可见时暂停统计刷新，在后台时降低刷新频率"""
+        if not self.isVisible() or self.isMinimized():
+            interval = self.REFRESH_HIDDEN
+        elif self.isActiveWindow():
+            interval = self.REFRESH_ACTIVE
+        else:
+            interval = self.REFRESH_INACTIVE
+        self.stats_worker.set_interval(interval)
+    
+    def set_label_text(self, label, text):
+        """只在文本变化时更新标签，避免无意义的重绘"""
+        if self.label_texts.get(label) != text:
+            self.label_texts[label] = text
+            self.label_updates += 1
+            label.setText(text)
+    
     def update_all_fonts(self):
         """更新所有组件的字体大小"""
         try:
+            self.theme = Theme.for_scale(self.current_scale_factor)
+            
             # 更新标题字体
             if hasattr(self, 'title_label'):
-                self.title_label.setStyleSheet(f"""
-                    QLabel {{
-                        font-size: {self.get_scaled_font_size(32)}px;
-                        font-weight: bold;
-                        color: #6495ed;
-                        margin: 0px;
-                    }}
-                """)
+                self.title_label.setStyleSheet(self.theme.title)
             
             # 更新所有选项卡字体
             for i in range(self.findChild(QTabWidget).count()):
@@ -174,82 +466,15 @@ class AutoClickerGUI(QMainWindow):
         QApplication.setPalette(dark_palette)
         
         # 设置全局样式表
-        self.setStyleSheet(f"""
-            QMainWindow {{
-                background-color: #2d3241;
-            }}
-            QTabWidget::pane {{
-                border: 2px solid #373e4e;
-                border-radius: 8px;
-                background-color: #373e4e;
-                margin-top: -2px;
-            }}
-            QTabWidget::tab-bar {{
-                alignment: center;
-            }}
-            QTabBar::tab {{
-                background-color: #2d3241;
-                color: #c8c8c8;
-                padding: 14px 24px;
-                margin-right: 2px;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-                font-weight: 500;
-                min-width: 90px;
-                max-width: 140px;
-                font-size: {self.get_scaled_font_size(18)}px;
-            }}
-            QTabBar::tab:selected {{
-                background-color: #6495ed;
-                color: white;
-                font-weight: 600;
-            }}
-            QTabBar::tab:hover:!selected {{
-                background-color: #4a5268;
-                color: white;
-            }}
-            QGroupBox {{
-                font-weight: 600;
-                border: 2px solid #5a6178;
-                border-radius: 10px;
-                margin-top: 15px;
-                padding-top: 10px;
-                background-color: rgba(90, 97, 120, 0.3);
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 10px 0 10px;
-                color: #6495ed;
-                font-size: {self.get_scaled_font_size(19)}px;
-            }}
-            QSpinBox, QDoubleSpinBox {{
-                background-color: #40465a;
-                border: 2px solid #5a6178;
-                border-radius: 6px;
-                padding: 12px;
-                color: white;
-                font-size: {self.get_scaled_font_size(18)}px;
-                min-width: {int(100 * self.current_scale_factor)}px;
-            }}
-            QSpinBox:focus, QDoubleSpinBox:focus {{
-                border-color: #6495ed;
-            }}
-            QLabel {{
-                color: #e0e0e0;
-                font-size: {self.get_scaled_font_size(18)}px;
-            }}
-            QCheckBox {{
-                color: #e0e0e0;
-                font-size: {self.get_scaled_font_size(18)}px;
-            }}
-        """)
+        self.theme = Theme.for_scale(self.current_scale_factor)
+        self.setStyleSheet(self.theme.window)
     
     
     def init_ui(self):
         """初始化现代化用户界面"""
         # 计算初始缩放因子
         self.current_scale_factor = self.calculate_scale_factor()
+        self.theme = Theme.for_scale(self.current_scale_factor)
         
         # 创建中央窗口部件
         central_widget = QWidget()
@@ -271,11 +496,13 @@ class AutoClickerGUI(QMainWindow):
         tab_widget.setUsesScrollButtons(False)
         tab_widget.setElideMode(Qt.ElideNone)
         
-        # 创建各个选项卡
+        # 创建各个选项卡：主控制面板立即创建，其余选项卡在第一次打开时才创建
         self.create_main_control_tab(tab_widget)
-        self.create_left_settings_tab(tab_widget)
-        self.create_right_settings_tab(tab_widget)
-        self.create_about_tab(tab_widget)
+        self.pending_tabs = {}  # 选项卡序号 -> 创建函数
+        self.add_lazy_tab(tab_widget, "⚙️ 左键设置", self.create_left_settings_tab)
+        self.add_lazy_tab(tab_widget, "⚙️ 右键设置", self.create_right_settings_tab)
+        self.add_lazy_tab(tab_widget, "ℹ️ 关于", self.create_about_tab)
+        tab_widget.currentChanged.connect(self.build_pending_tab)
         
         # 添加到主布局
         main_layout.addWidget(tab_widget)
@@ -283,14 +510,9 @@ class AutoClickerGUI(QMainWindow):
         # 创建状态栏
         self.create_status_bar(main_layout)
         
-        # 连接信号
-        self.update_left_cps_signal.connect(self.update_left_cps_display)
-        self.update_right_cps_signal.connect(self.update_right_cps_display)
-        
-        # 启动CPS计算定时器
-        self.cps_timer = QTimer()
-        self.cps_timer.timeout.connect(self.calculate_cps)
-        self.cps_timer.start(100)  # 每100ms计算一次CPS
+        # 连接信号并启动CPS统计线程，窗口显示后才开始刷新
+        self.stats_ready_signal.connect(self.render_stats)
+        self.stats_worker.start()
         
         # 初始检查配置合理性
         self.check_config_validity()
@@ -309,23 +531,10 @@ class AutoClickerGUI(QMainWindow):
         
         # 应用标题
         title_label = QLabel("智能模拟点击器")
-        title_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: {self.get_scaled_font_size(32)}px;
-                font-weight: bold;
-                color: #6495ed;
-                margin: 0px;
-            }}
-        """)
+        title_label.setStyleSheet(self.theme.title)
         
         subtitle_label = QLabel("Professional Edition v2.0")
-        subtitle_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: {self.get_scaled_font_size(16)}px;
-                color: #a0a0a0;
-                margin: 0px;
-            }}
-        """)
+        subtitle_label.setStyleSheet(self.theme.subtitle)
         
         title_layout = QVBoxLayout()
         title_layout.setSpacing(2)
@@ -336,17 +545,7 @@ class AutoClickerGUI(QMainWindow):
         
         # 右侧：状态指示器
         self.status_indicator = QLabel("● 运行中")
-        self.status_indicator.setStyleSheet(f"""
-            QLabel {{
-                font-size: {self.get_scaled_font_size(18)}px;
-                font-weight: bold;
-                color: #4CAF50;
-                background-color: rgba(76, 175, 80, 0.1);
-                border: 1px solid #4CAF50;
-                border-radius: 15px;
-                padding: 10px 18px;
-            }}
-        """)
+        self.status_indicator.setStyleSheet(self.theme.status_running)
         
         header_layout.addWidget(left_header)
         header_layout.addStretch()
@@ -393,15 +592,7 @@ class AutoClickerGUI(QMainWindow):
         
         # 状态显示
         self.assist_status_label = QLabel(f"状态：已启用 • 阈值：{self.assist_threshold} CPS • 延迟：{self.idle_timeout:.1f}s")
-        self.assist_status_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: {self.get_scaled_font_size(19)}px;
-                color: #c8c8c8;
-                background-color: #40465a;
-                border-radius: 6px;
-                padding: 12px 16px;
-            }}
-        """)
+        self.assist_status_label.setStyleSheet(self.theme.assist_status)
         layout.addWidget(self.assist_status_label)
         
         # 辅助模式开关按钮 - 更现代的设计
@@ -486,15 +677,9 @@ class AutoClickerGUI(QMainWindow):
     
     def create_cps_card(self, title, color):
         """创建CPS显示卡片"""
+        card_style, title_style = self.theme.cps_card(color)
         card = QWidget()
-        card.setStyleSheet(f"""
-            QWidget {{
-                background-color: rgba(64, 70, 90, 0.8);
-                border: 2px solid {color};
-                border-radius: 10px;
-                margin: 5px;
-            }}
-        """)
+        card.setStyleSheet(card_style)
         card.setMinimumHeight(140)
         
         layout = QVBoxLayout(card)
@@ -503,54 +688,28 @@ class AutoClickerGUI(QMainWindow):
         
         # 标题
         title_label = QLabel(title)
-        title_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: {self.get_scaled_font_size(20)}px;
-                font-weight: bold;
-                color: {color};
-                margin: 0px;
-            }}
-        """)
+        title_label.setStyleSheet(title_style)
         title_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(title_label)
         
         # 总CPS数值
         cps_value = QLabel("0.0")
         cps_value.setObjectName("cps_value")
-        cps_value.setStyleSheet(f"""
-            QLabel {{
-                font-size: {self.get_scaled_font_size(32)}px;
-                font-weight: bold;
-                color: white;
-                margin: 0px;
-            }}
-        """)
+        cps_value.setStyleSheet(self.theme.cps_value)
         cps_value.setAlignment(Qt.AlignCenter)
         layout.addWidget(cps_value)
         
         # 详细CPS分解显示
         cps_detail = QLabel("(0.0)CPS + (0.0)CPS")
         cps_detail.setObjectName("cps_detail")
-        cps_detail.setStyleSheet(f"""
-            QLabel {{
-                font-size: {self.get_scaled_font_size(15)}px;
-                color: #b0b0b0;
-                margin: 0px;
-            }}
-        """)
+        cps_detail.setStyleSheet(self.theme.cps_detail)
         cps_detail.setAlignment(Qt.AlignCenter)
         layout.addWidget(cps_detail)
         
         # 状态
         cps_status = QLabel("待机")
         cps_status.setObjectName("cps_status")
-        cps_status.setStyleSheet(f"""
-            QLabel {{
-                font-size: {self.get_scaled_font_size(16)}px;
-                color: #c8c8c8;
-                margin: 0px;
-            }}
-        """)
+        cps_status.setStyleSheet(self.theme.cps_status)
         cps_status.setAlignment(Qt.AlignCenter)
         layout.addWidget(cps_status)
         
@@ -561,67 +720,30 @@ class AutoClickerGUI(QMainWindow):
         # 配置警告 - 使用可折叠的设计
         self.config_warning_label = QLabel("")
         self.config_warning_label.setFont(QFont("微软雅黑", self.get_scaled_font_size(16)))
-        self.config_warning_label.setStyleSheet(f"""
-            QLabel {{
-                color: #FF9800;
-                background-color: rgba(255, 152, 0, 0.1);
-                border: 2px solid #FF9800;
-                border-radius: 8px;
-                padding: 16px 20px;
-                margin: 5px 0px;
-                font-size: {self.get_scaled_font_size(16)}px;
-            }}
-        """)
+        self.config_warning_label.setStyleSheet(self.theme.warning)
         self.config_warning_label.setWordWrap(True)
         self.config_warning_label.hide()
         layout.addWidget(self.config_warning_label)
     
     def set_button_style(self, button, enabled=True):
         """设置按钮样式"""
-        if enabled:
-            button.setStyleSheet("""
-                QPushButton {
-                    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                                stop:0 #4CAF50, stop:1 #45a049);
-                    border: none;
-                    border-radius: 8px;
-                    color: white;
-                    font-weight: bold;
-                    padding: 8px;
-                }
-                QPushButton:hover {
-                    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                                stop:0 #5CBF60, stop:1 #4CAF50);
-                }
-                QPushButton:pressed {
-                    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                                stop:0 #3d8b40, stop:1 #2e7d32);
-                }
-            """)
-        else:
-            button.setStyleSheet("""
-                QPushButton {
-                    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                                stop:0 #f44336, stop:1 #da190b);
-                    border: none;
-                    border-radius: 8px;
-                    color: white;
-                    font-weight: bold;
-                    padding: 8px;
-                }
-                QPushButton:hover {
-                    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                                stop:0 #f66356, stop:1 #f44336);
-                }
-                QPushButton:pressed {
-                    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                                                stop:0 #b71c0c, stop:1 #8b0000);
-                }
-            """)
+        button.setStyleSheet(self.theme.button(enabled))
     
-
+    def add_lazy_tab(self, tab_widget, title, create):
+        """添加一个空白选项卡，第一次切换到它时才调用create()创建内容"""
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        index = tab_widget.addTab(page, title)
+        self.pending_tabs[index] = create
+    
+    def build_pending_tab(self, index):
+        """创建尚未创建的选项卡内容"""
+        create = self.pending_tabs.pop(index, None)
+        if create is not None:
+            self.findChild(QTabWidget).widget(index).layout().addWidget(create())
     
-    def create_left_settings_tab(self, tab_widget):
+    def create_left_settings_tab(self):
         """创建左键设置选项卡"""
         left_tab = QWidget()
         layout = QVBoxLayout(left_tab)
@@ -637,6 +759,7 @@ class AutoClickerGUI(QMainWindow):
         # 启用状态
         self.left_enabled_cb = QCheckBox("启用左键辅助")
         self.left_enabled_cb.setChecked(True)
+        self.left_enabled_cb.toggled.connect(lambda state: self.engine.configure("left", enabled=state))
         self.left_enabled_cb.setFont(QFont("微软雅黑", self.get_scaled_font_size(16)))
         left_layout.addWidget(self.left_enabled_cb)
         
@@ -687,25 +810,16 @@ class AutoClickerGUI(QMainWindow):
         # 添加说明
         desc_label = QLabel("左键辅助说明：\n• 当检测到用户左键点击频率超过设定阈值时自动启动\n• 总CPS（手动+模拟）将在设定的最大最小范围内随机浮动\n• 当用户停止点击超过设定延迟时间会自动停止")
         desc_label.setFont(QFont("微软雅黑", self.get_scaled_font_size(17)))
-        desc_label.setStyleSheet(f"""
-            QLabel {{
-                color: #a0a0a0;
-                background-color: #40465a;
-                border-radius: 6px;
-                padding: 16px;
-                margin: 10px 0px;
-                font-size: {self.get_scaled_font_size(17)}px;
-            }}
-        """)
+        desc_label.setStyleSheet(self.theme.description)
         desc_label.setWordWrap(True)
         left_layout.addWidget(desc_label)
         
         layout.addWidget(left_group)
         layout.addStretch()
         
-        tab_widget.addTab(left_tab, "⚙️ 左键设置")
+        return left_tab
     
-    def create_right_settings_tab(self, tab_widget):
+    def create_right_settings_tab(self):
         """创建右键设置选项卡"""
         right_tab = QWidget()
         layout = QVBoxLayout(right_tab)
@@ -721,6 +835,7 @@ class AutoClickerGUI(QMainWindow):
         # 启用状态
         self.right_enabled_cb = QCheckBox("启用右键辅助")
         self.right_enabled_cb.setChecked(True)
+        self.right_enabled_cb.toggled.connect(lambda state: self.engine.configure("right", enabled=state))
         self.right_enabled_cb.setFont(QFont("微软雅黑", self.get_scaled_font_size(16)))
         right_layout.addWidget(self.right_enabled_cb)
         
@@ -771,25 +886,16 @@ class AutoClickerGUI(QMainWindow):
         # 添加说明
         desc_label = QLabel("右键辅助说明：\n• 当检测到用户右键点击频率超过设定阈值时自动启动\n• 总CPS（手动+模拟）将在设定的最大最小范围内随机浮动\n• 当用户停止点击超过设定延迟时间会自动停止")
         desc_label.setFont(QFont("微软雅黑", self.get_scaled_font_size(17)))
-        desc_label.setStyleSheet(f"""
-            QLabel {{
-                color: #a0a0a0;
-                background-color: #40465a;
-                border-radius: 6px;
-                padding: 16px;
-                margin: 10px 0px;
-                font-size: {self.get_scaled_font_size(17)}px;
-            }}
-        """)
+        desc_label.setStyleSheet(self.theme.description)
         desc_label.setWordWrap(True)
         right_layout.addWidget(desc_label)
         
         layout.addWidget(right_group)
         layout.addStretch()
         
-        tab_widget.addTab(right_tab, "⚙️ 右键设置")
+        return right_tab
     
-    def create_about_tab(self, tab_widget):
+    def create_about_tab(self):
         """创建关于选项卡"""
         about_tab = QWidget()
         layout = QVBoxLayout(about_tab)
@@ -833,16 +939,7 @@ class AutoClickerGUI(QMainWindow):
         
         features_label = QLabel(features_text)
         features_label.setFont(QFont("微软雅黑", self.get_scaled_font_size(16)))
-        features_label.setStyleSheet(f"""
-            QLabel {{
-                background-color: #40465a;
-                border-radius: 8px;
-                padding: 18px;
-                color: #e0e0e0;
-                line-height: 1.5;
-                font-size: {self.get_scaled_font_size(16)}px;
-            }}
-        """)
+        features_label.setStyleSheet(self.theme.features)
         features_label.setWordWrap(True)
         app_info_layout.addWidget(features_label)
         
@@ -856,7 +953,7 @@ class AutoClickerGUI(QMainWindow):
         copyright_label.setStyleSheet("color: #a0a0a0; margin: 10px;")
         layout.addWidget(copyright_label)
         
-        tab_widget.addTab(about_tab, "ℹ️ 关于")
+        return about_tab
     
     def create_status_bar(self, layout):
         """创建状态栏"""
@@ -865,6 +962,12 @@ class AutoClickerGUI(QMainWindow):
         status_layout = QHBoxLayout(status_widget)
         status_layout.setContentsMargins(10, 8, 10, 8)
         
+        # 各线程CPU占用
+        self.cpu_label = QLabel("")
+        self.cpu_label.setFont(QFont("微软雅黑", self.get_scaled_font_size(14)))
+        self.cpu_label.setStyleSheet("color: #a0a0a0;")
+        status_layout.addWidget(self.cpu_label)
+        
         # 版本信息
         version_label = QLabel("v2.0.0")
         version_label.setFont(QFont("微软雅黑", self.get_scaled_font_size(18)))
@@ -875,47 +978,17 @@ class AutoClickerGUI(QMainWindow):
         
         layout.addWidget(status_widget)
     
-    def calculate_cps(self):
-        """计算并更新CPS显示"""
-        current_time = time.time()
-        
-        # 清理超过1秒的点击记录
-        self.left_click_times = [t for t in self.left_click_times if current_time - t <= 1.0]
-        self.right_click_times = [t for t in self.right_click_times if current_time - t <= 1.0]
-        self.user_left_click_times = [t for t in self.user_left_click_times if current_time - t <= 1.0]
-        self.user_right_click_times = [t for t in self.user_right_click_times if current_time - t <= 1.0]
-        
-        # 计算真实的CPS（基于时间间隔）
-        left_cps = self.calculate_real_cps(self.left_click_times)
-        right_cps = self.calculate_real_cps(self.right_click_times)
-        
-        # 更新显示
-        self.update_left_cps_signal.emit(left_cps, 0)
-        self.update_right_cps_signal.emit(right_cps, 0)
-    
-    def calculate_real_cps(self, click_times):
-        """计算真实的CPS - 使用更稳定的计算方法"""
-        if len(click_times) == 0:
-            return 0.0
-        
-        current_time = time.time()
-        # 只考虑最近1.5秒内的点击，增加统计窗口
-        recent_clicks = [t for t in click_times if current_time - t <= 1.5]
-        
-        if len(recent_clicks) <= 1:
-            return len(recent_clicks)
-        
-        # 使用最近1秒内的点击数量进行计算，更稳定
-        recent_1s_clicks = [t for t in recent_clicks if current_time - t <= 1.0]
-        if len(recent_1s_clicks) >= 2:
-            return len(recent_1s_clicks)
-        else:
-            # 如果1秒内点击数少于2，使用时间跨度计算
-            time_span = recent_clicks[-1] - recent_clicks[0]
-            if time_span > 0:
-                return (len(recent_clicks) - 1) / time_span
-            else:
-                return len(recent_clicks)
+    def render_stats(self):
+        """显示统计线程生成的最新快照"""
+        snapshot = self.stats_worker.take()
+        if snapshot is None:
+            return
+        self.update_left_cps_display(snapshot.channels["left"])
+        self.update_right_cps_display(snapshot.channels["right"])
+        if snapshot.threads:
+            self.set_label_text(self.cpu_label, "CPU  " + "  ".join(
+                f"{usage.name} {usage.cpu_percent:.1f}%" for usage in snapshot.threads))
+        self.gui_cpu.sample()
     
     def toggle_left_clicking(self):
         """已移除 - 不再使用"""
@@ -936,6 +1009,7 @@ class AutoClickerGUI(QMainWindow):
         if self.left_min_cps > value:
             self.left_min_cps = value
             self.left_min_cps_spin.setValue(value)
+        self.engine.configure("left", min_cps=self.left_min_cps, max_cps=self.left_max_cps)
         # 触发配置合理性检查
         self.check_config_validity()
     
@@ -946,6 +1020,7 @@ class AutoClickerGUI(QMainWindow):
         if self.left_max_cps < value:
             self.left_max_cps = value
             self.left_max_cps_spin.setValue(value)
+        self.engine.configure("left", min_cps=self.left_min_cps, max_cps=self.left_max_cps)
         # 触发配置合理性检查
         self.check_config_validity()
     
@@ -960,6 +1035,7 @@ class AutoClickerGUI(QMainWindow):
         if self.right_min_cps > value:
             self.right_min_cps = value
             self.right_min_cps_spin.setValue(value)
+        self.engine.configure("right", min_cps=self.right_min_cps, max_cps=self.right_max_cps)
         # 触发配置合理性检查
         self.check_config_validity()
     
@@ -970,6 +1046,7 @@ class AutoClickerGUI(QMainWindow):
         if self.right_max_cps < value:
             self.right_max_cps = value
             self.right_max_cps_spin.setValue(value)
+        self.engine.configure("right", min_cps=self.right_min_cps, max_cps=self.right_max_cps)
         # 触发配置合理性检查
         self.check_config_validity()
     
@@ -980,12 +1057,14 @@ class AutoClickerGUI(QMainWindow):
     def update_idle_timeout(self, value):
         """更新空闲超时时间"""
         self.idle_timeout = value
+        self.assist.idle_timeout = value
         self.update_status_label()
         self.check_config_validity()
     
     def update_threshold(self, value):
         """更新辅助启动阈值"""
         self.assist_threshold = value
+        self.assist.threshold = value
         self.update_status_label()
         self.check_config_validity()
     
@@ -1012,70 +1091,11 @@ class AutoClickerGUI(QMainWindow):
         with lock:
             self.assist_mode_active = not self.assist_mode_active
         
-        if self.assist_mode_active:
-            self.assist_toggle_btn.setText("关闭辅助模式")
-            self.assist_toggle_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #4CAF50;
-                    border: 2px solid #45a049;
-                    border-radius: 5px;
-                    padding: 8px;
-                    color: white;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #45a049;
-                }
-                QPushButton:pressed {
-                    background-color: #3d8b40;
-                }
-            """)
-        else:
-            self.assist_toggle_btn.setText("开启辅助模式")
-            self.assist_toggle_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #f44336;
-                    border: 2px solid #da190b;
-                    border-radius: 5px;
-                    padding: 8px;
-                    color: white;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #da190b;
-                }
-                QPushButton:pressed {
-                    background-color: #b71c0c;
-                }
-            """)
+        self.assist_toggle_btn.setText("关闭辅助模式" if self.assist_mode_active else "开启辅助模式")
+        self.set_button_style(self.assist_toggle_btn, enabled=self.assist_mode_active)
         
         self.update_status_label()
     
-    def is_user_actively_clicking(self, button_type='left'):
-        """更智能的用户活动检测"""
-        current_time = time.time()
-        
-        if button_type == 'left':
-            last_click_time = self.last_user_left_click
-            user_clicks = self.user_left_click_times
-        else:
-            last_click_time = self.last_user_right_click
-            user_clicks = self.user_right_click_times
-        
-        # 基本超时检查
-        basic_timeout_check = (current_time - last_click_time) <= self.idle_timeout
-        
-        # 如果基本检查失败，进行更智能的检查
-        if not basic_timeout_check:
-            # 检查最近是否有持续的点击活动
-            recent_clicks = [t for t in user_clicks if current_time - t <= (self.idle_timeout * 3)]
-            if len(recent_clicks) >= 2:
-                # 如果最近有多次点击，适当放宽超时限制
-                extended_timeout = self.idle_timeout * 1.5
-                return (current_time - last_click_time) <= extended_timeout
-        
-        return basic_timeout_check
-    
     def update_status_label(self):
         """更新状态标签显示"""
         mode_text = "已启用" if self.assist_mode_active else "已关闭"
@@ -1085,39 +1105,20 @@ class AutoClickerGUI(QMainWindow):
     def toggle_assist_mode(self):
         """切换辅助模式"""
         self.assist_mode_active = not self.assist_mode_active
+        # 关闭时立即停止正在进行的辅助点击
+        self.assist.set_enabled(self.engine, self.assist_mode_active)
         
         if self.assist_mode_active:
             self.assist_toggle_btn.setText("🔴 关闭辅助模式")
-            self.set_button_style(self.assist_toggle_btn, enabled=True)
             if hasattr(self, 'status_indicator'):
                 self.status_indicator.setText("● 运行中")
-                self.status_indicator.setStyleSheet("""
-                    QLabel {
-                        font-size: 14px;
-                        font-weight: bold;
-                        color: #4CAF50;
-                        background-color: rgba(76, 175, 80, 0.1);
-                        border: 1px solid #4CAF50;
-                        border-radius: 15px;
-                        padding: 8px 16px;
-                    }
-                """)
         else:
             self.assist_toggle_btn.setText("🟢 启用辅助模式")
-            self.set_button_style(self.assist_toggle_btn, enabled=False)
             if hasattr(self, 'status_indicator'):
                 self.status_indicator.setText("● 已暂停")
-                self.status_indicator.setStyleSheet("""
-                    QLabel {
-                        font-size: 14px;
-                        font-weight: bold;
-                        color: #f44336;
-                        background-color: rgba(244, 67, 54, 0.1);
-                        border: 1px solid #f44336;
-                        border-radius: 15px;
-                        padding: 8px 16px;
-                    }
-                """)
+        self.set_button_style(self.assist_toggle_btn, enabled=self.assist_mode_active)
+        if hasattr(self, 'status_indicator'):
+            self.status_indicator.setStyleSheet(self.theme.status_indicator(self.assist_mode_active))
         
         # 更新状态标签
         self.update_status_label()
@@ -1125,219 +1126,54 @@ class AutoClickerGUI(QMainWindow):
     def update_threshold(self, value):
         """更新阈值"""
         self.assist_threshold = value
+        self.assist.threshold = value
         self.update_status_label()
         self.check_config_validity()
     
     def update_idle_timeout(self, value):
         """更新空闲超时"""
         self.idle_timeout = value
+        self.assist.idle_timeout = value
         self.update_status_label()
         self.check_config_validity()
     
-    def update_left_cps_display(self, current_cps, target_cps):
+    def update_left_cps_display(self, stats):
         """更新左键CPS显示"""
-        # 计算用户CPS和辅助CPS
-        user_cps = self.calculate_real_cps(self.user_left_click_times)
-        total_cps = self.calculate_real_cps(self.left_click_times)
-        assist_cps = max(0, total_cps - user_cps)
-        
         # 更新总CPS数值
         if hasattr(self, 'left_cps_value') and self.left_cps_value:
-            self.left_cps_value.setText(f"{total_cps:.1f}")
+            self.set_label_text(self.left_cps_value, f"{stats.total_cps:.1f}")
         
         # 更新详细CPS分解显示
         if hasattr(self, 'left_cps_detail') and self.left_cps_detail:
-            self.left_cps_detail.setText(f"真实({user_cps:.1f}) + 模拟({assist_cps:.1f})")
+            self.set_label_text(self.left_cps_detail, f"真实({stats.user_cps:.1f}) + 模拟({stats.assist_cps:.1f})")
         
         # 更新状态
         if hasattr(self, 'left_cps_status') and self.left_cps_status:
-            if not self.assist_mode_active:
-                status = "辅助模式已关闭"
-            elif user_cps > self.assist_threshold and self.is_user_actively_clicking('left'):
-                status = "辅助中"
-            elif user_cps > self.assist_threshold and not self.is_user_actively_clicking('left'):
-                status = "用户停止点击"
-            else:
-                status = "待机"
-            self.left_cps_status.setText(status)
+            self.set_label_text(self.left_cps_status, stats.status)
     
-    def update_right_cps_display(self, current_cps, target_cps):
+    def update_right_cps_display(self, stats):
         """更新右键CPS显示"""
-        # 计算用户CPS和辅助CPS
-        user_cps = self.calculate_real_cps(self.user_right_click_times)
-        total_cps = self.calculate_real_cps(self.right_click_times)
-        assist_cps = max(0, total_cps - user_cps)
-        
         # 更新总CPS数值  
         if hasattr(self, 'right_cps_value') and self.right_cps_value:
-            self.right_cps_value.setText(f"{total_cps:.1f}")
+            self.set_label_text(self.right_cps_value, f"{stats.total_cps:.1f}")
         
         # 更新详细CPS分解显示
         if hasattr(self, 'right_cps_detail') and self.right_cps_detail:
-            self.right_cps_detail.setText(f"真实({user_cps:.1f}) + 模拟({assist_cps:.1f})")
-            
+            self.set_label_text(self.right_cps_detail, f"真实({stats.user_cps:.1f}) + 模拟({stats.assist_cps:.1f})")
+        
         # 更新状态
         if hasattr(self, 'right_cps_status') and self.right_cps_status:
-            if not self.assist_mode_active:
-                status = "辅助模式已关闭"
-            elif user_cps > self.assist_threshold and self.is_user_actively_clicking('right'):
-                status = "辅助中"
-            elif user_cps > self.assist_threshold and not self.is_user_actively_clicking('right'):
-                status = "用户停止点击"
-            else:
-                status = "待机"
-            self.right_cps_status.setText(status)
-    
-    def start_threads(self):
-        """启动辅助点击线程"""
-        # 左键辅助点击线程
-        self.left_assist_thread = threading.Thread(target=self.left_assist_clicker)
-        self.left_assist_thread.daemon = True
-        self.left_assist_thread.start()
-        
-        # 右键辅助点击线程
-        self.right_assist_thread = threading.Thread(target=self.right_assist_clicker)
-        self.right_assist_thread.daemon = True
-        self.right_assist_thread.start()
-    
-    def start_mouse_listener(self):
-        """启动鼠标监听器（仅用于检测点击频率）"""
-        self.mouse_listener = ms.Listener(on_click=self.on_mouse_click)
-        self.mouse_listener.daemon = True
-        self.mouse_listener.start()
-    
-    def on_mouse_click(self, x, y, button, pressed):
-        """处理鼠标点击事件 - 仅记录点击时间用于CPS计算"""
-        if not pressed:  # 跳过释放事件，只处理按下事件
-            return
-        
-        # 如果是辅助点击，忽略此事件
-        if self.is_assist_clicking:
-            return
-            
-        current_time = time.time()
-        
-        # 记录左键点击时间
-        if button == ms.Button.left:
-            self.left_click_times.append(current_time)
-            self.user_left_click_times.append(current_time)  # 单独记录用户点击
-            self.left_button_held = True
-            self.last_user_left_click = current_time  # 记录用户最后一次左键点击时间
-                    
-        # 记录右键点击时间
-        elif button == ms.Button.right:
-            self.right_click_times.append(current_time)
-            self.user_right_click_times.append(current_time)  # 单独记录用户点击
-            self.right_button_held = True
-            self.last_user_right_click = current_time  # 记录用户最后一次右键点击时间
-    
-    def left_assist_clicker(self):
-        """左键辅助点击线程 - 当CPS超过阈值且用户在持续点击时提供辅助"""
-        last_assist_time = 0
-        assist_interval = 0.05  # 辅助点击的基本间隔
-        target_cps = self.left_min_cps  # 初始目标CPS
-        cps_change_time = time.time()  # CPS变化时间
-        cps_change_interval = random.uniform(0.5, 2.0)  # CPS变化间隔
-        
-        while True:
-            if self.assist_mode_active and self.left_enabled_cb.isChecked():
-                current_time = time.time()
-                
-                # 定期更新目标CPS，在设定范围内随机浮动
-                if current_time - cps_change_time >= cps_change_interval:
-                    target_cps = random.uniform(self.left_min_cps, self.left_max_cps)
-                    cps_change_time = current_time
-                    cps_change_interval = random.uniform(0.5, 2.0)  # 下次变化间隔
-                
-                # 计算当前用户左键CPS（不包含辅助点击）
-                user_cps = self.calculate_real_cps(self.user_left_click_times)
-                
-                # 更智能的用户活动检测
-                user_still_clicking = self.is_user_actively_clicking('left')
-                
-                # 如果用户CPS超过阈值且用户仍在点击，提供辅助点击
-                if user_cps > self.assist_threshold and user_still_clicking:
-                    # 计算需要的辅助CPS，确保总CPS达到目标
-                    assist_cps = target_cps - user_cps
-                    
-                    # 确保辅助CPS为正数且不超过合理范围
-                    if assist_cps > 0 and assist_cps <= 40:
-                        # 计算辅助点击间隔
-                        assist_interval = 1.0 / assist_cps
-                        
-                        # 检查是否到了下次辅助点击的时间
-                        if current_time - last_assist_time >= assist_interval:
-                            with lock:
-                                # 设置辅助点击标志，防止被监听器捕获
-                                self.is_assist_clicking = True
-                                
-                                # 执行辅助点击（不移动鼠标位置）
-                                self.mouse_controller.click(ms.Button.left)
-                                
-                                # 记录辅助点击到总点击列表（但不记录到用户点击列表）
-                                self.left_click_times.append(current_time)
-                                
-                                # 清除辅助点击标志
-                                self.is_assist_clicking = False
-                            last_assist_time = current_time
-            time.sleep(0.005)  # 更高精度的睡眠时间
-    
-    def right_assist_clicker(self):
-        """右键辅助点击线程 - 当CPS超过阈值且用户在持续点击时提供辅助"""
-        last_assist_time = 0
-        assist_interval = 0.05  # 辅助点击的基本间隔
-        target_cps = self.right_min_cps  # 初始目标CPS
-        cps_change_time = time.time()  # CPS变化时间
-        cps_change_interval = random.uniform(0.5, 2.0)  # CPS变化间隔
-        
-        while True:
-            if self.assist_mode_active and self.right_enabled_cb.isChecked():
-                current_time = time.time()
-                
-                # 定期更新目标CPS，在设定范围内随机浮动
-                if current_time - cps_change_time >= cps_change_interval:
-                    target_cps = random.uniform(self.right_min_cps, self.right_max_cps)
-                    cps_change_time = current_time
-                    cps_change_interval = random.uniform(0.5, 2.0)  # 下次变化间隔
-                
-                # 计算当前用户右键CPS（不包含辅助点击）
-                user_cps = self.calculate_real_cps(self.user_right_click_times)
-                
-                # 更智能的用户活动检测
-                user_still_clicking = self.is_user_actively_clicking('right')
-                
-                # 如果用户CPS超过阈值且用户仍在点击，提供辅助点击
-                if user_cps > self.assist_threshold and user_still_clicking:
-                    # 计算需要的辅助CPS，确保总CPS达到目标
-                    assist_cps = target_cps - user_cps
-                    
-                    # 确保辅助CPS为正数且不超过合理范围
-                    if assist_cps > 0 and assist_cps <= 40:
-                        # 计算辅助点击间隔
-                        assist_interval = 1.0 / assist_cps
-                        
-                        # 检查是否到了下次辅助点击的时间
-                        if current_time - last_assist_time >= assist_interval:
-                            with lock:
-                                # 设置辅助点击标志，防止被监听器捕获
-                                self.is_assist_clicking = True
-                                
-                                # 执行辅助点击（不移动鼠标位置）
-                                self.mouse_controller.click(ms.Button.right)
-                                
-                                # 记录辅助点击到总点击列表（但不记录到用户点击列表）
-                                self.right_click_times.append(current_time)
-                                
-                                # 清除辅助点击标志
-                                self.is_assist_clicking = False
-                            last_assist_time = current_time
-            time.sleep(0.005)  # 更高精度的睡眠时间
+            self.set_label_text(self.right_cps_status, stats.status)
     
     def closeEvent(self, event):
         """窗口关闭事件处理"""
         # 停止辅助模式
         with lock:
             self.assist_mode_active = False
+        self.stats_worker.stop()
+        if self.status is not None:
+            self.status.close()
+        self.engine.stop()
         
         # 接受关闭事件
         event.accept()
@@ -8,7 +8,7 @@ from cx_Freeze import setup, Executable
 
 # 构建选项
 build_exe_options = {
-    "packages": ["pynput", "PyQt5", "threading", "time", "random", "sys"],
+    "packages": ["pynput", "PyQt5", "threading", "time", "random", "sys", "core"],
     "excludes": ["tkinter"],  # 排除不需要的模块
     "include_files": [],  # 包含的额外文件
     "zip_include_packages": "*",